@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, RecruiterProfile, ApplicantProfile, Job, Application, Interview
+from .models import (User, RecruiterProfile, ApplicantProfile, Job, Application, ApplicationStatusEvent, Interview,
+                     OutboundEmail, ResumeBlob)
 
 class UserAdmin(BaseUserAdmin):
     list_display = ('email', 'username', 'user_type', 'is_staff')
@@ -16,32 +17,62 @@ class UserAdmin(BaseUserAdmin):
 
 class RecruiterProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'company_name')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email', 'company_name')
 
 class ApplicantProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'skills')
-    search_fields = ('user__username', 'user__email', 'skills')
+    list_select_related = ('user',)
+    # resume_blob__text is the resume text extracted by core.tasks.extract_resume_text
+    search_fields = ('user__username', 'user__email', 'skills', 'resume_blob__text')
+    raw_id_fields = ('resume_blob',)
 
 class JobAdmin(admin.ModelAdmin):
     list_display = ('title', 'recruiter', 'location', 'created_at')
+    list_select_related = ('recruiter__user',)
     list_filter = ('location', 'created_at')
     search_fields = ('title', 'description', 'recruiter__company_name')
     date_hierarchy = 'created_at'
 
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ('job', 'applicant', 'status', 'applied_at')
+    list_select_related = ('job', 'applicant__user')
     list_filter = ('status', 'applied_at')
     search_fields = ('job__title', 'applicant__user__username')
     date_hierarchy = 'applied_at'
 
 class InterviewAdmin(admin.ModelAdmin):
     list_display = ('application', 'scheduled_time', 'is_scheduled')
+    list_select_related = ('application__job', 'application__applicant__user')
     list_filter = ('is_scheduled',)
     search_fields = ('application__job__title', 'application__applicant__user__username')
 
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to_email', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to_email', 'subject')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+
+class ResumeBlobAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'content_type', 'size', 'created_at', 'text_extracted_at')
+    list_filter = ('content_type',)
+    search_fields = ('sha256', 'text')
+    readonly_fields = ('sha256', 'file', 'size', 'content_type', 'text', 'text_extracted_at', 'created_at')
+
+class ApplicationStatusEventAdmin(admin.ModelAdmin):
+    list_display = ('application', 'from_status', 'to_status', 'at')
+    list_select_related = ('application__job', 'application__applicant__user')
+    list_filter = ('to_status',)
+    # The log is append-only
+    readonly_fields = ('application', 'job', 'from_status', 'to_status', 'at')
+
+
 admin.site.register(User, UserAdmin)
 admin.site.register(RecruiterProfile, RecruiterProfileAdmin)
 admin.site.register(ApplicantProfile, ApplicantProfileAdmin)
 admin.site.register(Job, JobAdmin)
 admin.site.register(Application, ApplicationAdmin)
 admin.site.register(Interview, InterviewAdmin)
+admin.site.register(OutboundEmail, OutboundEmailAdmin)
+admin.site.register(ResumeBlob, ResumeBlobAdmin)
+admin.site.register(ApplicationStatusEvent, ApplicationStatusEventAdmin)
@@ -0,0 +1,91 @@
+"""
+Archival of closed and expired jobs.
+
+archive_jobs() moves jobs closed more than JOB_ARCHIVE_AFTER_DAYS ago, or
+posted more than JOB_EXPIRY_DAYS ago, into ArchivedJob, together with their
+applications (as ArchivedApplication, status history included). It works
+JOB_ARCHIVE_BATCH_SIZE jobs per transaction: copy with bulk_create, then
+delete the originals. The hot tables and their indexes then hold only live
+rows. The celery beat task archive_jobs runs this hourly, at most
+JOB_ARCHIVE_MAX_BATCHES batches per run, so each run's work stays bounded.
+
+Deleting a job goes through the usual signals. The job cache, search index
+and facet counts are updated as for any deletion. The job's counters,
+interviews and slots are deleted with it.
+
+Archived rows are read-only. The job and application lists include them with
+?include_archived=1.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Application, ApplicationStatusEvent, ArchivedApplication, ArchivedJob, Job
+
+JOB_FIELDS = ['id', 'recruiter_id', 'title', 'description', 'location', 'created_at', 'closed_at']
+APPLICATION_FIELDS = ['id', 'job_id', 'applicant_id', 'status', 'applied_at']
+
+
+def include_archived(request):
+    return request.query_params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+
+def archivable_jobs(now=None):
+    now = now or timezone.now()
+    return Job.objects.filter(
+        Q(closed_at__lte=now - timedelta(days=settings.JOB_ARCHIVE_AFTER_DAYS))
+        | Q(created_at__lte=now - timedelta(days=settings.JOB_EXPIRY_DAYS))
+    )
+
+
+@transaction.atomic
+def archive_batch(batch_size, now=None):
+    """Archive up to `batch_size` jobs and return how many were moved."""
+    now = now or timezone.now()
+    # skip_locked lets overlapping runs split the work instead of queueing
+    job_ids = list(
+        archivable_jobs(now).select_for_update(skip_locked=True).order_by('id').values_list('id', flat=True)[:batch_size]
+    )
+    if not job_ids:
+        return 0
+
+    history = defaultdict(list)
+    events = (
+        ApplicationStatusEvent.objects.filter(job_id__in=job_ids).order_by('application_id', 'at', 'id')
+        .values_list('application_id', 'from_status', 'to_status', 'at')
+    )
+    for application_id, from_status, to_status, at in events.iterator(chunk_size=5000):
+        history[application_id].append([from_status, to_status, at.isoformat()])
+
+    ArchivedJob.objects.bulk_create([
+        ArchivedJob(archived_at=now, **row) for row in Job.objects.filter(id__in=job_ids).values(*JOB_FIELDS)
+    ])
+    applications = Application.objects.filter(job_id__in=job_ids).values(*APPLICATION_FIELDS)
+    batch = []
+    for row in applications.iterator(chunk_size=5000):
+        batch.append(ArchivedApplication(status_history=history.pop(row['id'], []), archived_at=now, **row))
+        if len(batch) >= 5000:
+            ArchivedApplication.objects.bulk_create(batch)
+            batch = []
+    ArchivedApplication.objects.bulk_create(batch)
+
+    Job.objects.filter(id__in=job_ids).delete()
+    return len(job_ids)
+
+
+def archive_jobs(batch_size=None, max_batches=None):
+    """Archive batches until none are left or `max_batches` ran; returns the number of jobs moved."""
+    batch_size = batch_size or settings.JOB_ARCHIVE_BATCH_SIZE
+    max_batches = max_batches or settings.JOB_ARCHIVE_MAX_BATCHES
+    now = timezone.now()
+    total = 0
+    for _ in range(max_batches):
+        moved = archive_batch(batch_size, now)
+        total += moved
+        if moved < batch_size:
+            break
+    return total
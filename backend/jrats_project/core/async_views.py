@@ -0,0 +1,237 @@
+"""
+Async-native versions of the read-heavy endpoints and interview scheduling,
+used when the project is served over ASGI (see settings.ASYNC_VIEWS and
+DEPLOYMENT.md).
+
+DRF views are synchronous, so under ASGI each one occupies a worker thread
+for the whole request. These views authenticate, query and read the cache
+with Django's async APIs instead, so a single event loop can keep hundreds of
+requests waiting on the database or Redis at once. They reuse the DRF
+serializers, permissions and pagination of their sync counterparts and return
+the same JSON. Methods without an async handler (job creation, updates)
+are delegated to the sync view, and writes that need a transaction run in
+one sync_to_async hop because the async ORM has no transactions.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import parse_etags
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import exceptions, permissions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .archive import include_archived
+from .authentication import CachedJWTAuthentication
+from .cache import job_cache
+from .counters import change_status
+from . import events
+from .facets import JobFilter
+from .models import Application, ArchivedApplication, ArchivedJob, Interview, Job
+from .pagination import ApplicationCursorPagination, JobCursorPagination
+from .permissions import IsRecruiter
+from .routers import ause_replica, primary_reads, replica_reads
+from .scheduling import book_interview, SlotUnavailable, InterviewAlreadyScheduled
+from .serializers import (ApplicationSerializer, ArchivableApplicationSerializer, ArchivableJobSerializer,
+                          InterviewScheduleSerializer, JobSerializer, UserProfileSerializer)
+from . import views
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    return HttpResponse(JSONRenderer().render(data), status=status_code, content_type='application/json',
+                        headers=headers)
+
+
+class AsyncAPIView(View):
+    """
+    The parts of APIView the async views need: JWT authentication, DRF
+    permission classes, APIException handling and JSON rendering. Handlers
+    receive a DRF Request (for query_params and user) and return a Django
+    HttpResponse. Throttles run like DRF's, after the permission checks.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    sync_view = None  # DRF view that handles methods this view has no async handler for
+    read_from_replica = False  # GET and HEAD read from the replica (core.routers)
+    throttle_classes = []
+    throttle_scope = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Like APIView: authentication is by bearer token, not session cookie
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    def check_throttles(self, request):
+        throttles = [throttle() for throttle in self.throttle_classes]
+        waits = [throttle.wait() for throttle in throttles if not throttle.allow_request(request, self)]
+        if waits:
+            raise exceptions.Throttled(max(waits))
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        handler = getattr(self, method, None) if method in self.http_method_names else None
+        if handler is None:
+            if self.sync_view is not None:
+                return await sync_to_async(self.sync_view.as_view())(request, *args, **kwargs)
+            return json_response({'detail': f'Method "{request.method}" not allowed.'},
+                                 status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        drf_request = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+        try:
+            authenticator = CachedJWTAuthentication()
+            result = await authenticator.aauthenticate(drf_request)
+            drf_request.user = result[0] if result is not None else AnonymousUser()
+            for permission in self.get_permissions():
+                if not permission.has_permission(drf_request, self):
+                    if result is None:
+                        raise exceptions.NotAuthenticated()
+                    raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+            if self.throttle_classes:
+                # The throttles use the (sync) cache client
+                await sync_to_async(self.check_throttles)(drf_request)
+            if self.read_from_replica and await ause_replica(drf_request):
+                with replica_reads():
+                    return await handler(drf_request, *args, **kwargs)
+            return await handler(drf_request, *args, **kwargs)
+        except exceptions.APIException as error:
+            headers = {}
+            if isinstance(error, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                headers['WWW-Authenticate'] = authenticator.authenticate_header(drf_request)
+            if getattr(error, 'wait', None):
+                headers['Retry-After'] = '%d' % error.wait
+            detail = error.detail if isinstance(error.detail, (list, dict)) else {'detail': error.detail}
+            return json_response(detail, error.status_code, headers)
+
+
+class CachedAsyncResponseMixin:
+    """Async CachedResponseMixin: serves `fetch()` through `response_cache` with ETags."""
+    response_cache = None
+
+    async def get(self, request, *args, **kwargs):
+        key = await self.response_cache.akey_for(request)
+        entry = await self.response_cache.aget(key)
+        if entry is None:
+            with primary_reads():
+                data = await self.fetch(request, *args, **kwargs)
+            entry = await self.response_cache.aset(key, data)
+
+        if entry['etag'] in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = json_response(entry['data'])
+        response['ETag'] = entry['etag']
+        return response
+
+
+class AsyncJobListView(CachedAsyncResponseMixin, AsyncAPIView):
+    response_cache = job_cache
+    sync_view = views.JobListView  # POST (create) stays on the DRF view
+    read_from_replica = True
+    filterset_class = views.JobListView.filterset_class
+
+    async def fetch(self, request):
+        paginator = JobCursorPagination()
+        # Filtering only builds the query; it runs in apaginate_queryset
+        queryset = DjangoFilterBackend().filter_queryset(request, Job.objects.all(), self)
+        serializer_class = JobSerializer
+        if include_archived(request):
+            queryset = [queryset, JobFilter(request.query_params, queryset=ArchivedJob.objects.all()).qs]
+            serializer_class = ArchivableJobSerializer
+        page = await paginator.apaginate_queryset(queryset, request)
+        return paginator.get_paginated_data(serializer_class(page, many=True).data)
+
+
+class AsyncJobDetailView(CachedAsyncResponseMixin, AsyncAPIView):
+    permission_classes = [permissions.IsAuthenticated, IsRecruiter]
+    response_cache = job_cache
+    sync_view = views.JobDetailView  # PUT, PATCH and DELETE stay on the DRF view
+    read_from_replica = True
+
+    async def fetch(self, request, pk):
+        try:
+            job = await Job.objects.aget(pk=pk)
+        except Job.DoesNotExist:
+            raise exceptions.NotFound('No Job matches the given query.')
+        return JobSerializer(job).data
+
+
+class AsyncApplicationListView(AsyncAPIView):
+    sync_view = views.ApplicationListView  # POST (apply) stays on the DRF view
+    read_from_replica = True
+
+    async def get(self, request):
+        queryset = views.visible_applications(Application.objects.all(), request)
+        serializer_class = ApplicationSerializer
+        if include_archived(request):
+            queryset = [queryset, views.visible_applications(ArchivedApplication.objects.all(), request)]
+            serializer_class = ArchivableApplicationSerializer
+
+        paginator = ApplicationCursorPagination()
+        page = await paginator.apaginate_queryset(queryset, request)
+        return json_response(paginator.get_paginated_data(serializer_class(page, many=True).data))
+
+
+class AsyncUserProfileView(AsyncAPIView):
+    async def get(self, request):
+        # The authenticated user comes with its profile, so this makes no queries
+        return json_response(UserProfileSerializer(request.user, context={'request': request}).data)
+
+
+def _book_and_update_status(interview, scheduled_time):
+    book_interview(interview, scheduled_time)
+    change_status(interview.application, 'interview_scheduled')
+
+
+class AsyncScheduleInterviewView(AsyncAPIView):
+    permission_classes = [permissions.AllowAny] # Access is controlled by the unique token
+    throttle_classes = views.ScheduleInterviewView.throttle_classes
+    throttle_scope = views.ScheduleInterviewView.throttle_scope
+
+    async def post(self, request, token):
+        try:
+            interview = await Interview.objects.select_related('application').aget(
+                scheduling_token=token, is_scheduled=False
+            )
+        except Interview.DoesNotExist:
+            return json_response({"error": "Invalid or expired scheduling link."}, status.HTTP_404_NOT_FOUND)
+
+        # The body was read before the view ran, so parsing it does not block
+        serializer = InterviewScheduleSerializer(data=request.data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        scheduled_time = serializer.validated_data['scheduled_time']
+        if scheduled_time < timezone.now():
+            return json_response({"error": "Interview time must be in the future."}, status.HTTP_400_BAD_REQUEST)
+        try:
+            await sync_to_async(_book_and_update_status)(interview, scheduled_time)
+        except SlotUnavailable:
+            return json_response({"error": "This time slot is unavailable. Please choose another time."},
+                                 status.HTTP_409_CONFLICT)
+        except InterviewAlreadyScheduled:
+            return json_response({"error": "Invalid or expired scheduling link."}, status.HTTP_404_NOT_FOUND)
+        return json_response({"message": "Interview scheduled successfully!"})
+
+
+class AsyncApplicationEventsView(AsyncAPIView):
+    """
+    Server-sent events: the ticket holder's application status changes, as
+    they commit (core.events). Only served over ASGI, where an open stream
+    costs a queue on the event loop rather than a worker thread.
+    """
+    permission_classes = [permissions.AllowAny] # Access is controlled by the signed ticket
+
+    async def get(self, request):
+        user_id = events.user_for_ticket(request.query_params.get('ticket', ''))
+        if user_id is None:
+            return json_response({"error": "Invalid or expired ticket."}, status.HTTP_403_FORBIDDEN)
+        response = StreamingHttpResponse(events.stream(user_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no' # Don't let nginx buffer the stream
+        return response
@@ -0,0 +1,162 @@
+"""
+JWT authentication without a database round trip per request.
+
+Access tokens carry `user_type` and `profile_id` claims, and the user plus
+their recruiter/applicant profile are kept in a short-lived cache entry. The
+authenticated user is rebuilt from that entry with the profile relation
+pre-populated, so permission checks and queryset scoping (which read
+`user.user_type` and `user.recruiter_profile`/`user.applicant_profile`) run
+without touching the database. core.signals drops the entry whenever the user
+or their profile changes.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User, RecruiterProfile, ApplicantProfile
+
+USER_FIELDS = ('id', 'username', 'email', 'user_type', 'first_name', 'last_name',
+               'is_active', 'is_staff', 'is_superuser', 'last_login', 'date_joined')
+PROFILE_FIELDS = {
+    'recruiter_profile': (RecruiterProfile, ('id', 'company_name')),
+    'applicant_profile': (ApplicantProfile, ('id', 'resume', 'skills', 'skills_updated_at')),
+}
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_user_context(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def profile_for(user):
+    """The recruiter or applicant profile of `user`, or None."""
+    relation = f'{user.user_type}_profile'
+    if relation not in PROFILE_FIELDS:
+        return None
+    try:
+        return getattr(user, relation)
+    except PROFILE_FIELDS[relation][0].DoesNotExist:
+        return None
+
+
+def build_user_context(user):
+    """A picklable snapshot of `user` and their profile for the cache."""
+    context = {'user': {field: getattr(user, field) for field in USER_FIELDS}}
+    profile = profile_for(user)
+    for relation, (_model, fields) in PROFILE_FIELDS.items():
+        if profile is None or relation != f'{user.user_type}_profile':
+            context[relation] = None
+            continue
+        data = {field: getattr(profile, field) for field in fields}
+        if 'resume' in data:
+            data['resume'] = data['resume'].name
+        context[relation] = data
+    return context
+
+
+def _from_snapshot(model, data):
+    # from_db wants the loaded values in field order; the rest are deferred
+    names = [field.attname for field in model._meta.concrete_fields if field.attname in data]
+    return model.from_db('default', names, [data[name] for name in names])
+
+
+def user_from_context(context):
+    """
+    Rebuild a User (with its profile relations cached) from a cache entry.
+    Fields outside the snapshot are deferred, not blanked, so saving the
+    rebuilt user or profile leaves them (the password hash included) alone.
+    """
+    user = _from_snapshot(User, context['user'])
+    for relation, (model, _fields) in PROFILE_FIELDS.items():
+        descriptor = getattr(User, relation)
+        data = context[relation]
+        if data is None:
+            # Cache the absence too, so `user.applicant_profile` on a recruiter
+            # raises DoesNotExist without a query
+            descriptor.related.set_cached_value(user, None)
+            continue
+        profile = _from_snapshot(model, {'user_id': user.id, **data})
+        descriptor.related.set_cached_value(user, profile)
+        profile.user = user
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def user_id_for(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def users(self):
+        return User.objects.select_related('recruiter_profile', 'applicant_profile')
+
+    def active_user(self, context):
+        user = user_from_context(context)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares against the current password hash; always read it fresh
+            return super().get_user(validated_token)
+
+        user_id = self.user_id_for(validated_token)
+        key = user_cache_key(user_id)
+        context = cache.get(key)
+        if context is None:
+            try:
+                user = self.users().get(**{api_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            context = build_user_context(user)
+            cache.set(key, context, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+        return self.active_user(context)
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views: the cache and database are awaited."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        user_id = self.user_id_for(validated_token)
+        key = user_cache_key(user_id)
+        context = await cache.aget(key)
+        if context is None:
+            try:
+                user = await self.users().aget(**{api_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            context = build_user_context(user)
+            await cache.aset(key, context, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+        return self.active_user(context)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds `user_type` and `profile_id` claims so clients and services can scope without a lookup."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        profile = profile_for(user)
+        token['user_type'] = user.user_type
+        token['profile_id'] = profile.id if profile is not None else None
+        return token
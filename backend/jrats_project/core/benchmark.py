@@ -0,0 +1,214 @@
+"""
+Helpers shared by the benchmark management commands: a throwaway database,
+bulk seeding of realistic rows and simple timing utilities.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from .matching import normalize_skills
+from .models import (User, RecruiterProfile, ApplicantProfile, Job, Application, ApplicationStatusEvent, Interview,
+                     InterviewSlot, Skill)
+
+JOB_TITLES = ['Backend Engineer', 'Frontend Developer', 'Data Scientist', 'DevOps Engineer',
+              'Product Designer', 'Mobile Developer', 'QA Engineer', 'Engineering Manager']
+SKILL_SETS = ['Python, Django, PostgreSQL', 'JavaScript, React, CSS', 'Python, Machine Learning, SQL',
+              'AWS, Kubernetes, Terraform', 'Figma, UX Research', 'Kotlin, Swift, Flutter',
+              'Selenium, Python, Testing', 'Leadership, Agile, Python']
+
+
+@contextmanager
+def isolated_database():
+    """
+    Run the block against a freshly migrated test database so benchmarks never
+    touch real data or send real email. The database is destroyed afterwards.
+    """
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """
+    bulk_create() honours auto_now_add, which would give every seeded row the
+    same timestamp. Temporarily switch it off so rows keep the spread-out
+    timestamps the seeders assign.
+    """
+    patches = [mock.patch.object(field, 'auto_now_add', False) for field in fields]
+    for patch in patches:
+        patch.start()
+    try:
+        yield
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+
+
+def seed_users(prefix, count, user_type, batch_size=5000):
+    users = [
+        User(username=f'{prefix}{i}', email=f'{prefix}{i}@bench.jrats.com', user_type=user_type, password='!')
+        for i in range(count)
+    ]
+    User.objects.bulk_create(users, batch_size=batch_size)
+    return list(User.objects.filter(username__startswith=prefix, user_type=user_type).order_by('id'))
+
+
+def seed_recruiters(count, batch_size=5000):
+    users = seed_users('bench_recruiter_', count, 'recruiter', batch_size)
+    RecruiterProfile.objects.bulk_create(
+        [RecruiterProfile(user=user, company_name=f'Company {i % 50}') for i, user in enumerate(users)],
+        batch_size=batch_size,
+    )
+    return list(RecruiterProfile.objects.order_by('id'))
+
+
+def seed_applicants(count, batch_size=5000):
+    users = seed_users('bench_applicant_', count, 'applicant', batch_size)
+    ApplicantProfile.objects.bulk_create(
+        [ApplicantProfile(user=user, resume='resumes/bench.pdf', skills=SKILL_SETS[i % len(SKILL_SETS)],
+                          skills_updated_at=timezone.now())
+         for i, user in enumerate(users)],
+        batch_size=batch_size,
+    )
+    applicants = list(ApplicantProfile.objects.order_by('id'))
+
+    # bulk_create skips the signal that normalizes skills, so fill the M2M directly
+    names = {skills: normalize_skills(skills) for skills in SKILL_SETS}
+    Skill.objects.bulk_create([Skill(name=name) for group in names.values() for name in group],
+                              ignore_conflicts=True)
+    skill_ids = dict(Skill.objects.values_list('name', 'id'))
+    through = ApplicantProfile.normalized_skills.through
+    through.objects.bulk_create(
+        [through(applicantprofile_id=applicant.id, skill_id=skill_ids[name])
+         for applicant in applicants for name in names[applicant.skills]],
+        batch_size=batch_size,
+    )
+    return applicants
+
+
+def seed_jobs(recruiters, count, start=0, batch_size=5000):
+    """Create `count` jobs spread across `recruiters`, one minute apart."""
+    base = timezone.now() - timedelta(days=365)
+    jobs = [
+        Job(
+            recruiter=recruiters[i % len(recruiters)],
+            title=f'{JOB_TITLES[i % len(JOB_TITLES)]} {i}',
+            description='Build and maintain services. ' * 10,
+            location=f'City {i % 25}',
+            created_at=base + timedelta(minutes=i),
+        )
+        for i in range(start, start + count)
+    ]
+    with explicit_timestamps(Job._meta.get_field('created_at')):
+        return Job.objects.bulk_create(jobs, batch_size=batch_size)
+
+
+def seed_applications(job, applicants, batch_size=5000):
+    """Have every applicant in `applicants` apply to `job`, one minute apart."""
+    base = timezone.now() - timedelta(days=365)
+    applications = [
+        Application(job=job, applicant=applicant, applied_at=base + timedelta(minutes=i))
+        for i, applicant in enumerate(applicants)
+    ]
+    with explicit_timestamps(Application._meta.get_field('applied_at')):
+        Application.objects.bulk_create(applications, batch_size=batch_size)
+
+
+def seed_application_spread(jobs, applicants, count, batch_size=5000):
+    """
+    Create `count` applications spread over all jobs and applicants with a
+    realistic mix of statuses. Each applicant applies to distinct jobs.
+    """
+    statuses = [choice for choice, _ in Application.STATUS_CHOICES if choice != 'interview_scheduled']
+    base = timezone.now() - timedelta(days=365)
+    applications = []
+    for i in range(min(count, len(jobs) * len(applicants))):
+        applicant_index, round_ = i % len(applicants), i // len(applicants)
+        applications.append(Application(
+            job=jobs[(applicant_index + round_) % len(jobs)],
+            applicant=applicants[applicant_index],
+            status=random.choice(statuses),
+            applied_at=base + timedelta(seconds=i),
+        ))
+    with explicit_timestamps(Application._meta.get_field('applied_at')):
+        return Application.objects.bulk_create(applications, batch_size=batch_size)
+
+
+def seed_interviews(applications, scheduled, pending, batch_size=5000):
+    """
+    Give `scheduled` applications a booked interview (with their slot cells)
+    and `pending` more an unused scheduling token. Returns the pending interviews.
+    """
+    start = (timezone.now() + timedelta(days=30)).replace(minute=0, second=0, microsecond=0)
+    booked = applications[:scheduled]
+    waiting = applications[scheduled:scheduled + pending]
+
+    interviews = []
+    slots_per_job = {}
+    for application in booked:
+        slot = slots_per_job.get(application.job_id, 0)
+        slots_per_job[application.job_id] = slot + 1
+        interviews.append(Interview(application=application, is_scheduled=True,
+                                    scheduled_time=start + timedelta(hours=slot)))
+    interviews += [Interview(application=application) for application in waiting]
+    Interview.objects.bulk_create(interviews, batch_size=batch_size)
+
+    InterviewSlot.objects.bulk_create(
+        [InterviewSlot(job_id=interview.application.job_id, interview=interview,
+                       start=interview.scheduled_time + timedelta(minutes=InterviewSlot.SLOT_MINUTES * cell))
+         for interview in interviews if interview.is_scheduled
+         for cell in range(InterviewSlot.CELLS_PER_INTERVIEW)],
+        batch_size=batch_size,
+    )
+    Application.objects.filter(id__in=[a.id for a in booked]).update(status='interview_scheduled')
+    Application.objects.filter(id__in=[a.id for a in waiting]).update(status='interview_pending')
+    return interviews[len(booked):]
+
+
+def seed_status_events(batch_size=5000):
+    """
+    Give every application a status history: submitted when it applied_at,
+    then its current status one to ten days later (unless still submitted).
+    """
+    events = []
+    rows = Application.objects.values_list('id', 'job_id', 'status', 'applied_at').order_by('id')
+    for application_id, job_id, status, applied_at in rows.iterator(chunk_size=batch_size):
+        events.append(ApplicationStatusEvent(application_id=application_id, job_id=job_id,
+                                             to_status='submitted', at=applied_at))
+        if status != 'submitted':
+            events.append(ApplicationStatusEvent(
+                application_id=application_id, job_id=job_id, from_status='submitted', to_status=status,
+                at=applied_at + timedelta(hours=random.randint(24, 240)),
+            ))
+    ApplicationStatusEvent.objects.bulk_create(events, batch_size=batch_size)
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of `samples`."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def time_call(func, repeat=5):
+    """Call `func` `repeat` times and return the median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
@@ -0,0 +1,148 @@
+import hashlib
+import json
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .routers import primary_reads
+
+
+class ResponseCache:
+    """
+    Caches serialized API payloads per namespace and normalized query string.
+
+    Entries are never deleted individually: every key embeds the namespace's
+    current version, so bumping the version invalidates everything at once and
+    stale entries simply age out of Redis/locmem.
+    """
+
+    def __init__(self, namespace, timeout=None):
+        self.namespace = namespace
+        self.timeout = timeout
+
+    @property
+    def backend(self):
+        # Resolved lazily so tests can swap CACHES with override_settings
+        return cache
+
+    def _key(self, suffix):
+        return f'{self.namespace}:{suffix}'
+
+    def get_version(self):
+        version = self.backend.get(self._key('version'))
+        if version is None:
+            self.backend.add(self._key('version'), 1, timeout=None)
+            version = self.backend.get(self._key('version'), 1)
+        return version
+
+    def invalidate(self):
+        try:
+            self.backend.incr(self._key('version'))
+        except ValueError:
+            self.backend.add(self._key('version'), 2, timeout=None)
+
+    def _digest(self, request):
+        # Sort parameters so ?a=1&b=2 and ?b=2&a=1 share an entry; the host is
+        # part of the key because pagination links are absolute URLs.
+        query = urlencode(sorted(request.GET.lists()), doseq=True)
+        raw = f'{request.get_host()}{request.path}?{query}'
+        return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+    def key_for(self, request):
+        return self._key(f'v{self.get_version()}:{self._digest(request)}')
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        self._count('hits' if entry is not None else 'misses')
+        return entry
+
+    def _entry(self, data):
+        body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode('utf-8')
+        return {'data': data, 'etag': quote_etag(hashlib.md5(body).hexdigest())}
+
+    def _timeout(self):
+        return self.timeout if self.timeout is not None else settings.RESPONSE_CACHE_TIMEOUT
+
+    def set(self, key, data):
+        entry = self._entry(data)
+        self.backend.set(key, entry, timeout=self._timeout())
+        return entry
+
+    def _count(self, counter):
+        key = self._key(f'stats:{counter}')
+        try:
+            self.backend.incr(key)
+        except ValueError:
+            if not self.backend.add(key, 1, timeout=None):
+                self.backend.incr(key)
+
+    # Async counterparts for async views, using the cache's async API
+
+    async def aget_version(self):
+        version = await self.backend.aget(self._key('version'))
+        if version is None:
+            await self.backend.aadd(self._key('version'), 1, timeout=None)
+            version = await self.backend.aget(self._key('version'), 1)
+        return version
+
+    async def akey_for(self, request):
+        return self._key(f'v{await self.aget_version()}:{self._digest(request)}')
+
+    async def aget(self, key):
+        entry = await self.backend.aget(key)
+        await self._acount('hits' if entry is not None else 'misses')
+        return entry
+
+    async def aset(self, key, data):
+        entry = self._entry(data)
+        await self.backend.aset(key, entry, timeout=self._timeout())
+        return entry
+
+    async def _acount(self, counter):
+        key = self._key(f'stats:{counter}')
+        try:
+            await self.backend.aincr(key)
+        except ValueError:
+            if not await self.backend.aadd(key, 1, timeout=None):
+                await self.backend.aincr(key)
+
+    def stats(self):
+        return {
+            'hits': self.backend.get(self._key('stats:hits'), 0),
+            'misses': self.backend.get(self._key('stats:misses'), 0),
+            'version': self.get_version(),
+        }
+
+
+job_cache = ResponseCache('jobs')
+
+
+class CachedResponseMixin:
+    """
+    Serves GET requests for a generic view from `response_cache`, with
+    ETag/If-None-Match support. Permission checks still run on every request.
+    A miss is read from the primary, since the entry is served to everyone.
+    """
+    response_cache = None
+
+    def get(self, request, *args, **kwargs):
+        key = self.response_cache.key_for(request)
+        entry = self.response_cache.get(key)
+        if entry is None:
+            with primary_reads():
+                response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            entry = self.response_cache.set(key, response.data)
+
+        if entry['etag'] in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(entry['data'])
+        response['ETag'] = entry['etag']
+        return response
@@ -0,0 +1,144 @@
+"""
+Per-recruiter iCalendar feed of scheduled interviews.
+
+Each recruiter's feed is kept prebuilt in the cache: the assembled body, its
+ETag and Last-Modified, and the recruiter's current token version. Calendar
+clients poll the feed every few minutes. A poll checks the signed token and
+returns the cached body, so it never touches the database.
+
+Like core.cache.ResponseCache, entries are keyed by a per-recruiter version.
+invalidate() bumps the version whenever an interview of that recruiter is
+booked, rejected, re-opened or deleted, or one of their jobs changes; the
+next poll rebuilds the feed with two queries. A build that raced with a
+change is stored under the old version and never served. Entries expire
+after CALENDAR_FEED_TIMEOUT in any case.
+
+Feed tokens sign the recruiter id and their calendar_token_version, so
+rotating the version (RecruiterCalendarLinkView) revokes every earlier URL.
+"""
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.renderers import BaseRenderer
+
+from .cache import ResponseCache
+from .models import Interview, InterviewSlot, Job, RecruiterProfile
+
+SIGNING_SALT = 'core.calendar_feed'
+INTERVIEW_MINUTES = InterviewSlot.SLOT_MINUTES * InterviewSlot.CELLS_PER_INTERVIEW
+EVENT_FIELDS = ('id', 'scheduled_time', 'application__status', 'application__job__title',
+                'application__job__recruiter_id', 'application__applicant__user__username')
+
+
+def feed_token(recruiter_id, version):
+    return signing.Signer(salt=SIGNING_SALT).sign(f'{recruiter_id}:{version}').split(':', 1)[1]
+
+
+def token_version(recruiter_id, token):
+    """The token version `token` was signed with for `recruiter_id`, or None if it is forged."""
+    try:
+        value = signing.Signer(salt=SIGNING_SALT).unsign(f'{recruiter_id}:{token}')
+    except signing.BadSignature:
+        return None
+    return int(value.split(':', 1)[1])
+
+
+def _versions(recruiter_id):
+    return ResponseCache(f'calendar:{recruiter_id}')
+
+
+def _escape(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line):
+    # RFC 5545: lines longer than 75 octets continue on lines starting with a space
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        size = 75 if not parts else 74
+        while size < len(encoded) and (encoded[size] & 0xC0) == 0x80:
+            size -= 1  # Don't split a multi-byte character
+        parts.append(encoded[:size].decode('utf-8'))
+        encoded = encoded[size:]
+    return '\r\n '.join(parts)
+
+
+def _timestamp(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def render_event(row, now):
+    start = row['scheduled_time']
+    cancelled = row['application__status'] == 'rejected'
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:interview-{row['id']}@jrats",
+        f'DTSTAMP:{_timestamp(now)}',
+        f'DTSTART:{_timestamp(start)}',
+        f'DTEND:{_timestamp(start + timedelta(minutes=INTERVIEW_MINUTES))}',
+        'SUMMARY:' + _escape(f"Interview: {row['application__applicant__user__username']} "
+                             f"for {row['application__job__title']}"),
+        f"STATUS:{'CANCELLED' if cancelled else 'CONFIRMED'}",
+        f"SEQUENCE:{1 if cancelled else 0}",
+        'END:VEVENT',
+    ]
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+def _scheduled(**filters):
+    return Interview.objects.filter(is_scheduled=True, **filters).values(*EVENT_FIELDS)
+
+
+def build_feed(recruiter_id, key):
+    now = timezone.now()
+    version = RecruiterProfile.objects.filter(pk=recruiter_id).values_list('calendar_token_version', flat=True).first()
+    rows = _scheduled(application__job__recruiter_id=recruiter_id).order_by('id')
+    body = ''.join([
+        'BEGIN:VCALENDAR\r\n', 'VERSION:2.0\r\n', 'PRODID:-//jrats//Interviews//EN\r\n',
+        'X-WR-CALNAME:Interviews\r\n',
+        *(render_event(row, now) for row in rows),
+        'END:VCALENDAR\r\n',
+    ]).encode('utf-8')
+    entry = {
+        'body': body,
+        'etag': f'"{hashlib.md5(body).hexdigest()}"',
+        'last_modified': http_date(now.timestamp()),
+        'token_version': version,
+    }
+    cache.set(key, entry, timeout=settings.CALENDAR_FEED_TIMEOUT)
+    return entry
+
+
+def get_feed(recruiter_id):
+    key = f'calendar:{recruiter_id}:v{_versions(recruiter_id).get_version()}'
+    return cache.get(key) or build_feed(recruiter_id, key)
+
+
+def invalidate(recruiter_id):
+    _versions(recruiter_id).invalidate()
+
+
+def invalidate_applications(application_ids):
+    """Invalidate the feeds of the recruiters behind `application_ids`."""
+    recruiters = Job.objects.filter(applications__id__in=application_ids).values_list('recruiter_id', flat=True)
+    for recruiter_id in recruiters.distinct():
+        invalidate(recruiter_id)
+
+
+class ICalendarRenderer(BaseRenderer):
+    """Lets the feed view accept `Accept: text/calendar`; the view returns the prebuilt body itself."""
+    media_type = 'text/calendar'
+    format = 'ics'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data if isinstance(data, bytes) else b''
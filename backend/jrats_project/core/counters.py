@@ -0,0 +1,138 @@
+"""
+Per-job application counts by status, maintained incrementally.
+
+Every code path that creates, deletes or moves applications between statuses
+reports the change here; the deltas are applied to JobStatusCount rows with a
+single UPDATE and the new statuses appended to ApplicationStatusEvent with a
+single INSERT, inside the caller's transaction, so counts and history commit
+(or roll back) together with the applications themselves. rebuild_counts() recomputes
+them from scratch for backfills or after out-of-band edits (admin, shell).
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.utils import timezone
+
+from . import calendar_feed
+from .events import publish_status_changes
+from .models import Application, ApplicationStatusEvent, Job, JobStatusCount
+
+STATUSES = [status for status, _label in Application.STATUS_CHOICES]
+
+
+def create_counters(job_ids):
+    """Zeroed rows for every status of `job_ids`; existing rows are left alone."""
+    JobStatusCount.objects.bulk_create(
+        [JobStatusCount(job_id=job_id, status=status) for job_id in job_ids for status in STATUSES],
+        ignore_conflicts=True,
+    )
+
+
+def _increment(deltas):
+    matches = Q()
+    whens = []
+    for (job_id, status), delta in deltas.items():
+        matches |= Q(job_id=job_id, status=status)
+        whens.append(When(job_id=job_id, status=status, then=Value(delta)))
+    return JobStatusCount.objects.filter(matches), F('count') + Case(*whens, default=Value(0))
+
+
+def apply_deltas(deltas):
+    """Add {(job_id, status): delta} to the counters, normally with one UPDATE."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    rows, count = _increment(deltas)
+    if rows.update(count=count) == len(deltas):
+        return
+
+    # Jobs bulk-created without signals have no rows yet: create them and
+    # apply what was missed. Decrements alone never create rows; there is
+    # nothing to subtract from (and the job may be being deleted).
+    existing = set(rows.values_list('job_id', 'status'))
+    missing = {key: delta for key, delta in deltas.items() if key not in existing}
+    create_counters({job_id for (job_id, _status), delta in missing.items() if delta > 0})
+    rows, count = _increment(missing)
+    rows.update(count=count)
+
+
+def record_transitions(changes):
+    """
+    Apply (application_id, job_id, old_status, new_status) changes; None
+    means created or deleted. Deletions leave no event: the application's
+    history is deleted with it.
+    """
+    deltas = Counter()
+    events = []
+    now = timezone.now()
+    for application_id, job_id, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        if old_status is not None:
+            deltas[job_id, old_status] -= 1
+        if new_status is not None:
+            deltas[job_id, new_status] += 1
+            events.append(ApplicationStatusEvent(application_id=application_id, job_id=job_id,
+                                                 from_status=old_status, to_status=new_status, at=now))
+    apply_deltas(deltas)
+    ApplicationStatusEvent.objects.bulk_create(events)
+
+    # Rejecting (or re-opening) an application cancels (or restores) its interview in the calendar feed
+    rejections = [application_id for application_id, _job_id, old_status, new_status in changes
+                  if old_status is not None and new_status is not None and old_status != new_status
+                  and 'rejected' in (old_status, new_status)]
+    if rejections:
+        transaction.on_commit(lambda: calendar_feed.invalidate_applications(rejections))
+
+    # Live status events (core.events); a pub/sub hiccup must not fail the caller
+    changed = [application_id for application_id, _job_id, old_status, new_status in changes
+               if new_status is not None and old_status != new_status]
+    if changed:
+        transaction.on_commit(lambda: publish_status_changes(changed), robust=True)
+
+
+def change_status(application, new_status):
+    """
+    Move `application` to `new_status` and update the counters. The UPDATE
+    only applies if the status is still the one we last read, so concurrent
+    changes to the same application are each counted once, against the right
+    old status. Returns the previous status.
+    """
+    old_status = application.status
+    while True:
+        if old_status == new_status:
+            break
+        with transaction.atomic():
+            if Application.objects.filter(pk=application.pk, status=old_status).update(status=new_status):
+                record_transitions([(application.pk, application.job_id, old_status, new_status)])
+                break
+        # Someone else moved it first; count against the status they left
+        old_status = Application.objects.values_list('status', flat=True).get(pk=application.pk)
+    application.status = new_status
+    return old_status
+
+
+def rebuild_counts(job_ids=None, batch_size=1000):
+    """
+    Recompute counters from the applications table, `batch_size` jobs per
+    transaction. Returns the number of jobs rebuilt.
+    """
+    jobs = Job.objects.order_by('id').values_list('id', flat=True)
+    if job_ids is not None:
+        jobs = jobs.filter(id__in=job_ids)
+    job_ids = list(jobs)
+    for start in range(0, len(job_ids), batch_size):
+        batch = job_ids[start:start + batch_size]
+        with transaction.atomic():
+            totals = Counter({
+                (row['job_id'], row['status']): row['total']
+                for row in Application.objects.filter(job_id__in=batch)
+                .values('job_id', 'status').annotate(total=Count('id')).order_by()
+            })
+            JobStatusCount.objects.filter(job_id__in=batch).delete()
+            JobStatusCount.objects.bulk_create([
+                JobStatusCount(job_id=job_id, status=status, count=totals[job_id, status])
+                for job_id in batch for status in STATUSES
+            ])
+    return len(job_ids)
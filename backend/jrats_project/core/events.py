@@ -0,0 +1,173 @@
+"""
+Live application status events, pushed to the applicant and the recruiter
+of each application as its status changes, instead of having the frontend
+poll the application list.
+
+record_transitions (core.counters) calls publish_status_changes() once the
+change commits. Events go through a per-process hub:
+
+- With EVENTS_REDIS_URL set (REDIS_URL by default), events are PUBLISHed to
+  a per-user channel. Each worker holds one pattern subscription that feeds
+  the queues of its own connected clients.
+- Without it, events are delivered in-process, which is enough for tests
+  and a single worker.
+
+An idle client costs one asyncio queue and a keepalive every
+EVENTS_KEEPALIVE_SECONDS; nothing touches the database. Streams are opened
+with a short-lived signed ticket (issue_ticket) because EventSource can't
+send an Authorization header. Events are not replayed: a client that
+reconnects gets a `ready` event and should refetch what it shows.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core import signing
+
+from .models import Application
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'jrats:events:user:'
+SIGNING_SALT = 'core.events'
+RETRY_MILLISECONDS = 5000
+
+
+def issue_ticket(user_id):
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign(str(user_id))
+
+
+def user_for_ticket(ticket):
+    """The user id `ticket` was issued for, or None if it is invalid or expired."""
+    try:
+        return int(signing.TimestampSigner(salt=SIGNING_SALT).unsign(ticket, max_age=settings.EVENTS_TICKET_MAX_AGE))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+class LocalHub:
+    """Delivers events to the streams connected to this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = {}  # user id -> {queue: its event loop}
+
+    @property
+    def idle(self):
+        return not self._queues
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._queues.setdefault(user_id, {})[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        with self._lock:
+            queues = self._queues.get(user_id, {})
+            queues.pop(queue, None)
+            if not queues:
+                self._queues.pop(user_id, None)
+
+    def deliver(self, user_id, payload):
+        # Called from worker threads as well as the event loop
+        with self._lock:
+            targets = list(self._queues.get(user_id, {}).items())
+        for queue, loop in targets:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, payload)
+            except RuntimeError:
+                self.unsubscribe(user_id, queue)  # Its loop has shut down
+
+    @staticmethod
+    def _put(queue, payload):
+        if queue.full():
+            queue.get_nowait()  # A stalled client loses its oldest event
+        queue.put_nowait(payload)
+
+    def publish(self, user_id, payload):
+        self.deliver(user_id, payload)
+
+
+class RedisHub(LocalHub):
+    """Publishes through Redis; one pattern subscription per process feeds the local streams."""
+
+    def __init__(self, url):
+        super().__init__()
+        import redis
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+        self._listener = None
+
+    @property
+    def idle(self):
+        return False  # Other workers may have subscribers
+
+    def subscribe(self, user_id):
+        queue = super().subscribe(user_id)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return queue
+
+    def publish(self, user_id, payload):
+        self.client.publish(f'{CHANNEL_PREFIX}{user_id}', payload)
+
+    async def _listen(self):
+        import redis.asyncio
+        while True:
+            client = redis.asyncio.Redis.from_url(self.url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f'{CHANNEL_PREFIX}*')
+                    async for message in pubsub.listen():
+                        if message['type'] == 'pmessage':
+                            user_id = int(message['channel'][len(CHANNEL_PREFIX):])
+                            self.deliver(user_id, message['data'].decode())
+            except redis.RedisError:
+                logger.exception('Lost the event subscription; reconnecting')
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+
+_hubs = {}
+
+
+def hub():
+    url = settings.EVENTS_REDIS_URL
+    if url not in _hubs:
+        _hubs[url] = RedisHub(url) if url else LocalHub()
+    return _hubs[url]
+
+
+def publish_status_changes(application_ids):
+    """Tell each application's applicant and recruiter its current status."""
+    events_hub = hub()
+    if events_hub.idle:
+        return
+    rows = Application.objects.filter(id__in=application_ids).values_list(
+        'id', 'job_id', 'status', 'applicant__user_id', 'job__recruiter__user_id'
+    )
+    for application_id, job_id, status, applicant_user_id, recruiter_user_id in rows:
+        payload = json.dumps({'application': application_id, 'job': job_id, 'status': status})
+        for user_id in (applicant_user_id, recruiter_user_id):
+            events_hub.publish(user_id, payload)
+
+
+async def stream(user_id):
+    """The text/event-stream body for `user_id`: their status events, with keepalives while idle."""
+    events_hub = hub()
+    queue = events_hub.subscribe(user_id)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\nevent: ready\ndata: {{}}\n\n'
+        while True:
+            try:
+                payload = await asyncio.wait_for(queue.get(), settings.EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield f'event: status\ndata: {payload}\n\n'
+    finally:
+        events_hub.unsubscribe(user_id, queue)
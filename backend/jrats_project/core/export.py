@@ -0,0 +1,116 @@
+"""
+Streaming exports of a job's applications.
+
+Rows are read with a flat values_list() over .iterator(), so Django keeps
+no result cache and builds no model instances, and each chunk is encoded and
+handed to the client as soon as it is fetched. Memory stays flat however many
+applications a job has; on PostgreSQL the iterator uses a server-side cursor,
+so the first rows go out before the query has produced the last.
+
+Under ASGI, astream_export() does the same with the async ORM: Django would
+read a sync iterator to the end in a thread before sending the first byte.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+
+COLUMNS = (
+    ('id', 'id'),
+    ('status', 'status'),
+    ('applied_at', 'applied_at'),
+    ('applicant_id', 'applicant_id'),
+    ('username', 'applicant__user__username'),
+    ('email', 'applicant__user__email'),
+    ('first_name', 'applicant__user__first_name'),
+    ('last_name', 'applicant__user__last_name'),
+    ('skills', 'applicant__skills'),
+    ('resume', 'applicant__resume'),
+)
+
+NAMES = [name for name, _lookup in COLUMNS]
+LOOKUPS = [lookup for _name, lookup in COLUMNS]
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Spreadsheet apps evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _ordered(queryset):
+    return queryset.order_by('applied_at', 'id')
+
+
+def _as_row(values):
+    row = dict(zip(NAMES, values))
+    row['resume'] = default_storage.url(row['resume']) if row['resume'] else ''
+    return row
+
+
+def export_rows(queryset, chunk_size):
+    """Yield one dict per application in `queryset`, oldest first."""
+    for values in _ordered(queryset).values_list(*LOOKUPS).iterator(chunk_size=chunk_size):
+        yield _as_row(values)
+
+
+async def aexport_rows(queryset, chunk_size):
+    """export_rows() over the async ORM."""
+    # values(), not values_list(): in Django 5.2 values_list().aiterator() runs
+    # its query on the event loop, which raises SynchronousOnlyOperation
+    async for values in _ordered(queryset).values(*LOOKUPS).aiterator(chunk_size=chunk_size):
+        yield _as_row(values[lookup] for lookup in LOOKUPS)
+
+
+class _Echo:
+    """A file-like object whose write() returns what was written, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_safe(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _encoder(export_format):
+    """The header line (or None) and the function encoding one row as a line."""
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+        return writer.writerow(NAMES), lambda row: writer.writerow([_csv_safe(value) for value in row.values()])
+    return None, lambda row: json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def stream_export(queryset, export_format, chunk_size=None):
+    """Yield text blocks for StreamingHttpResponse."""
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    header, encode = _encoder(export_format)
+    # One write per row would make the server flush tiny chunks; group them
+    batch = [header] if header else []
+    for row in export_rows(queryset, chunk_size):
+        batch.append(encode(row))
+        if len(batch) >= chunk_size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+async def astream_export(queryset, export_format, chunk_size=None):
+    """stream_export() as an async generator, for StreamingHttpResponse under ASGI."""
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    header, encode = _encoder(export_format)
+    batch = [header] if header else []
+    async for row in aexport_rows(queryset, chunk_size):
+        batch.append(encode(row))
+        if len(batch) >= chunk_size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
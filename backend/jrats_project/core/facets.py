@@ -0,0 +1,89 @@
+"""
+Job board filters and facet counts.
+
+JobFilter backs the ?location=, ?company=, ?created_after= and
+?created_before= filters on the job list; each is served by one of the Job
+indexes (see JobCursorPagination).
+
+Facet counts (jobs per location and per company) live in JobFacetCount and
+are adjusted as jobs change: by the Job and RecruiterProfile signals, and in
+bulk by core.imports. Reading facets is one indexed query per facet however
+many jobs there are. rebuild_facets() recomputes them from scratch for
+backfills or after out-of-band edits.
+"""
+from collections import Counter
+
+import django_filters
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+
+from .models import Job, JobFacetCount
+
+FACETS = [facet for facet, _label in JobFacetCount.FACET_CHOICES]
+MAX_FACET_VALUES = 50
+
+
+class JobFilter(django_filters.FilterSet):
+    location = django_filters.CharFilter(field_name='location')
+    company = django_filters.CharFilter(field_name='recruiter__company_name')
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = Job
+        fields = ['location', 'company', 'created_after', 'created_before']
+
+
+def job_facet_deltas(jobs, company_name, sign=1):
+    """{(facet, value): delta} for adding (or with sign=-1, removing) `jobs` of one company."""
+    deltas = Counter()
+    for job in jobs:
+        deltas['location', job.location] += sign
+        deltas['company', company_name] += sign
+    return deltas
+
+
+def _increment(deltas):
+    matches = Q()
+    whens = []
+    for (facet, value), delta in deltas.items():
+        matches |= Q(facet=facet, value=value)
+        whens.append(When(facet=facet, value=value, then=Value(delta)))
+    return JobFacetCount.objects.filter(matches), F('count') + Case(*whens, default=Value(0))
+
+
+def apply_facet_deltas(deltas):
+    """Add {(facet, value): delta} to the facet counts with one INSERT and one UPDATE."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    JobFacetCount.objects.bulk_create(
+        [JobFacetCount(facet=facet, value=value) for (facet, value), delta in deltas.items() if delta > 0],
+        ignore_conflicts=True,
+    )
+    rows, count = _increment(deltas)
+    rows.update(count=count)
+
+
+def rebuild_facets():
+    """Recompute every facet count from the jobs table."""
+    locations = Job.objects.values_list('location').annotate(jobs=Count('id')).order_by()
+    companies = Job.objects.values_list('recruiter__company_name').annotate(jobs=Count('id')).order_by()
+    with transaction.atomic():
+        JobFacetCount.objects.all().delete()
+        JobFacetCount.objects.bulk_create(
+            [JobFacetCount(facet='location', value=value, count=count) for value, count in locations]
+            + [JobFacetCount(facet='company', value=value, count=count) for value, count in companies]
+        )
+
+
+def facet_counts(limit=MAX_FACET_VALUES):
+    """The `limit` most common values of each facet, most jobs first."""
+    return {
+        facet: [
+            {'value': value, 'count': count}
+            for value, count in JobFacetCount.objects.filter(facet=facet, count__gt=0)
+            .order_by('-count', 'value').values_list('value', 'count')[:limit]
+        ]
+        for facet in FACETS
+    }
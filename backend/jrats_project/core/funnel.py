@@ -0,0 +1,118 @@
+"""
+Hiring-funnel analytics materialized from the status-event log.
+
+refresh_funnel_stats() replays each job's ApplicationStatusEvent rows, read
+through the (job, at) index, into JobStageStat (time in stage) and
+JobStageTransition (stage-to-stage conversions). Analytics reads only those
+tables and never scans applications. Refreshes are incremental: only jobs
+with events newer than the last refresh are rebuilt.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .counters import STATUSES
+from .models import ApplicationStatusEvent, JobStageStat, JobStageTransition
+
+
+def _replay(events):
+    """
+    Fold events ordered by (job, application, at, id) into per-job
+    entered/exited/seconds totals by status and transition counts.
+    """
+    stages = defaultdict(lambda: {'entered': 0, 'exited': 0, 'seconds_in_stage': 0.0})
+    transitions = Counter()
+    previous = None
+    for job_id, application_id, from_status, to_status, at in events:
+        stages[job_id, to_status]['entered'] += 1
+        if from_status is not None:
+            transitions[job_id, from_status, to_status] += 1
+        if previous is not None and previous[0] == application_id:
+            _app, left_status, entered_at = previous
+            stage = stages[job_id, left_status]
+            stage['exited'] += 1
+            stage['seconds_in_stage'] += (at - entered_at).total_seconds()
+        previous = (application_id, to_status, at)
+    return stages, transitions
+
+
+def rebuild_job_stats(job_ids, through):
+    """Replace the aggregates of `job_ids` with ones computed from events up to id `through`."""
+    events = (
+        ApplicationStatusEvent.objects.filter(job_id__in=job_ids, id__lte=through)
+        .order_by('job_id', 'application_id', 'at', 'id')
+        .values_list('job_id', 'application_id', 'from_status', 'to_status', 'at')
+    )
+    stages, transitions = _replay(events.iterator(chunk_size=5000))
+    now = timezone.now()
+    with transaction.atomic():
+        JobStageStat.objects.filter(job_id__in=job_ids).delete()
+        JobStageTransition.objects.filter(job_id__in=job_ids).delete()
+        JobStageStat.objects.bulk_create([
+            JobStageStat(job_id=job_id, status=status, refreshed_through=through, refreshed_at=now, **totals)
+            for (job_id, status), totals in stages.items()
+        ])
+        JobStageTransition.objects.bulk_create([
+            JobStageTransition(job_id=job_id, from_status=from_status, to_status=to_status, count=count)
+            for (job_id, from_status, to_status), count in transitions.items()
+        ])
+
+
+def refresh_funnel_stats(full=False, batch_size=500):
+    """
+    Rebuild the aggregates of every job with events newer than the last
+    refresh, `batch_size` jobs at a time, or of every job when `full` is set.
+    Returns the number of jobs rebuilt.
+
+    Ids are assigned before commit, so an event committed late can land below
+    the watermark; an occasional full refresh picks those up.
+    """
+    through = ApplicationStatusEvent.objects.aggregate(last=Max('id'))['last'] or 0
+    events = ApplicationStatusEvent.objects.filter(id__lte=through)
+    if full:
+        # Include jobs whose events are all gone, so their stale rows are dropped
+        job_ids = set(events.values_list('job_id', flat=True).distinct())
+        job_ids.update(JobStageStat.objects.values_list('job_id', flat=True).distinct())
+    else:
+        since = JobStageStat.objects.aggregate(last=Max('refreshed_through'))['last'] or 0
+        job_ids = set(events.filter(id__gt=since).values_list('job_id', flat=True).distinct())
+
+    job_ids = sorted(job_ids)
+    for start in range(0, len(job_ids), batch_size):
+        rebuild_job_stats(job_ids[start:start + batch_size], through)
+    return len(job_ids)
+
+
+def job_funnel(job):
+    """Time in stage and conversion rates for `job` from the materialized tables."""
+    stages = {stat.status: stat for stat in JobStageStat.objects.filter(job=job)}
+    stage_rows = []
+    for status in STATUSES:
+        stat = stages.get(status)
+        if stat is None:
+            continue
+        stage_rows.append({
+            'status': status,
+            'entered': stat.entered,
+            'exited': stat.exited,
+            'current': stat.entered - stat.exited,
+            'avg_seconds_in_stage': stat.seconds_in_stage / stat.exited if stat.exited else None,
+        })
+    conversions = []
+    for transition in JobStageTransition.objects.filter(job=job).order_by('from_status', 'to_status'):
+        entered = stages[transition.from_status].entered if transition.from_status in stages else 0
+        conversions.append({
+            'from_status': transition.from_status,
+            'to_status': transition.to_status,
+            'count': transition.count,
+            'rate': transition.count / entered if entered else None,
+        })
+    refreshed = [stat.refreshed_at for stat in stages.values()]
+    return {
+        'job': job.id,
+        'refreshed_at': max(refreshed) if refreshed else None,
+        'stages': stage_rows,
+        'conversions': conversions,
+    }
@@ -0,0 +1,106 @@
+"""
+Exactly-once handling for retried requests and redelivered tasks.
+
+`idempotent` makes a POST handler honour an `Idempotency-Key` header: the
+first request with a key runs and its response is stored in the same
+transaction as its writes; repeats replay that response instead of running
+again. A concurrent repeat blocks on the key's unique index until the first
+commits, then replays.
+
+`claim_task` is the task-side guard. It inserts a TaskLock row keyed on,
+for example, the application and action, inside the task's transaction.
+A duplicate delivery finds the row and does nothing. If the task fails, the
+claim rolls back with it, so a retry can run.
+"""
+import functools
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey, TaskLock
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def fingerprint(request):
+    """Digest of what the request asks for, to detect a key reused for something else."""
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f'{request.method} {request.path}\n{body}'.encode()).hexdigest()
+
+
+def _replay(record, request_hash):
+    if record.request_hash != request_hash:
+        return Response({"error": f"{HEADER} was already used for a different request."},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    response = Response(record.response_body, status=record.response_status)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(handler):
+    """Decorator for APIView methods; requests without the header run as usual."""
+
+    @functools.wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return handler(view, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response({"error": f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash = fingerprint(request)
+        expired = timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        with transaction.atomic():
+            IdempotencyKey.objects.filter(user=request.user, key=key, created_at__lt=expired).delete()
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(user=request.user, key=key, request_hash=request_hash)
+            except IntegrityError:
+                return _replay(IdempotencyKey.objects.get(user=request.user, key=key), request_hash)
+
+            response = handler(view, request, *args, **kwargs)
+            if response.status_code >= 500:
+                # Not an answer worth replaying; let the client retry for real
+                record.delete()
+            else:
+                record.response_status = response.status_code
+                record.response_body = response.data
+                record.save(update_fields=['response_status', 'response_body'])
+            return response
+
+    return wrapper
+
+
+def claim_task(key, ttl=None):
+    """
+    Claim `key` for the current transaction, returning False if another run
+    already holds an unexpired claim. Call inside transaction.atomic().
+    """
+    ttl = ttl if ttl is not None else settings.TASK_LOCK_TTL_SECONDS
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            TaskLock.objects.create(key=key, expires_at=now + timedelta(seconds=ttl))
+        return True
+    except IntegrityError:
+        # Take over a claim whose holder finished long enough ago
+        return bool(TaskLock.objects.filter(key=key, expires_at__lte=now)
+                    .update(expires_at=now + timedelta(seconds=ttl)))
+
+
+def purge_expired():
+    """Delete idempotency keys past IDEMPOTENCY_KEY_TTL_HOURS and expired task claims."""
+    now = timezone.now()
+    keys, _ = IdempotencyKey.objects.filter(
+        created_at__lt=now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    ).delete()
+    locks, _ = TaskLock.objects.filter(expires_at__lte=now).delete()
+    return keys + locks
@@ -0,0 +1,140 @@
+"""
+Bulk job import from CSV or NDJSON uploads.
+
+The upload is decoded and parsed line by line, so the file is never held
+in memory as a whole. Rows are validated with one JobSerializer per batch,
+which avoids rebuilding its fields for every row. Valid rows are inserted
+with bulk_create in JOB_IMPORT_CHUNK_SIZE chunks inside one transaction.
+Invalid rows are reported by row number and skipped; they never abort the
+rest of the file.
+
+bulk_create sends no signals, so the work of the Job signals is done in
+bulk or deferred instead:
+- The job-board cache is invalidated once, on commit.
+- Search postings are built by the index_imported_jobs task after commit.
+  They are several rows per job and would otherwise dominate the import.
+- Dashboard counters are not created here. core.counters creates a job's
+  rows on its first application.
+- Facet counts are adjusted once per batch.
+"""
+import codecs
+import csv
+import json
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from .cache import job_cache
+from .facets import apply_facet_deltas, job_facet_deltas
+from .models import Job
+from .serializers import JobSerializer
+from .tasks import index_imported_jobs
+
+FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'ndjson': ('application/x-ndjson', '.ndjson'),
+}
+REQUIRED_COLUMNS = ('title', 'description', 'location')
+
+
+class JobImportError(Exception):
+    """The upload as a whole cannot be imported (bad header, encoding, too many rows)."""
+
+
+def format_for(content_type, filename=''):
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    for name, (mime, extension) in FORMATS.items():
+        if content_type == mime or filename.lower().endswith(extension):
+            return name
+    return None
+
+
+def _lines(stream):
+    # Decode incrementally; a multi-byte character split across reads is kept for the next one
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    pending = ''
+    for block in iter(lambda: stream.read(64 * 1024), b''):
+        pending += decoder.decode(block)
+        *lines, pending = pending.split('\n')
+        yield from (line + '\n' for line in lines)
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def csv_rows(stream):
+    """Yield (row number, dict) for each CSV data row; row 1 follows the header."""
+    reader = csv.DictReader(_lines(stream))
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+    if missing:
+        raise JobImportError(f"The CSV header is missing: {', '.join(missing)}.")
+    for number, row in enumerate(reader, 1):
+        yield number, row
+
+
+def ndjson_rows(stream):
+    """Yield (line number, dict or None) for each non-blank line; None marks unparseable lines."""
+    for number, line in enumerate(_lines(stream), 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(recruiter, validated):
+    jobs = Job.objects.bulk_create([Job(recruiter=recruiter, **data) for data in validated])
+    apply_facet_deltas(job_facet_deltas(jobs, recruiter.company_name))
+    job_ids = [job.id for job in jobs]
+    transaction.on_commit(lambda: index_imported_jobs.delay(job_ids))
+    return jobs
+
+
+def import_jobs(recruiter, stream, import_format, chunk_size=None):
+    """
+    Create jobs for `recruiter` from the rows in `stream` and return a
+    report: counts of created and failed rows plus per-row errors (the first
+    JOB_IMPORT_MAX_ERRORS of them). Raises JobImportError if the file as a
+    whole is unusable, in which case nothing is created.
+    """
+    chunk_size = chunk_size or settings.JOB_IMPORT_CHUNK_SIZE
+    rows = csv_rows(stream) if import_format == 'csv' else ndjson_rows(stream)
+    report = {'created': 0, 'failed': 0, 'errors': []}
+    seen = 0
+    try:
+        with transaction.atomic():
+            for batch in _batched(rows, chunk_size):
+                seen += len(batch)
+                if seen > settings.JOB_IMPORT_MAX_ROWS:
+                    raise JobImportError(f"Imports are limited to {settings.JOB_IMPORT_MAX_ROWS} rows.")
+                serializer = JobSerializer()
+                validated = []
+                for number, row in batch:
+                    try:
+                        if row is None:
+                            raise serializers.ValidationError({'non_field_errors': ['Not a JSON object.']})
+                        validated.append(serializer.run_validation(row))
+                    except serializers.ValidationError as error:
+                        report['failed'] += 1
+                        if len(report['errors']) < settings.JOB_IMPORT_MAX_ERRORS:
+                            report['errors'].append({'row': number, 'errors': error.detail})
+                if validated:
+                    report['created'] += len(_insert(recruiter, validated))
+            transaction.on_commit(job_cache.invalidate)
+    except (UnicodeDecodeError, csv.Error) as error:
+        raise JobImportError(f"The file could not be read: {error}.")
+    return report
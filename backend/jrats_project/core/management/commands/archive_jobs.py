@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.archive import archivable_jobs, archive_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves jobs closed more than JOB_ARCHIVE_AFTER_DAYS ago, or posted more than "
+        "JOB_EXPIRY_DAYS ago, and their applications into the archive tables. Celery "
+        "beat runs this hourly with a bounded number of batches; use --max-batches "
+        "to work through a large backlog in one go."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.JOB_ARCHIVE_BATCH_SIZE,
+                            help='Jobs per transaction.')
+        parser.add_argument('--max-batches', type=int, default=settings.JOB_ARCHIVE_MAX_BATCHES)
+        parser.add_argument('--dry-run', action='store_true', help='Only count the jobs that would be archived.')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f'{archivable_jobs().count()} jobs would be archived')
+            return
+        start = time.perf_counter()
+        count = archive_jobs(batch_size=options['batch_size'], max_batches=options['max_batches'])
+        self.stdout.write(f'Archived {count} jobs in {time.perf_counter() - start:.1f}s')
@@ -0,0 +1,357 @@
+import contextlib
+import io
+import itertools
+import json
+import logging
+import random
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core import calendar_feed, urls as core_urls
+from core.benchmark import (isolated_database, seed_recruiters, seed_applicants, seed_jobs,
+                            seed_application_spread, seed_interviews, seed_status_events, percentile)
+from core.models import User, Application, ApplicantProfile
+from core.resumes import store_resume, start_upload
+from core.counters import rebuild_counts
+from core.funnel import refresh_funnel_stats
+from core.search import index_jobs
+from jrats_project.celery import app as celery_app
+
+
+class Scenarios:
+    """
+    One request builder per named route in core/urls.py. Each builder returns
+    (user or None, method, path, payload, format) for iteration `i`; write
+    routes draw fresh ids/tokens so repeated calls stay valid.
+    """
+    # Routes that can't be timed as a request/response, and why
+    untimed = {'application-events': 'open-ended event stream'}
+
+    def __init__(self, recruiter, applicant, admin, jobs, applications, pending_interviews):
+        self.recruiter = recruiter
+        self.applicant = applicant
+        self.admin = admin
+        self.job = jobs[0]
+        self.jobs = jobs
+        self.recruiter_jobs = [job for job in jobs if job.recruiter_id == recruiter.recruiter_profile.id]
+        self.recruiter_applications = list(
+            Application.objects.filter(job__recruiter=recruiter.recruiter_profile).values_list('id', flat=True)
+        )
+        self.applicant_application = Application.objects.filter(applicant=applicant.applicant_profile).first()
+        self.tokens = iter(interview.scheduling_token for interview in pending_interviews)
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.first_slot = (timezone.now() + timedelta(days=400)).replace(minute=0, second=0, microsecond=0)
+        # Seeded profiles only name a resume; give the benchmark applicant a real 200 KB one
+        self.resume_blob = store_resume(io.BytesIO(b'%PDF-1.4 ' + b'x' * 200_000), 'bench.pdf')
+        ApplicantProfile.objects.filter(user=applicant).update(resume=self.resume_blob.file.name,
+                                                               resume_blob=self.resume_blob)
+        self.pending_upload = start_upload('bench.pdf', 1024)
+
+    def next(self, iterator):
+        with self.lock:
+            return next(iterator)
+
+    def build(self, name, i):
+        return getattr(self, name.replace('-', '_'))(i)
+
+    def warm_up(self, name):
+        # Routes that serve a prebuilt body are measured on a warm poll
+        warm = getattr(self, f"warm_{name.replace('-', '_')}", None)
+        if warm is not None:
+            warm()
+
+    def recruiter_signup(self, i):
+        n = self.next(self.counter)
+        return None, 'post', '/api/signup/recruiter/', {
+            'user': {'username': f'load_recruiter_{n}', 'email': f'load_recruiter_{n}@bench.jrats.com',
+                     'password': 'Benchmark-pass-1'},
+            'company_name': 'Load Test Ltd',
+        }, 'json'
+
+    def applicant_signup(self, i):
+        n = self.next(self.counter)
+        return None, 'post', '/api/signup/applicant/', {
+            'user.username': f'load_applicant_{n}', 'user.email': f'load_applicant_{n}@bench.jrats.com',
+            'user.password': 'Benchmark-pass-1', 'skills': 'Python, Django',
+            'resume': SimpleUploadedFile('resume.pdf', b'%PDF-1.4 benchmark', content_type='application/pdf'),
+        }, 'multipart'
+
+    def job_list(self, i):
+        return self.applicant, 'get', '/api/jobs/', None, None
+
+    def job_search(self, i):
+        return self.applicant, 'get', '/api/jobs/search/', {'q': random.choice(['engineer', 'python', 'data scientist'])}, None
+
+    def job_facets(self, i):
+        return self.applicant, 'get', '/api/jobs/facets/', None, None
+
+    def job_import(self, i):
+        rows = ''.join(f'Imported Engineer {i}-{n},Build and maintain services.,City {n % 25}\n' for n in range(500))
+        upload = SimpleUploadedFile('jobs.csv', f'title,description,location\n{rows}'.encode(), content_type='text/csv')
+        return self.recruiter, 'post', '/api/jobs/import/', {'file': upload}, 'multipart'
+
+    def job_detail(self, i):
+        return self.recruiter, 'get', f'/api/jobs/{self.jobs[i % len(self.jobs)].id}/', None, None
+
+    def job_candidate_matches(self, i):
+        return self.recruiter, 'get', f'/api/jobs/{self.job.id}/matches/', None, None
+
+    def job_slots(self, i):
+        return self.applicant, 'get', f'/api/jobs/{self.job.id}/slots/', None, None
+
+    def job_application_export(self, i):
+        return self.recruiter, 'get', f'/api/jobs/{self.job.id}/applications/export/', {
+            'output': 'ndjson' if i % 2 else 'csv'}, None
+
+    def job_funnel(self, i):
+        return self.recruiter, 'get', f'/api/jobs/{self.recruiter_jobs[i % len(self.recruiter_jobs)].id}/funnel/', None, None
+
+    def application_list(self, i):
+        user = self.recruiter if i % 2 else self.applicant
+        return user, 'get', '/api/applications/', None, None
+
+    def application_detail(self, i):
+        return self.applicant, 'get', f'/api/applications/{self.applicant_application.id}/', None, None
+
+    def application_timeline(self, i):
+        application_id = self.recruiter_applications[i % len(self.recruiter_applications)]
+        return self.recruiter, 'get', f'/api/applications/{application_id}/timeline/', None, None
+
+    def advance_application(self, i):
+        application_id = self.recruiter_applications[i % len(self.recruiter_applications)]
+        return self.recruiter, 'post', f'/api/applications/{application_id}/advance/', {
+            'action': 'invite' if i % 2 else 'reject'}, 'json'
+
+    def bulk_advance_applications(self, i):
+        return self.recruiter, 'post', '/api/applications/bulk-advance/', {
+            'action': 'invite' if i % 2 else 'reject', 'ids': self.recruiter_applications[:50]}, 'json'
+
+    def schedule_interview(self, i):
+        token = self.next(self.tokens)
+        n = self.next(self.counter)
+        when = self.first_slot + timedelta(hours=n)
+        return None, 'post', f'/api/interview/schedule/{token}/', {'scheduled_time': when.isoformat()}, 'json'
+
+    def resume_upload_start(self, i):
+        return None, 'post', '/api/resumes/uploads/', {'filename': 'cv.pdf', 'size': 200_000}, 'json'
+
+    def resume_upload(self, i):
+        return None, 'get', f'/api/resumes/uploads/{self.pending_upload.id}/', None, None
+
+    def applicant_resume(self, i):
+        return self.applicant, 'get', f'/api/applicants/{self.applicant.applicant_profile.id}/resume/', None, None
+
+    def recruiter_dashboard(self, i):
+        return self.recruiter, 'get', '/api/dashboard/', None, None
+
+    def recruiter_calendar_link(self, i):
+        return self.recruiter, 'get', '/api/recruiters/me/calendar/', None, None
+
+    def recruiter_calendar_feed(self, i):
+        profile = self.recruiter.recruiter_profile
+        token = calendar_feed.feed_token(profile.id, profile.calendar_token_version)
+        return None, 'get', f'/api/recruiters/{profile.id}/calendar.ics', {'token': token}, None
+
+    def warm_recruiter_calendar_feed(self):
+        calendar_feed.get_feed(self.recruiter.recruiter_profile.id)
+
+    def user_profile(self, i):
+        return self.recruiter if i % 2 else self.applicant, 'get', '/api/profile/me/', None, None
+
+    def cache_stats(self, i):
+        return self.admin, 'get', '/api/cache/stats/', None, None
+
+    def metrics(self, i):
+        return self.admin, 'get', '/api/metrics/', None, None
+
+    def application_events_ticket(self, i):
+        return self.applicant, 'post', '/api/events/ticket/', None, None
+
+
+def perform(scenarios, name, i):
+    user, method, path, payload, fmt = scenarios.build(name, i)
+    # A distinct address per request: the per-IP throttles (core.throttling)
+    # still run, but never reject, so the timings measure the route itself
+    client = APIClient(REMOTE_ADDR=f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}')
+    if user is not None:
+        client.force_authenticate(user=user)
+    kwargs = {'format': fmt} if fmt else {}
+    response = getattr(client, method)(path, payload, **kwargs)
+    if response.streaming:
+        # Consume the body so the timing covers the whole export
+        for _chunk in response.streaming_content:
+            pass
+    return response
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway database with bulk_create, drives every route in core/urls.py "
+        "through the test client under concurrency and reports p50/p95/p99 latency, "
+        "queries per request and allocations. Results can be written to JSON and "
+        "compared against a previous run. SQLite serializes writers, so expect "
+        "lock errors on write routes at high concurrency unless run against Postgres."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recruiters', type=int, default=20)
+        parser.add_argument('--jobs', type=int, default=2000)
+        parser.add_argument('--applicants', type=int, default=5000)
+        parser.add_argument('--applications', type=int, default=20000)
+        parser.add_argument('--interviews', type=int, default=1000)
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per route.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--routes', help='Comma-separated route names to run (default: all).')
+        parser.add_argument('--output', help='Write results to this JSON file.')
+        parser.add_argument('--baseline', help='Compare against a JSON file from a previous run.')
+        parser.add_argument('--threshold', type=float, default=0.10,
+                            help='Relative p95/query growth that counts as a regression (default 0.10).')
+        parser.add_argument('--fail-on-regression', action='store_true')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        # Tasks run inline so no broker is needed; uploads go to a scratch directory
+        celery_app.conf.task_always_eager = True
+        # Failed requests are counted in the report; don't also dump their tracebacks
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        # The signup fixture is not a complete PDF; text extraction just records it as empty
+        logging.getLogger('pypdf').setLevel(logging.CRITICAL)
+        # Tasks print scheduling links; keep them out of the report (self.stdout
+        # still points at the real stdout)
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root, RESUME_UPLOAD_DIR=media_root), \
+                contextlib.redirect_stdout(io.StringIO()), isolated_database():
+            results = self.run(options)
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+            self.stdout.write(f"Wrote {options['output']}")
+        if options['baseline']:
+            regressions = self.compare(results, options['baseline'], options['threshold'])
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} route(s) regressed: {', '.join(regressions)}")
+
+    def seed(self, options):
+        start = time.perf_counter()
+        recruiters = seed_recruiters(options['recruiters'])
+        jobs = seed_jobs(recruiters, options['jobs'])
+        index_jobs(jobs)
+        applicants = seed_applicants(options['applicants'])
+        applications = seed_application_spread(jobs, applicants, options['applications'])
+        scheduled = options['interviews'] // 2
+        pending = seed_interviews(applications, scheduled, options['interviews'] - scheduled)
+        rebuild_counts()
+        seed_status_events()
+        refresh_funnel_stats()
+        admin = User.objects.create_superuser(username='bench_admin', email='bench_admin@bench.jrats.com',
+                                              password=None)
+        self.stdout.write(f'Seeded data in {time.perf_counter() - start:.1f}s')
+        return Scenarios(recruiters[0].user, applicants[0].user, admin, jobs, applications, pending)
+
+    def route_names(self, options):
+        names = [pattern.name for pattern in core_urls.urlpatterns if pattern.name]
+        if options['routes']:
+            wanted = options['routes'].split(',')
+            unknown = set(wanted) - set(names)
+            if unknown:
+                raise CommandError(f"Unknown routes: {', '.join(sorted(unknown))}")
+            names = [name for name in names if name in wanted]
+        return names
+
+    def run(self, options):
+        scenarios = self.seed(options)
+        results = {
+            'meta': {key: options[key] for key in
+                     ('recruiters', 'jobs', 'applicants', 'applications', 'interviews', 'requests', 'concurrency')},
+            'routes': {},
+        }
+        self.stdout.write(f"{'route':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}"
+                          f"{'queries':>9}{'alloc KiB':>11}{'errors':>8}")
+        for name in self.route_names(options):
+            if not hasattr(scenarios, name.replace('-', '_')):
+                reason = scenarios.untimed.get(name, 'no scenario defined')
+                self.stdout.write(f'{name:<28}  skipped: {reason}')
+                results['routes'][name] = {'skipped': True}
+                continue
+            results['routes'][name] = stats = self.measure(scenarios, name, options)
+            self.stdout.write(
+                f"{name:<28}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+                f"{stats['requests_per_second']:>9.1f}{stats['queries_per_request']:>9.1f}"
+                f"{stats['allocated_kib']:>11.1f}{stats['errors']:>8}"
+            )
+        return results
+
+    def measure(self, scenarios, name, options):
+        # Queries and allocations are measured on a single sequential request:
+        # tracemalloc is process-wide, so concurrent requests would blur it.
+        scenarios.warm_up(name)
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            perform(scenarios, name, 0)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        latencies, errors = [], 0
+        lock = threading.Lock()
+
+        def timed(i):
+            nonlocal errors
+            start = time.perf_counter()
+            try:
+                status_code = perform(scenarios, name, i).status_code
+            except Exception:
+                status_code = 500
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if status_code >= 500 or status_code == 429:
+                    errors += 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(timed, range(1, options['requests'] + 1)))
+        wall = time.perf_counter() - started
+
+        return {
+            'p50_ms': percentile(latencies, 0.50),
+            'p95_ms': percentile(latencies, 0.95),
+            'p99_ms': percentile(latencies, 0.99),
+            'mean_ms': statistics.fmean(latencies),
+            'requests_per_second': len(latencies) / wall if wall else 0.0,
+            'queries_per_request': len(queries.captured_queries),
+            'allocated_kib': peak / 1024,
+            'errors': errors,
+        }
+
+    def compare(self, results, baseline_path, threshold):
+        with open(baseline_path) as handle:
+            baseline = json.load(handle)['routes']
+        self.stdout.write(f"\n{'route':<28}{'p95 change':>12}{'queries':>12}")
+        regressions = []
+        for name, stats in results['routes'].items():
+            before = baseline.get(name)
+            if stats.get('skipped') or not before or before.get('skipped'):
+                continue
+            p95_change = (stats['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0.0
+            query_change = stats['queries_per_request'] - before['queries_per_request']
+            regressed = p95_change > threshold or query_change > 0
+            if regressed:
+                regressions.append(name)
+            self.stdout.write(f"{name:<28}{p95_change:>+11.1%}{query_change:>+12d}" + ('  REGRESSED' if regressed else ''))
+        return regressions
@@ -0,0 +1,232 @@
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.benchmark import (seed_recruiters, seed_applicants, seed_jobs, seed_application_spread, percentile)
+from core.counters import rebuild_counts
+from core.search import index_jobs
+
+SERVERS = {
+    'wsgi': lambda options, port: [
+        sys.executable, '-m', 'gunicorn', 'jrats_project.wsgi:application', '--bind', f'127.0.0.1:{port}',
+        '--workers', str(options['workers']), '--worker-class', 'gthread', '--threads', str(options['threads']),
+        '--keep-alive', '30', '--log-level', 'warning',
+    ],
+    'asgi': lambda options, port: [
+        sys.executable, '-m', 'uvicorn', 'jrats_project.asgi:application', '--host', '127.0.0.1',
+        '--port', str(port), '--workers', str(options['workers']), '--no-access-log', '--log-level', 'warning',
+    ],
+}
+ROUTES = ('job-list', 'job-detail', 'application-list', 'user-profile')
+
+
+@contextmanager
+def file_database(path):
+    """Point the default connection at a SQLite file the servers can open too."""
+    old_name = connection.settings_dict['NAME']
+    connection.close()
+    connection.settings_dict['NAME'] = path
+    try:
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict['NAME'] = old_name
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_code = int(head.split(b' ', 2)[1])
+    headers = {}
+    for line in head.decode('latin-1').split('\r\n')[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status_code, headers.get('connection', '').lower() != 'close'
+
+
+async def drive(port, requests, connections, duration):
+    """
+    Keep `connections` HTTP/1.1 keep-alive connections busy for `duration`
+    seconds, cycling through the raw `requests`. Returns latencies (ms),
+    errors and the wall time.
+    """
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def client(n):
+        nonlocal errors
+        reader = writer = None
+        i = n
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(requests[i % len(requests)])
+                status_code, keep_alive = await read_response(reader)
+            except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                errors += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                await asyncio.sleep(0.01)
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status_code >= 400:
+                errors += 1
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+            i += connections
+        if writer is not None:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(connections)))
+    return latencies, errors, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Serves a seeded SQLite copy with gunicorn (WSGI, threaded workers) and uvicorn "
+        "(ASGI, async views), drives the read endpoints over many keep-alive connections "
+        "and reports throughput and p50/p95/p99 latency per server. The load generator is "
+        "a single asyncio process, so on small machines it can become the bottleneck; "
+        "compare the two modes with each other rather than with absolute numbers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recruiters', type=int, default=20)
+        parser.add_argument('--jobs', type=int, default=2000)
+        parser.add_argument('--applicants', type=int, default=2000)
+        parser.add_argument('--applications', type=int, default=10000)
+        parser.add_argument('--connections', type=int, default=500)
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per route and server.')
+        parser.add_argument('--workers', type=int, default=2, help='Server processes for both modes.')
+        parser.add_argument('--threads', type=int, default=16, help='Threads per gunicorn worker.')
+        parser.add_argument('--modes', default='wsgi,asgi')
+        parser.add_argument('--routes', default=','.join(ROUTES))
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--output', help='Write results to this JSON file.')
+
+    def handle(self, *args, **options):
+        modes = options['modes'].split(',')
+        routes = options['routes'].split(',')
+        unknown = (set(modes) - set(SERVERS)) | (set(routes) - set(ROUTES))
+        if unknown:
+            raise CommandError(f"Unknown modes or routes: {', '.join(sorted(unknown))}")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.sqlite3')
+            with file_database(path):
+                requests = self.seed(options, routes)
+            env = dict(os.environ, SQLITE_PATH=path, PYTHONUNBUFFERED='1')
+            results = {'meta': {key: options[key] for key in
+                                ('jobs', 'applications', 'connections', 'duration', 'workers', 'threads')},
+                       'servers': {}}
+            self.stdout.write(f"{'server':<8}{'route':<20}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+                              f"{'p99 ms':>9}{'errors':>8}")
+            for mode in modes:
+                # Only the ASGI entry point turns the async views on
+                env['ASYNC_VIEWS'] = '1' if mode == 'asgi' else '0'
+                results['servers'][mode] = self.run_server(mode, env, requests, options)
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+            self.stdout.write(f"Wrote {options['output']}")
+
+    def seed(self, options, routes):
+        start = time.perf_counter()
+        call_command('migrate', verbosity=0)
+        recruiters = seed_recruiters(options['recruiters'])
+        jobs = seed_jobs(recruiters, options['jobs'])
+        index_jobs(jobs)
+        applicants = seed_applicants(options['applicants'])
+        seed_application_spread(jobs, applicants, options['applications'])
+        rebuild_counts()
+        self.stdout.write(f'Seeded data in {time.perf_counter() - start:.1f}s')
+
+        recruiter, applicant = recruiters[0].user, applicants[0].user
+        job_ids = [job.id for job in jobs if job.recruiter_id == recruiters[0].id][:50]
+        paths = {
+            'job-list': [(applicant, '/api/jobs/')],
+            'job-detail': [(recruiter, f'/api/jobs/{job_id}/') for job_id in job_ids],
+            'application-list': [(recruiter, '/api/applications/'), (applicant, '/api/applications/')],
+            'user-profile': [(recruiter, '/api/profile/me/'), (applicant, '/api/profile/me/')],
+        }
+        tokens = {user.id: str(AccessToken.for_user(user)) for user in (recruiter, applicant)}
+        return {
+            route: [
+                (f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+                 f'Authorization: Bearer {tokens[user.id]}\r\n\r\n').encode()
+                for user, path in paths[route]
+            ]
+            for route in routes
+        }
+
+    def run_server(self, mode, env, requests, options):
+        port = options['port']
+        server = subprocess.Popen(SERVERS[mode](options, port), cwd=settings.BASE_DIR, env=env,
+                                  start_new_session=True)
+        try:
+            self.wait_until_ready(server, port)
+            results = {}
+            for route, route_requests in requests.items():
+                # Warm caches and connections before timing
+                asyncio.run(drive(port, route_requests, min(options['connections'], 20), 1.0))
+                latencies, errors, wall = asyncio.run(
+                    drive(port, route_requests, options['connections'], options['duration'])
+                )
+                results[route] = stats = {
+                    'requests_per_second': len(latencies) / wall if wall else 0.0,
+                    'p50_ms': percentile(latencies, 0.50),
+                    'p95_ms': percentile(latencies, 0.95),
+                    'p99_ms': percentile(latencies, 0.99),
+                    'errors': errors,
+                }
+                self.stdout.write(
+                    f"{mode:<8}{route:<20}{stats['requests_per_second']:>9.1f}{stats['p50_ms']:>9.2f}"
+                    f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{errors:>8}"
+                )
+            return results
+        finally:
+            os.killpg(server.pid, signal.SIGTERM)
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(server.pid, signal.SIGKILL)
+                server.wait()
+
+    def wait_until_ready(self, server, port, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f'The server exited with status {server.returncode}.')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'The server did not start listening on port {port} within {timeout}s.')
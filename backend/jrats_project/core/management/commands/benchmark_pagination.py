@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.request import Request
+
+from core.benchmark import (isolated_database, seed_recruiters, seed_applicants,
+                            seed_jobs, seed_applications, time_call)
+from core.models import Job, Application
+from core.pagination import JobCursorPagination, ApplicationCursorPagination
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures job and application list latency for the first, middle and last "
+        "page as the tables grow. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,50000',
+                            help='Comma-separated table sizes to measure at.')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        with isolated_database():
+            self.run(sizes, options['page_size'], options['repeat'])
+
+    def run(self, sizes, page_size, repeat):
+        recruiter = seed_recruiters(1)[0]
+        client = APIClient()
+        client.force_authenticate(user=recruiter.user)
+
+        applicants = seed_applicants(sizes[-1])
+        seed_jobs([recruiter], 1)
+        target_job = Job.objects.get()
+
+        self.stdout.write(f"{'table':<13}{'rows':>9}{'first ms':>11}{'middle ms':>11}{'last ms':>11}")
+        jobs_seeded, applications_seeded = 1, 0
+        for size in sizes:
+            seed_jobs([recruiter], size - jobs_seeded, start=jobs_seeded)
+            seed_applications(target_job, applicants[applications_seeded:size])
+            jobs_seeded = applications_seeded = size
+
+            job_url = f'/api/jobs/?page_size={page_size}'
+            self.report('jobs', size, client, job_url, JobCursorPagination,
+                        Job.objects.order_by('-created_at', '-id'), repeat)
+
+            app_url = f'/api/applications/?job={target_job.id}&page_size={page_size}'
+            self.report('applications', size, client, app_url, ApplicationCursorPagination,
+                        Application.objects.filter(job=target_job).order_by('-applied_at', '-id'), repeat)
+
+    def report(self, label, rows, client, url, pagination_class, ordered, repeat):
+        timings = []
+        for index in (None, rows // 2, rows - 2):
+            target = url if index is None else self.cursor_url(url, pagination_class, ordered[index])
+            timings.append(time_call(lambda: client.get(target), repeat))
+        self.stdout.write(f"{label:<13}{rows:>9}" + ''.join(f'{ms:>11.2f}' for ms in timings))
+
+    def cursor_url(self, url, pagination_class, instance):
+        # Build the same cursor a client would receive after paging down to `instance`
+        paginator = pagination_class()
+        paginator.base_url = Request(APIRequestFactory().get(url)).build_absolute_uri()
+        return paginator.encode_cursor(instance, reverse=False)
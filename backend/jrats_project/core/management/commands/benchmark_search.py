@@ -0,0 +1,73 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.benchmark import isolated_database, explicit_timestamps, seed_recruiters, time_call
+from core.models import Job
+from core.search import index_jobs
+
+VOCABULARY = (
+    'python django react javascript typescript golang rust java kotlin swift sql postgres '
+    'redis kafka docker kubernetes aws gcp azure terraform linux backend frontend fullstack '
+    'mobile data machine learning analytics security devops platform payments fintech health '
+    'logistics senior junior lead staff principal manager engineer developer designer analyst '
+    'scientist architect remote hybrid contract startup enterprise api microservices testing'
+).split()
+LOCATIONS = ['Lagos', 'Abuja', 'Nairobi', 'Accra', 'London', 'Berlin', 'Remote', 'Cairo', 'Kigali', 'Toronto']
+QUERIES = ['python', 'senior python engineer', 'react frontend remote', 'kubernetes aws devops', 'rust payments']
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds synthetic jobs into a throwaway database, builds the search index and "
+        "reports search latency. Use --jobs 1000000 for the full-size run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100000)
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        with isolated_database():
+            self.run(options['jobs'], options['batch_size'], options['repeat'])
+
+    def run(self, total, batch_size, repeat):
+        recruiter = seed_recruiters(1)[0]
+        base = timezone.now() - timedelta(days=365)
+
+        start = time.perf_counter()
+        with explicit_timestamps(Job._meta.get_field('created_at')):
+            for offset in range(0, total, batch_size):
+                jobs = [self.make_job(recruiter, base, i) for i in range(offset, min(offset + batch_size, total))]
+                # bulk_create skips the indexing signal, so index each batch explicitly
+                index_jobs(Job.objects.bulk_create(jobs), batch_size)
+        self.stdout.write(f'Seeded and indexed {total} jobs in {time.perf_counter() - start:.1f}s')
+
+        client = APIClient()
+        client.force_authenticate(user=recruiter.user)
+        self.stdout.write(f"{'query':<28}{'location':<10}{'hits':>9}{'median ms':>11}")
+        for query in QUERIES:
+            for location in (None, 'Lagos'):
+                params = {'q': query}
+                if location:
+                    params['location'] = location
+                response = client.get('/api/jobs/search/', params)
+                elapsed = time_call(lambda: client.get('/api/jobs/search/', params), repeat)
+                self.stdout.write(f"{query:<28}{location or '-':<10}{response.data['count']:>9}{elapsed:>11.2f}")
+
+    def make_job(self, recruiter, base, i):
+        words = random.sample(VOCABULARY, 4)
+        return Job(
+            recruiter=recruiter,
+            title=f'{words[0].title()} {words[1].title()} Engineer',
+            description=' '.join(random.choices(VOCABULARY, k=40)),
+            location=random.choice(LOCATIONS),
+            created_at=base + timedelta(seconds=i),
+        )
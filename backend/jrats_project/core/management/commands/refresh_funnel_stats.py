@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.funnel import refresh_funnel_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Folds new application status events into the time-in-stage and conversion "
+        "aggregates behind /api/jobs/<id>/funnel/. Celery beat runs this every "
+        "FUNNEL_REFRESH_INTERVAL seconds; use --full after bulk imports or deletions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every job, not just those with new events.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Jobs per transaction.')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        count = refresh_funnel_stats(full=options['full'], batch_size=options['batch_size'])
+        self.stdout.write(f'Refreshed funnel stats for {count} jobs in {time.perf_counter() - start:.1f}s')
@@ -0,0 +1,223 @@
+"""
+Skill-based candidate matching.
+
+Applicant skills are normalized into a shared vocabulary (Skill) and kept as a
+binary applicant x skill matrix in CSR form. A job is turned into a skill
+vector from its title and description, and every candidate is scored at once
+with a TF-IDF weighted cosine similarity computed in NumPy.
+
+The matrix lives in process memory and is refreshed incrementally: each
+lookup pulls only the profiles whose `skills_updated_at` moved since the last
+sync, so building it from scratch happens once per worker.
+"""
+import re
+import threading
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ApplicantProfile, Skill
+
+SKILL_SEPARATORS = re.compile(r'[,;/|\n]+')
+WORD_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+MAX_SKILL_WORDS = 3
+
+# Common spellings that should count as the same skill
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'node': 'nodejs',
+    'node.js': 'nodejs',
+    'react.js': 'react',
+    'reactjs': 'react',
+    'vue.js': 'vue',
+    'golang': 'go',
+    'postgresql': 'postgres',
+    'k8s': 'kubernetes',
+    'ml': 'machine learning',
+    'amazon web services': 'aws',
+}
+
+FULL_RELOAD_CACHE_KEY = 'matching:generation'
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def normalize_skill(raw):
+    words = WORD_RE.findall(raw.lower())
+    name = ' '.join(word.rstrip('.') for word in words)
+    return SKILL_ALIASES.get(name, name)
+
+
+def normalize_skills(text):
+    """Split a free-text skills field into unique normalized skill names."""
+    names = []
+    for part in SKILL_SEPARATORS.split(text or ''):
+        name = normalize_skill(part)
+        if name and len(name) <= 100 and name not in names:
+            names.append(name)
+    return names
+
+
+@transaction.atomic
+def sync_profile_skills(profile):
+    """Store the normalized skills for `profile` and mark it for the matrix refresh."""
+    names = normalize_skills(profile.skills)
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    profile.normalized_skills.set(Skill.objects.filter(name__in=names))
+    ApplicantProfile.objects.filter(pk=profile.pk).update(skills_updated_at=timezone.now())
+
+
+def job_skill_counts(job, vocabulary):
+    """Count occurrences of known skills (up to three-word phrases) in a job's text."""
+    words = [normalize_skill(word) for word in WORD_RE.findall(f'{job.title} {job.description}'.lower())]
+    counts = {}
+    for size in range(1, MAX_SKILL_WORDS + 1):
+        for start in range(len(words) - size + 1):
+            phrase = ' '.join(words[start:start + size])
+            column = vocabulary.get(SKILL_ALIASES.get(phrase, phrase))
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+    return counts
+
+
+class CompiledMatrix:
+    """
+    One immutable CSR snapshot of the applicant skills, with the IDF weights
+    and vocabulary it was built with. SkillMatrix swaps in a new one whenever
+    the rows change, so a score() in progress keeps reading a consistent set
+    of arrays.
+    """
+
+    def __init__(self, rows, vocabulary):
+        self.vocabulary = vocabulary
+        self.applicant_ids = np.fromiter(rows.keys(), dtype=np.int64, count=len(rows))
+        lengths = np.fromiter((len(row) for row in rows.values()), dtype=np.int64, count=len(rows))
+        self.indptr = np.concatenate(([0], np.cumsum(lengths)))
+        self.indices = np.concatenate(list(rows.values())) if rows else np.empty(0, dtype=np.int64)
+        size = max(vocabulary.values(), default=0) + 1
+        if len(self.indices):
+            size = max(size, int(self.indices.max()) + 1)
+
+        # Smoothed IDF: rare skills weigh more than ones every applicant lists
+        document_frequency = np.bincount(self.indices, minlength=size)
+        self.idf = np.log((1 + len(rows)) / (1 + document_frequency)) + 1.0
+        self.data = self.idf[self.indices]
+        row_norms = np.sqrt(self._row_sums(self.data ** 2))
+        self.row_norms = np.where(row_norms > 0, row_norms, 1.0)
+        for array in (self.applicant_ids, self.indptr, self.indices, self.idf, self.data, self.row_norms):
+            array.setflags(write=False)
+
+    def _row_sums(self, values):
+        # Sum `values` per CSR row; empty rows sum to zero
+        sums = np.zeros(len(self.applicant_ids))
+        if len(values):
+            nonempty = self.indptr[:-1] < self.indptr[1:]
+            sums[nonempty] = np.add.reduceat(values, self.indptr[:-1][nonempty])
+        return sums
+
+    def score(self, job, candidate_ids=None, limit=20):
+        counts = job_skill_counts(job, self.vocabulary)
+        if not counts or not len(self.applicant_ids):
+            return []
+
+        query = np.zeros(len(self.idf))
+        columns = np.fromiter(counts.keys(), dtype=np.int64)
+        query[columns] = np.fromiter(counts.values(), dtype=np.float64) * self.idf[columns]
+        query /= np.linalg.norm(query)
+
+        scores = self._row_sums(self.data * query[self.indices]) / self.row_norms
+        if candidate_ids is not None:
+            scores = np.where(np.isin(self.applicant_ids, np.asarray(list(candidate_ids), dtype=np.int64)),
+                              scores, 0.0)
+
+        matches = np.flatnonzero(scores > 0)
+        if len(matches) > limit:
+            matches = matches[np.argpartition(scores[matches], -limit)[-limit:]]
+        matches = matches[np.lexsort((self.applicant_ids[matches], -scores[matches]))]
+
+        results = []
+        for row in matches:
+            skills = self.indices[self.indptr[row]:self.indptr[row + 1]]
+            results.append((int(self.applicant_ids[row]), float(scores[row]),
+                            [int(skill) for skill in skills if query[skill] > 0]))
+        return results
+
+
+class SkillMatrix:
+    """
+    In-memory CSR matrix of applicant skills.
+
+    `rows` maps applicant id -> array of skill ids and is the source of truth;
+    a CompiledMatrix is rebuilt from it only when it changed, and replaced
+    under the lock rather than updated in place.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.rows = {}
+        self.synced_at = None
+        self.generation = None
+        self.compiled = None
+
+    def refresh(self):
+        """Bring the rows up to date; returns the CompiledMatrix to read from."""
+        with self._lock:
+            generation = cache.get(FULL_RELOAD_CACHE_KEY, 0)
+            if generation != self.generation:
+                # A profile was deleted somewhere; rebuild rather than track removals
+                self.reset()
+                self.generation = generation
+
+            changed = ApplicantProfile.objects.all()
+            if self.synced_at is not None:
+                changed = changed.filter(skills_updated_at__gte=self.synced_at)
+            # Look back a little so writes that committed late are not missed;
+            # re-reading a profile is harmless.
+            started = timezone.now() - SYNC_OVERLAP
+
+            updated = {}
+            through = ApplicantProfile.normalized_skills.through.objects.filter(
+                applicantprofile__in=changed.values('pk')
+            ).values_list('applicantprofile_id', 'skill_id')
+            for applicant_id in changed.values_list('pk', flat=True):
+                updated[applicant_id] = []
+            for applicant_id, skill_id in through.iterator(chunk_size=10000):
+                updated.setdefault(applicant_id, []).append(skill_id)
+
+            rows_changed = False
+            for applicant_id, skill_ids in updated.items():
+                row = np.array(sorted(skill_ids), dtype=np.int64)
+                previous = self.rows.get(applicant_id)
+                if previous is None or not np.array_equal(previous, row):
+                    self.rows[applicant_id] = row
+                    rows_changed = True
+            self.synced_at = started
+
+            if rows_changed or self.compiled is None:
+                self.compiled = CompiledMatrix(self.rows, dict(Skill.objects.values_list('name', 'id')))
+            return self.compiled
+
+    def score(self, job, candidate_ids=None, limit=20):
+        """
+        Return [(applicant_id, score, matched_skill_ids)] for the best `limit`
+        candidates, optionally restricted to `candidate_ids`.
+        """
+        # Read only from this snapshot: another thread may swap in a new one meanwhile
+        return self.refresh().score(job, candidate_ids=candidate_ids, limit=limit)
+
+
+skill_matrix = SkillMatrix()
+
+
+def invalidate_skill_matrix():
+    """Force every worker to rebuild its matrix on the next lookup."""
+    try:
+        cache.incr(FULL_RELOAD_CACHE_KEY)
+    except ValueError:
+        cache.add(FULL_RELOAD_CACHE_KEY, 1, timeout=None)
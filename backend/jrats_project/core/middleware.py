@@ -0,0 +1,264 @@
+"""
+Per-request timing and query instrumentation.
+
+RequestMetricsMiddleware measures wall time, database query count and time
+(through connection.execute_wrapper) and time spent producing serializer
+data for every request. It reports them in a Server-Timing header, folds them
+into per-URL-name aggregates that MetricsView exposes in Prometheus text
+format, and optionally logs slow requests together with their SQL.
+Queries are counted on every configured database, replica included.
+
+Aggregates are kept per process, like any Prometheus client without a push
+gateway: scrape each worker, or sum across them.
+
+PrimaryPinMiddleware supports read replicas; see core.routers.
+"""
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from . import routers
+
+logger = logging.getLogger('core.slow_requests')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self, capture_sql):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+        self.capture_sql = capture_sql
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += elapsed
+            if self.capture_sql:
+                self.statements.append((elapsed, sql))
+
+
+def _timed_data(data_property):
+    """Wrap a serializer's `data` property so the outermost access is timed."""
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics.in_serializer:
+            return data_property.fget(self)
+        metrics.in_serializer = True
+        start = time.perf_counter()
+        try:
+            return data_property.fget(self)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.in_serializer = False
+    data._metrics_wrapped = True
+    return property(data)
+
+
+def _instrument_serializers():
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.data.fget, '_metrics_wrapped', False):
+            cls.data = _timed_data(cls.data)
+
+
+class MetricsRegistry:
+    """Thread-safe per-route aggregates rendered in Prometheus exposition format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.routes = {}
+            self.throttled_by_scope = {}
+
+    def throttled(self, scope):
+        """Count a request rejected by the throttle for `scope` (core.throttling)."""
+        with self._lock:
+            self.throttled_by_scope[scope] = self.throttled_by_scope.get(scope, 0) + 1
+
+    def observe(self, route, method, status_code, duration, metrics):
+        key = (route, method)
+        with self._lock:
+            stats = self.routes.get(key)
+            if stats is None:
+                stats = self.routes[key] = {
+                    'count': 0, 'errors': 0, 'duration': 0.0, 'db_time': 0.0,
+                    'queries': 0, 'serializer_time': 0.0, 'buckets': [0] * len(DURATION_BUCKETS),
+                }
+            stats['count'] += 1
+            stats['errors'] += status_code >= 500
+            stats['duration'] += duration
+            stats['db_time'] += metrics.db_time
+            stats['queries'] += metrics.queries
+            stats['serializer_time'] += metrics.serializer_time
+            index = bisect_left(DURATION_BUCKETS, duration)
+            if index < len(DURATION_BUCKETS):
+                stats['buckets'][index] += 1
+
+    def render(self):
+        with self._lock:
+            routes = {key: dict(stats, buckets=list(stats['buckets'])) for key, stats in self.routes.items()}
+            throttled = dict(self.throttled_by_scope)
+
+        lines = [
+            '# HELP jrats_request_duration_seconds Wall time per request.',
+            '# TYPE jrats_request_duration_seconds histogram',
+        ]
+        for (route, method), stats in sorted(routes.items()):
+            labels = f'route="{route}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS, stats['buckets']):
+                cumulative += count
+                lines.append(f'jrats_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'jrats_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats["count"]}')
+            lines.append(f'jrats_request_duration_seconds_sum{{{labels}}} {stats["duration"]:.6f}')
+            lines.append(f'jrats_request_duration_seconds_count{{{labels}}} {stats["count"]}')
+
+        counters = (
+            ('jrats_request_errors_total', 'counter', 'Requests that returned a 5xx status.', 'errors', '{}'),
+            ('jrats_db_queries_total', 'counter', 'Database queries issued.', 'queries', '{}'),
+            ('jrats_db_time_seconds_total', 'counter', 'Time spent in database queries.', 'db_time', '{:.6f}'),
+            ('jrats_serializer_time_seconds_total', 'counter', 'Time spent producing serializer data.',
+             'serializer_time', '{:.6f}'),
+        )
+        for name, kind, description, field, number_format in counters:
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for (route, method), stats in sorted(routes.items()):
+                value = number_format.format(stats[field])
+                lines.append(f'{name}{{route="{route}",method="{method}"}} {value}')
+
+        lines.append('# HELP jrats_throttled_requests_total Requests rejected by a rate limit.')
+        lines.append('# TYPE jrats_throttled_requests_total counter')
+        for scope, count in sorted(throttled.items()):
+            lines.append(f'jrats_throttled_requests_total{{scope="{scope}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def _add_wrapper(metrics):
+    for connection in connections.all():
+        connection.execute_wrappers.append(metrics)
+
+
+def _remove_wrapper(metrics):
+    for connection in connections.all():
+        connection.execute_wrappers.remove(metrics)
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        _instrument_serializers()
+
+    def start(self):
+        threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', None)
+        metrics = RequestMetrics(capture_sql=threshold is not None)
+        return metrics, _current.set(metrics), time.perf_counter()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token, start = self.start()
+        _add_wrapper(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _remove_wrapper(metrics)
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics, token, start = self.start()
+        # Under ASGI the ORM runs on this request's thread-sensitive worker
+        # thread, which has its own connection; the wrapper goes there
+        await sync_to_async(_add_wrapper)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_remove_wrapper)(metrics)
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    def finish(self, request, response, metrics, duration):
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match is not None and match.view_name else 'unresolved'
+        registry.observe(route, request.method, response.status_code, duration, metrics)
+
+        response['Server-Timing'] = (
+            f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries", '
+            f'ser;dur={metrics.serializer_time * 1000:.2f}, '
+            f'total;dur={duration * 1000:.2f}'
+        )
+
+        threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', None)
+        if threshold is not None and duration * 1000 >= threshold:
+            slowest = sorted(metrics.statements, key=lambda statement: statement[0], reverse=True)[:10]
+            logger.warning(
+                'Slow request %s %s (%s) took %.1fms with %d queries (%.1fms in db)\n%s',
+                request.method, request.get_full_path(), route, duration * 1000, metrics.queries,
+                metrics.db_time * 1000,
+                '\n'.join(f'  {elapsed * 1000:.2f}ms  {sql}' for elapsed, sql in slowest),
+            )
+        return response
+
+
+class PrimaryPinMiddleware:
+    """
+    After a successful write, keep the user's reads on the primary for
+    REPLICA_PIN_SECONDS so a replica that lags cannot hide their change.
+    Does nothing unless a replica is configured.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def should_pin(request, response):
+        user = getattr(request, 'user', None)
+        return (routers.replica_configured() and request.method not in SAFE_METHODS
+                and response.status_code < 400 and user is not None and user.is_authenticated)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.should_pin(request, response):
+            routers.pin_to_primary(request.user)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.should_pin(request, response):
+            await routers.apin_to_primary(request.user)
+        return response
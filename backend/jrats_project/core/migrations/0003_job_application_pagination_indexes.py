@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_alter_application_status_interview"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["job", "applied_at", "id"], name="app_job_applied_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["applicant", "applied_at", "id"],
+                name="app_applicant_applied_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(fields=["created_at", "id"], name="job_created_id_idx"),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:28
+
+import re
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Frozen copy of core.matching.normalize_skills as of this migration
+SKILL_SEPARATORS = re.compile(r"[,;/|\n]+")
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "node": "nodejs",
+    "node.js": "nodejs",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue.js": "vue",
+    "golang": "go",
+    "postgresql": "postgres",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "amazon web services": "aws",
+}
+
+
+def normalize_skill(raw):
+    words = WORD_RE.findall(raw.lower())
+    name = " ".join(word.rstrip(".") for word in words)
+    return SKILL_ALIASES.get(name, name)
+
+
+def normalize_skills(text):
+    names = []
+    for part in SKILL_SEPARATORS.split(text or ""):
+        name = normalize_skill(part)
+        if name and len(name) <= 100 and name not in names:
+            names.append(name)
+    return names
+
+
+def normalize_existing_skills(apps, schema_editor):
+    ApplicantProfile = apps.get_model("core", "ApplicantProfile")
+    Skill = apps.get_model("core", "Skill")
+    for profile in ApplicantProfile.objects.all():
+        names = normalize_skills(profile.skills)
+        Skill.objects.bulk_create(
+            [Skill(name=name) for name in names], ignore_conflicts=True
+        )
+        profile.normalized_skills.set(Skill.objects.filter(name__in=names))
+        profile.skills_updated_at = timezone.now()
+        profile.save(update_fields=["skills_updated_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_job_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Skill",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="applicantprofile",
+            name="skills_updated_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="applicantprofile",
+            name="normalized_skills",
+            field=models.ManyToManyField(
+                blank=True, related_name="applicants", to="core.skill"
+            ),
+        ),
+        migrations.RunPython(normalize_existing_skills, migrations.RunPython.noop),
+    ]
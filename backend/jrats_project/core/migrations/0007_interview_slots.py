@@ -0,0 +1,72 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:32
+
+import django.db.models.deletion
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_slots(apps, schema_editor):
+    Interview = apps.get_model("core", "Interview")
+    InterviewSlot = apps.get_model("core", "InterviewSlot")
+    slots = []
+    scheduled = Interview.objects.filter(
+        is_scheduled=True, scheduled_time__isnull=False
+    )
+    for interview in scheduled.select_related("application"):
+        start = interview.scheduled_time.replace(second=0, microsecond=0)
+        start -= timedelta(minutes=start.minute % 30)
+        for cell in range(2):
+            slots.append(
+                InterviewSlot(
+                    job_id=interview.application.job_id,
+                    start=start + timedelta(minutes=30 * cell),
+                    interview=interview,
+                )
+            )
+    InterviewSlot.objects.bulk_create(slots, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_email_outbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InterviewSlot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                (
+                    "interview",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slots",
+                        to="core.interview",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="interview_slots",
+                        to="core.job",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("job", "start")},
+            },
+        ),
+        migrations.RunPython(backfill_slots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_applications(apps, schema_editor):
+    Job = apps.get_model("core", "Job")
+    Application = apps.get_model("core", "Application")
+    JobStatusCount = apps.get_model("core", "JobStatusCount")
+    statuses = [
+        status for status, _label in Application._meta.get_field("status").choices
+    ]
+    totals = {
+        (row["job_id"], row["status"]): row["total"]
+        for row in Application.objects.values("job_id", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    }
+    JobStatusCount.objects.bulk_create(
+        [
+            JobStatusCount(
+                job_id=job_id, status=status, count=totals.get((job_id, status), 0)
+            )
+            for job_id in Job.objects.values_list("id", flat=True).iterator()
+            for status in statuses
+        ],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_resume_storage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobStatusCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("reviewed", "Reviewed"),
+                            ("interview_scheduled", "Interview Scheduled"),
+                            ("interview_pending", "Interview Pending"),
+                            ("interview", "Interview"),
+                            ("offered", "Offered"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="status_counts",
+                        to="core.job",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("job", "status")},
+            },
+        ),
+        migrations.RunPython(count_existing_applications, migrations.RunPython.noop),
+    ]
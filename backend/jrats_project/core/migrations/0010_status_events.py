@@ -0,0 +1,208 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:59
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_status_events(apps, schema_editor):
+    # Earlier history was overwritten in place; start each existing
+    # application's timeline at its current status
+    Application = apps.get_model("core", "Application")
+    ApplicationStatusEvent = apps.get_model("core", "ApplicationStatusEvent")
+    rows = Application.objects.values_list("id", "job_id", "status", "applied_at")
+    batch = []
+    # bulk_create() would materialize a generator; insert in chunks instead
+    for application_id, job_id, status, at in rows.iterator(chunk_size=5000):
+        batch.append(
+            ApplicationStatusEvent(
+                application_id=application_id, job_id=job_id, to_status=status, at=at
+            )
+        )
+        if len(batch) == 5000:
+            ApplicationStatusEvent.objects.bulk_create(batch)
+            batch = []
+    ApplicationStatusEvent.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_job_status_counts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApplicationStatusEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "from_status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("reviewed", "Reviewed"),
+                            ("interview_scheduled", "Interview Scheduled"),
+                            ("interview_pending", "Interview Pending"),
+                            ("interview", "Interview"),
+                            ("offered", "Offered"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=20,
+                        null=True,
+                    ),
+                ),
+                (
+                    "to_status",
+                    models.CharField(
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("reviewed", "Reviewed"),
+                            ("interview_scheduled", "Interview Scheduled"),
+                            ("interview_pending", "Interview Pending"),
+                            ("interview", "Interview"),
+                            ("offered", "Offered"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "application",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="status_events",
+                        to="core.application",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="status_events",
+                        to="core.job",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["job", "at"], name="status_event_job_at_idx")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="JobStageStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("reviewed", "Reviewed"),
+                            ("interview_scheduled", "Interview Scheduled"),
+                            ("interview_pending", "Interview Pending"),
+                            ("interview", "Interview"),
+                            ("offered", "Offered"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("entered", models.IntegerField(default=0)),
+                ("exited", models.IntegerField(default=0)),
+                ("seconds_in_stage", models.FloatField(default=0)),
+                ("refreshed_through", models.BigIntegerField(default=0)),
+                (
+                    "refreshed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stage_stats",
+                        to="core.job",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("job", "status")},
+            },
+        ),
+        migrations.CreateModel(
+            name="JobStageTransition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "from_status",
+                    models.CharField(
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("reviewed", "Reviewed"),
+                            ("interview_scheduled", "Interview Scheduled"),
+                            ("interview_pending", "Interview Pending"),
+                            ("interview", "Interview"),
+                            ("offered", "Offered"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "to_status",
+                    models.CharField(
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("reviewed", "Reviewed"),
+                            ("interview_scheduled", "Interview Scheduled"),
+                            ("interview_pending", "Interview Pending"),
+                            ("interview", "Interview"),
+                            ("offered", "Offered"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stage_transitions",
+                        to="core.job",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("job", "from_status", "to_status")},
+            },
+        ),
+        migrations.RunPython(backfill_status_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:12
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_facet_counts(apps, schema_editor):
+    Job = apps.get_model("core", "Job")
+    JobFacetCount = apps.get_model("core", "JobFacetCount")
+    counts = [
+        (facet, Job.objects.values_list(field).annotate(jobs=Count("id")).order_by())
+        for facet, field in (("location", "location"), ("company", "recruiter__company_name"))
+    ]
+    JobFacetCount.objects.bulk_create(
+        [
+            JobFacetCount(facet=facet, value=value, count=count)
+            for facet, rows in counts
+            for value, count in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_idempotency"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobFacetCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "facet",
+                    models.CharField(
+                        choices=[("location", "Location"), ("company", "Company")],
+                        max_length=10,
+                    ),
+                ),
+                ("value", models.CharField(max_length=255)),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="recruiterprofile",
+            name="company_name",
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["location", "created_at", "id"], name="job_location_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["recruiter", "created_at", "id"],
+                name="job_recruiter_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(fields=["title", "id"], name="job_title_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="jobfacetcount",
+            index=models.Index(fields=["facet", "-count"], name="facet_count_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="jobfacetcount",
+            unique_together={("facet", "value")},
+        ),
+        migrations.RunPython(backfill_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_job_board_filters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="closed_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="ArchivedJob",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=255)),
+                ("description", models.TextField()),
+                ("location", models.CharField(max_length=255)),
+                ("created_at", models.DateTimeField()),
+                ("closed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "recruiter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_jobs",
+                        to="core.recruiterprofile",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedApplication",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("reviewed", "Reviewed"),
+                            ("interview_scheduled", "Interview Scheduled"),
+                            ("interview_pending", "Interview Pending"),
+                            ("interview", "Interview"),
+                            ("offered", "Offered"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("applied_at", models.DateTimeField()),
+                ("status_history", models.JSONField(default=list)),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "applicant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_applications",
+                        to="core.applicantprofile",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="applications",
+                        to="core.archivedjob",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="archivedjob",
+            index=models.Index(
+                fields=["created_at", "id"], name="archived_job_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedjob",
+            index=models.Index(
+                fields=["recruiter", "created_at", "id"],
+                name="archived_job_recruiter_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedapplication",
+            index=models.Index(
+                fields=["job", "applied_at", "id"], name="archived_app_job_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedapplication",
+            index=models.Index(
+                fields=["applicant", "applied_at", "id"],
+                name="archived_app_applicant_idx",
+            ),
+        ),
+    ]
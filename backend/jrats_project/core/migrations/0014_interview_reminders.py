@@ -0,0 +1,81 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:18
+
+import django.db.models.deletion
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_reminders(apps, schema_editor):
+    # Interviews booked before reminders existed get the ones still ahead of them
+    Interview = apps.get_model("core", "Interview")
+    InterviewReminder = apps.get_model("core", "InterviewReminder")
+    now = timezone.now()
+    width = settings.INTERVIEW_REMINDER_BUCKET_MINUTES
+    reminders = []
+    upcoming = Interview.objects.filter(is_scheduled=True, scheduled_time__gt=now)
+    for interview_id, scheduled_time in upcoming.values_list("id", "scheduled_time"):
+        for offset in settings.INTERVIEW_REMINDER_OFFSETS_MINUTES:
+            due_at = scheduled_time - timedelta(minutes=offset)
+            if due_at <= now:
+                continue
+            bucket = due_at.replace(second=0, microsecond=0)
+            bucket -= timedelta(minutes=(bucket.hour * 60 + bucket.minute) % width)
+            reminders.append(
+                InterviewReminder(
+                    interview_id=interview_id,
+                    offset_minutes=offset,
+                    due_at=due_at,
+                    bucket=bucket,
+                )
+            )
+    InterviewReminder.objects.bulk_create(reminders, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_job_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InterviewReminder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("offset_minutes", models.PositiveIntegerField()),
+                ("due_at", models.DateTimeField()),
+                ("bucket", models.DateTimeField()),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "interview",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reminders",
+                        to="core.interview",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("sent_at__isnull", True)),
+                        fields=["bucket"],
+                        name="reminder_due_idx",
+                    )
+                ],
+                "unique_together": {("interview", "offset_minutes")},
+            },
+        ),
+        migrations.RunPython(backfill_reminders, migrations.RunPython.noop),
+    ]
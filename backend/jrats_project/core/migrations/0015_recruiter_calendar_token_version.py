@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_interview_reminders"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recruiterprofile",
+            name="calendar_token_version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
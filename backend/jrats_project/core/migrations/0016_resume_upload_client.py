@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_recruiter_calendar_token_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resumeupload",
+            name="client",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="resumeupload",
+            index=models.Index(
+                condition=models.Q(("blob__isnull", True)),
+                fields=["client"],
+                name="resume_upload_pending_idx",
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 import uuid
 
 class User(AbstractUser):
@@ -15,7 +16,9 @@ class User(AbstractUser):
 
 class RecruiterProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='recruiter_profile')
-    company_name = models.CharField(max_length=255)
+    company_name = models.CharField(max_length=255, db_index=True) # Job board company filter
+    # Signed into the calendar feed URL (core.calendar_feed); bumping it revokes old URLs
+    calendar_token_version = models.PositiveIntegerField(default=1)
     # Add other recruiter-specific fields here
 
     def __str__(self):
@@ -25,17 +28,99 @@ class ApplicantProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='applicant_profile')
     resume = models.FileField(upload_to='resumes/')
     skills = models.TextField()
+    # Normalized form of `skills`, maintained by core.signals for candidate matching
+    normalized_skills = models.ManyToManyField('Skill', blank=True, related_name='applicants')
+    skills_updated_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Deduplicated content behind `resume` (null for resumes uploaded before core.resumes existed)
+    resume_blob = models.ForeignKey('ResumeBlob', null=True, blank=True, on_delete=models.SET_NULL,
+                                    related_name='profiles')
     # Add other applicant-specific fields here
 
     def __str__(self):
         return self.user.username
 
+
+class Skill(models.Model):
+    """
+    A normalized skill (e.g. "javascript" for "JS" or "Javascript"), shared by
+    all applicant profiles.
+    """
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+class ResumeBlob(models.Model):
+    """
+    Resume content stored once per SHA-256 digest. Applicants who upload the
+    same file share one blob (and one copy in storage); `text` is filled in
+    asynchronously by the extract_resume_text task.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to='resumes/')
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100)
+    text = models.TextField(blank=True)
+    text_extracted_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.sha256
+
+
+class ResumeUpload(models.Model):
+    """
+    A resumable chunked upload in progress. The id doubles as the upload
+    token, so applicants can upload before signing up; chunks are appended to
+    a partial file until `received` reaches `size`, then the content is moved
+    into a ResumeBlob.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, null=True, blank=True, on_delete=models.CASCADE, related_name='resume_uploads')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    blob = models.ForeignKey(ResumeBlob, null=True, blank=True, on_delete=models.SET_NULL, related_name='uploads')
+    # The address that started it, for the per-client limits on pending uploads
+    client = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['client'], condition=models.Q(blob__isnull=True), name='resume_upload_pending_idx'),
+        ]
+
+    @property
+    def is_complete(self):
+        return self.blob_id is not None
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
 class Job(models.Model):
     recruiter = models.ForeignKey(RecruiterProfile, on_delete=models.CASCADE, related_name='jobs')
     title = models.CharField(max_length=255)
     description = models.TextField()
     location = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the recruiter stops accepting applications (ApplicationSerializer
+    # refuses them from then on); core.archive moves the job out of the live
+    # tables JOB_ARCHIVE_AFTER_DAYS later
+    closed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Supports keyset pagination on the job board (newest first)
+            models.Index(fields=['created_at', 'id'], name='job_created_id_idx'),
+            # Job board filters by location or company, paged by date (core.pagination)
+            models.Index(fields=['location', 'created_at', 'id'], name='job_location_created_idx'),
+            models.Index(fields=['recruiter', 'created_at', 'id'], name='job_recruiter_created_idx'),
+            # ?sort=title
+            models.Index(fields=['title', 'id'], name='job_title_id_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -57,11 +142,165 @@ class Application(models.Model):
 
     class Meta:
         unique_together = ('job', 'applicant') # An applicant can only apply once for a job
+        indexes = [
+            # Keyset pagination for a job's applicants and for an applicant's own applications
+            models.Index(fields=['job', 'applied_at', 'id'], name='app_job_applied_id_idx'),
+            models.Index(fields=['applicant', 'applied_at', 'id'], name='app_applicant_applied_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.applicant.user.username}'s application for {self.job.title}"
     
 
+class ArchivedJob(models.Model):
+    """
+    A closed or expired job moved out of Job by core.archive, keeping its id.
+    Only what the list endpoints show is kept; the job's counters, search
+    postings and interview slots are deleted with it.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    recruiter = models.ForeignKey(RecruiterProfile, on_delete=models.CASCADE, related_name='archived_jobs')
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    location = models.CharField(max_length=255)
+    created_at = models.DateTimeField()
+    closed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # ?include_archived=1 pages through these alongside the live jobs
+            models.Index(fields=['created_at', 'id'], name='archived_job_created_id_idx'),
+            models.Index(fields=['recruiter', 'created_at', 'id'], name='archived_job_recruiter_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedApplication(models.Model):
+    """
+    An application of an ArchivedJob, keeping its id. `status_history` holds
+    its ApplicationStatusEvent rows as [from_status, to_status, at] lists.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedJob, on_delete=models.CASCADE, related_name='applications')
+    applicant = models.ForeignKey(ApplicantProfile, on_delete=models.CASCADE, related_name='archived_applications')
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    applied_at = models.DateTimeField()
+    status_history = models.JSONField(default=list)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', 'applied_at', 'id'], name='archived_app_job_idx'),
+            models.Index(fields=['applicant', 'applied_at', 'id'], name='archived_app_applicant_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived application {self.id} for job {self.job_id}"
+
+
+class JobStatusCount(models.Model):
+    """
+    How many of a job's applications are in `status`. One row per job and
+    status, kept current by core.counters so the recruiter dashboard never
+    has to GROUP BY over applications.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='status_counts')
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('job', 'status')
+
+    def __str__(self):
+        return f"{self.job}: {self.count} {self.status}"
+
+
+class JobFacetCount(models.Model):
+    """
+    How many jobs have a given location or company, for the job board's facet
+    counts. Kept current by core.facets as jobs are created, edited, imported
+    and deleted, so facets are read from here rather than counted per request.
+    """
+    FACET_CHOICES = (
+        ('location', 'Location'),
+        ('company', 'Company'),
+    )
+    facet = models.CharField(max_length=10, choices=FACET_CHOICES)
+    value = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('facet', 'value')
+        indexes = [
+            # Top values per facet
+            models.Index(fields=['facet', '-count'], name='facet_count_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
+
+
+class ApplicationStatusEvent(models.Model):
+    """
+    One row per status an application enters, appended alongside the counter
+    update in core.counters and never modified. `from_status` is null for the
+    event that created the application. `job` is denormalized so a job's
+    history can be read by (job, at) without joining applications.
+    """
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_events')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='status_events')
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, null=True, blank=True)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', 'at'], name='status_event_job_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status} -> {self.to_status}"
+
+
+class JobStageStat(models.Model):
+    """
+    Time-in-stage aggregates per job and status, rebuilt from
+    ApplicationStatusEvent by core.funnel.refresh_funnel_stats.
+    `seconds_in_stage` sums the time spent by applications that have left the
+    stage; `refreshed_through` is the last event id the row accounts for.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='stage_stats')
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    entered = models.IntegerField(default=0)
+    exited = models.IntegerField(default=0)
+    seconds_in_stage = models.FloatField(default=0)
+    refreshed_through = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('job', 'status')
+
+    def __str__(self):
+        return f"{self.job}: {self.entered} entered {self.status}"
+
+
+class JobStageTransition(models.Model):
+    """How many of a job's applications moved from one status to another; see JobStageStat."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='stage_transitions')
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('job', 'from_status', 'to_status')
+
+    def __str__(self):
+        return f"{self.job}: {self.count} {self.from_status} -> {self.to_status}"
+
+
 class Interview(models.Model):
     application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='interview')
     scheduled_time = models.DateTimeField(null=True, blank=True)
@@ -69,4 +308,137 @@ class Interview(models.Model):
     is_scheduled = models.BooleanField(default=False)
 
     def __str__(self):
-        return f"Interview for {self.application}"
\ No newline at end of file
+        return f"Interview for {self.application}"
+
+
+class InterviewReminder(models.Model):
+    """
+    A reminder email due `offset_minutes` before an interview. Created when
+    the interview is booked. `bucket` is `due_at` floored to
+    INTERVIEW_REMINDER_BUCKET_MINUTES. The send_interview_reminders task
+    works through unsent reminders bucket by bucket, using the partial index
+    on unsent rows, so it never reads reminders already handled or not yet due.
+    """
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='reminders')
+    offset_minutes = models.PositiveIntegerField()
+    due_at = models.DateTimeField()
+    bucket = models.DateTimeField()
+    sent_at = models.DateTimeField(null=True, blank=True) # Also set when the reminder is skipped
+
+    class Meta:
+        unique_together = ('interview', 'offset_minutes')
+        indexes = [
+            models.Index(fields=['bucket'], condition=models.Q(sent_at__isnull=True), name='reminder_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.interview} reminder {self.offset_minutes} minutes before"
+
+
+class InterviewSlot(models.Model):
+    """
+    One occupied 30-minute cell of a job's interview calendar. A scheduled
+    interview holds the cell it starts in and the following one, so the unique
+    (job, start) constraint rejects any booking within 30 minutes of another,
+    atomically, without a range scan.
+    """
+    SLOT_MINUTES = 30
+    CELLS_PER_INTERVIEW = 2
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='interview_slots')
+    start = models.DateTimeField()
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='slots')
+
+    class Meta:
+        unique_together = ('job', 'start')
+
+    def __str__(self):
+        return f"{self.job} at {self.start}"
+
+
+class SearchTerm(models.Model):
+    """
+    A token in the job search vocabulary, with the number of jobs containing it
+    (used for IDF ranking). Maintained incrementally by core.search.
+    """
+    token = models.CharField(max_length=64, unique=True)
+    document_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.token
+
+
+class JobTerm(models.Model):
+    """
+    One posting in the inverted index: `job` contains `term` with a field-weighted
+    term frequency. Searches read these rows instead of scanning Job.description.
+    """
+    term = models.ForeignKey(SearchTerm, on_delete=models.CASCADE, related_name='postings')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='search_terms')
+    weight = models.FloatField()
+
+    class Meta:
+        unique_together = ('term', 'job')
+
+    def __str__(self):
+        return f"{self.term.token} in job {self.job_id}"
+
+
+class OutboundEmail(models.Model):
+    """
+    An email waiting to be delivered. Tasks queue rows here and the periodic
+    drain task in core.outbox sends them in batches over one connection.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sending', 'Sending'), # Claimed by a drain run; reclaimed if that run dies
+        ('sent', 'Sent'),
+        ('failed', 'Failed'), # Gave up after EMAIL_OUTBOX_MAX_ATTEMPTS
+    )
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to_email = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.to_email} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client-supplied Idempotency-Key and the response it got (core.idempotency).
+    `response_status` is null while the first request is still running.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ('user', 'key')
+
+    def __str__(self):
+        return f"{self.key} ({self.user_id})"
+
+
+class TaskLock(models.Model):
+    """A task's claim on a unit of work, so redelivered or duplicate tasks skip it (core.idempotency)."""
+    key = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,127 @@
+"""
+Transactional email outbox.
+
+Tasks call queue_email()/queue_emails() instead of send_mail(), which costs
+one INSERT rather than a backend connection per message. drain_outbox() then
+claims due messages in batches, sends each batch over a single connection
+with optional rate limiting, and records the outcome per message. Failed
+sends are retried with exponential backoff.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+# How long a drain run owns the messages it claimed before others may retry them
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+def queue_email(subject, body, from_email, to_email):
+    return OutboundEmail.objects.create(subject=subject, body=body, from_email=from_email, to_email=to_email)
+
+
+def queue_emails(messages):
+    """Queue many (subject, body, from_email, to_email) tuples with one bulk INSERT."""
+    return OutboundEmail.objects.bulk_create([
+        OutboundEmail(subject=subject, body=body, from_email=from_email, to_email=to_email)
+        for subject, body, from_email, to_email in messages
+    ])
+
+
+def retry_delay(attempts):
+    delay = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def claim_batch(batch_size):
+    """
+    Atomically claim up to `batch_size` due messages. Rows locked by another
+    drain run are skipped rather than waited on (where the database supports it).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = (
+            OutboundEmail.objects
+            .filter(Q(status='pending') | Q(status='sending'), next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        ids = list(due)
+        OutboundEmail.objects.filter(id__in=ids).update(status='sending', next_attempt_at=now + CLAIM_LEASE)
+    return list(OutboundEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def _record_failure(email, error):
+    email.attempts += 1
+    email.last_error = str(error)[:2000]
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = 'failed'
+    else:
+        email.status = 'pending'
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+
+
+def send_batch(emails, connection):
+    """Send `emails` over an open `connection`, pacing to EMAIL_OUTBOX_RATE_LIMIT per second."""
+    rate = settings.EMAIL_OUTBOX_RATE_LIMIT
+    interval = 1.0 / rate if rate else 0
+    next_send = time.monotonic()
+    for email in emails:
+        if interval:
+            pause = next_send - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+            next_send = max(next_send, time.monotonic()) + interval
+        try:
+            EmailMessage(email.subject, email.body, email.from_email, [email.to_email],
+                         connection=connection).send()
+        except Exception as error:
+            _record_failure(email, error)
+        else:
+            email.attempts += 1
+            email.status = 'sent'
+            email.sent_at = timezone.now()
+            email.last_error = ''
+
+
+def drain_outbox(batch_size=None, max_batches=None):
+    """
+    Deliver due messages until the outbox is empty (or `max_batches` ran).
+    Returns a {'sent': n, 'retrying': n, 'failed': n} summary.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    summary = {'sent': 0, 'retrying': 0, 'failed': 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        emails = claim_batch(batch_size)
+        if not emails:
+            break
+        batches += 1
+
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            for email in emails:
+                _record_failure(email, error)
+        else:
+            try:
+                send_batch(emails, connection)
+            finally:
+                connection.close()
+
+        OutboundEmail.objects.bulk_update(
+            emails, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+        )
+        for email in emails:
+            summary['retrying' if email.status == 'pending' else email.status] += 1
+        if len(emails) < batch_size:
+            break
+    return summary
@@ -0,0 +1,212 @@
+import base64
+from urllib import parse
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset (seek) pagination over an ordered column with the primary key as a
+    tie-breaker. Every page is a single indexed range scan, so fetching page
+    1,000 costs the same as fetching page one.
+    """
+    ordering_field = None  # e.g. 'created_at'; rows are returned newest first
+    # Optional client-selectable orders: {name: (field, descending)}; each
+    # needs a (field, id) index, or one led by the columns the view filters on
+    orderings = None
+    default_ordering = None
+    ordering_query_param = None
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Page through `queryset`, or through a list of querysets over tables
+        with the same ordering columns (e.g. live and archived rows): each
+        is seeked on its own index and the pages are merged.
+        """
+        parts = queryset if isinstance(queryset, (list, tuple)) else [queryset]
+        rows = []
+        for part in parts:
+            rows += self.seek(part, request)[:self.page_size + 1]
+        return self.set_page(self.merge(rows) if len(parts) > 1 else rows)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views, using the async ORM."""
+        parts = queryset if isinstance(queryset, (list, tuple)) else [queryset]
+        rows = []
+        for part in parts:
+            rows += [instance async for instance in self.seek(part, request)[:self.page_size + 1]]
+        return self.set_page(self.merge(rows) if len(parts) > 1 else rows)
+
+    def merge(self, rows):
+        """The first page_size + 1 of `rows` in the order seek() scanned them."""
+        descending = self.descending != self.reverse
+        rows.sort(key=lambda row: (getattr(row, self.ordering_field), row.pk), reverse=descending)
+        return rows[:self.page_size + 1]
+
+    def get_ordering(self, request):
+        """The (field, descending) order to page through; see `orderings`."""
+        if self.ordering_query_param and self.orderings:
+            name = request.query_params.get(self.ordering_query_param, self.default_ordering)
+            if name not in self.orderings:
+                raise ValidationError({self.ordering_query_param: [
+                    f"Choose one of: {', '.join(self.orderings)}."
+                ]})
+            return self.orderings[name]
+        return self.ordering_field, True
+
+    def seek(self, queryset, request):
+        """Filter and order `queryset` to start at the requested cursor."""
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering_field, self.descending = self.get_ordering(request)
+        self.cursor = self.decode_cursor(request)
+
+        field = self.ordering_field
+        if self.cursor is None:
+            position, pk, reverse = None, None, False
+        else:
+            position, pk, reverse = self.cursor
+            try:
+                position = queryset.model._meta.get_field(field).to_python(position)
+            except DjangoValidationError:
+                raise NotFound(self.invalid_cursor_message)
+        self.reverse = reverse
+        self.position = position
+
+        # Walking backwards scans the other way from the cursor, then flips
+        descending = self.descending != reverse
+        after, bound = ('lt', 'lte') if descending else ('gt', 'gte')
+        if position is not None:
+            # The redundant `<=`/`>=` bound lets the planner use a plain range
+            # scan on the (field, id) index instead of evaluating the OR per row.
+            queryset = queryset.filter(**{f'{field}__{bound}': position}).filter(
+                Q(**{f'{field}__{after}': position}) | Q(**{field: position, f'pk__{after}': pk})
+            )
+        prefix = '-' if descending else ''
+        return queryset.order_by(f'{prefix}{field}', f'{prefix}pk')
+
+    def set_page(self, results):
+        """Trim the page_size + 1 rows fetched by seek() to a page and work out the links."""
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            querystring = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            position = tokens['p'][0]
+            pk = int(tokens['i'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, IndexError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, pk, reverse
+
+    def encode_cursor(self, instance, reverse):
+        tokens = {
+            'p': instance._meta.get_field(self.ordering_field).value_to_string(instance),
+            'i': str(instance.pk),
+        }
+        if reverse:
+            tokens['r'] = '1'
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = base64.urlsafe_b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # An empty backwards page: restart from the top of the list.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class JobCursorPagination(KeysetCursorPagination):
+    """
+    Newest jobs first, backed by the Job(created_at, id) index, or
+    ?sort=oldest / ?sort=title (Job(title, id)). The location and company
+    filters are served by Job(location, created_at, id) and
+    Job(recruiter, created_at, id).
+    """
+    ordering_field = 'created_at'
+    orderings = {
+        'newest': ('created_at', True),
+        'oldest': ('created_at', False),
+        'title': ('title', False),
+    }
+    default_ordering = 'newest'
+    ordering_query_param = 'sort'
+
+
+class ApplicationCursorPagination(KeysetCursorPagination):
+    """Newest applications first, backed by the Application(job|applicant, applied_at, id) indexes."""
+    ordering_field = 'applied_at'
+
+
+class SearchPagination(PageNumberPagination):
+    """Ranked results can't be keyset-paginated, so search uses page numbers."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,98 @@
+"""
+Interview reminder emails, INTERVIEW_REMINDER_OFFSETS_MINUTES before each
+booked interview.
+
+Booking an interview inserts one InterviewReminder per offset, in the same
+transaction. Reminders are not Celery countdown tasks: those would be one
+message per reminder, held by the broker for up to a day. They are rows in a
+due-index instead. The periodic send_interview_reminders task runs every
+INTERVIEW_REMINDER_BUCKET_MINUTES. Each run claims the due buckets one
+transaction at a time with select_for_update(skip_locked=True), so
+overlapping runs split the work rather than sending twice. The emails go
+through the outbox.
+
+A reminder goes out up to one bucket early, never late by more than one
+task interval. After an outage, overdue buckets are still sent, except for
+reminders whose interview has already started; those are marked sent
+without an email.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import InterviewReminder
+from .outbox import queue_emails
+
+# Applications in these statuses no longer have an interview to attend
+CANCELLED_STATUSES = ('rejected', 'offered')
+
+
+def bucket_for(moment):
+    minutes = settings.INTERVIEW_REMINDER_BUCKET_MINUTES
+    moment = moment.replace(second=0, microsecond=0)
+    return moment - timedelta(minutes=(moment.hour * 60 + moment.minute) % minutes)
+
+
+def schedule_reminders(interview, now=None):
+    """Create the reminders for a just-booked `interview`, skipping offsets already past."""
+    now = now or timezone.now()
+    reminders = []
+    for offset in settings.INTERVIEW_REMINDER_OFFSETS_MINUTES:
+        due_at = interview.scheduled_time - timedelta(minutes=offset)
+        if due_at > now:
+            reminders.append(InterviewReminder(interview=interview, offset_minutes=offset, due_at=due_at,
+                                               bucket=bucket_for(due_at)))
+    InterviewReminder.objects.bulk_create(reminders, ignore_conflicts=True)
+
+
+def reminder_message(job_title, scheduled_time):
+    subject = f'Reminder: your interview for {job_title}'
+    message = (
+        f'Dear Applicant,\n\n'
+        f'This is a reminder of your interview for the position of {job_title} '
+        f'on {scheduled_time:%A %d %B %Y at %H:%M} UTC.\n\n'
+        f'Best Regards,\nThe Hiring Team'
+    )
+    return subject, message
+
+
+def due_buckets(now):
+    return list(
+        InterviewReminder.objects.filter(sent_at__isnull=True, bucket__lte=now)
+        .order_by('bucket').values_list('bucket', flat=True).distinct()
+    )
+
+
+@transaction.atomic
+def send_bucket(bucket, now):
+    """Queue the emails for one bucket's unsent reminders; returns (sent, skipped)."""
+    reminders = list(
+        InterviewReminder.objects.filter(bucket=bucket, sent_at__isnull=True)
+        .select_for_update(skip_locked=True, of=('self',))
+        .select_related('interview__application__job', 'interview__application__applicant__user')
+    )
+    messages = []
+    for reminder in reminders:
+        interview, application = reminder.interview, reminder.interview.application
+        if application.status in CANCELLED_STATUSES or interview.scheduled_time is None:
+            continue
+        if interview.scheduled_time <= now:
+            continue  # Too late to remind anyone
+        subject, body = reminder_message(application.job.title, interview.scheduled_time)
+        messages.append((subject, body, settings.DEFAULT_FROM_EMAIL, application.applicant.user.email))
+    queue_emails(messages)
+    InterviewReminder.objects.filter(id__in=[reminder.id for reminder in reminders]).update(sent_at=now)
+    return len(messages), len(reminders) - len(messages)
+
+
+def send_due_reminders(now=None):
+    """Queue every due reminder, one bucket per transaction; returns (sent, skipped)."""
+    now = now or timezone.now()
+    sent = skipped = 0
+    for bucket in due_buckets(now):
+        bucket_sent, bucket_skipped = send_bucket(bucket, now)
+        sent += bucket_sent
+        skipped += bucket_skipped
+    return sent, skipped
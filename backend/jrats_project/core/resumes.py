@@ -0,0 +1,319 @@
+"""
+Resume storage: content-addressed blobs, resumable chunked uploads and text
+extraction.
+
+Every resume, whether uploaded inline at signup or in chunks through
+ResumeUploadView, is hashed in blocks and stored once per SHA-256 digest
+(see ResumeBlob). Chunked uploads are appended to a partial file under
+RESUME_UPLOAD_DIR, so a client can resume from the last acknowledged offset
+after a dropped connection and no request holds a worker for longer than one
+chunk takes to arrive.
+"""
+import hashlib
+import io
+import mimetypes
+import os
+import re
+import zipfile
+from datetime import timedelta
+from html import unescape
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Sum
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+
+from .models import ResumeBlob, ResumeUpload
+
+ALLOWED_EXTENSIONS = {
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.txt': 'text/plain',
+}
+HASH_BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Extracted text beyond this is dropped; it is only used for search
+MAX_TEXT_LENGTH = 200_000
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadQuotaExceeded(UploadError):
+    pass
+
+
+class OffsetMismatch(UploadError):
+    def __init__(self, expected):
+        super().__init__(f"Expected a chunk at offset {expected}.")
+        self.expected = expected
+
+
+def extension_for(filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in ALLOWED_EXTENSIONS:
+        raise UploadError(f"Resumes must be one of: {', '.join(sorted(ALLOWED_EXTENSIONS))}.")
+    return extension
+
+
+def hash_file(fileobj):
+    """SHA-256 hex digest and size of `fileobj`, read in blocks from the start."""
+    digest = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(HASH_BLOCK_SIZE), b''):
+        digest.update(block)
+        size += len(block)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+def store_resume(fileobj, filename):
+    """
+    Store `fileobj` under its SHA-256 digest unless identical content is
+    already stored, and return the (new or existing) ResumeBlob.
+    """
+    extension = extension_for(filename)
+    sha256, size = hash_file(fileobj)
+    blob = ResumeBlob.objects.filter(sha256=sha256).first()
+    if blob is not None:
+        return blob
+
+    name = default_storage.save(f'resumes/{sha256[:2]}/{sha256}{extension}', File(fileobj))
+    try:
+        with transaction.atomic():
+            return ResumeBlob.objects.create(sha256=sha256, file=name, size=size,
+                                             content_type=ALLOWED_EXTENSIONS[extension])
+    except IntegrityError:
+        # A concurrent upload of the same content won; keep its copy
+        default_storage.delete(name)
+        return ResumeBlob.objects.get(sha256=sha256)
+
+
+def part_path(upload_id):
+    return os.path.join(settings.RESUME_UPLOAD_DIR, f'{upload_id}.part')
+
+
+def start_upload(filename, size, user=None, client=''):
+    """
+    Start an upload of `size` bytes. `client` (the caller's address) may have
+    at most RESUME_UPLOAD_MAX_PENDING unfinished uploads, reserving at most
+    RESUME_UPLOAD_MAX_PENDING_BYTES between them, until they finish or are
+    purged.
+    """
+    extension = extension_for(filename)
+    if size <= 0 or size > settings.RESUME_MAX_SIZE:
+        raise UploadError(f"Resumes must be between 1 byte and {settings.RESUME_MAX_SIZE} bytes.")
+    client = client[:255]
+    if client:
+        pending = ResumeUpload.objects.filter(client=client, blob__isnull=True).aggregate(
+            count=Count('id'), size=Sum('size'),
+        )
+        if (pending['count'] >= settings.RESUME_UPLOAD_MAX_PENDING
+                or (pending['size'] or 0) + size > settings.RESUME_UPLOAD_MAX_PENDING_BYTES):
+            raise UploadQuotaExceeded("Too many unfinished uploads; finish or abandon one first.")
+    upload = ResumeUpload.objects.create(
+        user=user if user is not None and user.is_authenticated else None,
+        filename=os.path.basename(filename)[:255], content_type=ALLOWED_EXTENSIONS[extension], size=size,
+        client=client,
+    )
+    os.makedirs(settings.RESUME_UPLOAD_DIR, exist_ok=True)
+    open(part_path(upload.id), 'wb').close()
+    return upload
+
+
+def append_chunk(upload_id, offset, stream, length):
+    """
+    Append `length` bytes read from `stream` at `offset` and return the
+    upload. The row is locked for the duration, so a retried chunk racing the
+    original cannot be written twice; completing the last chunk stores the
+    file as a ResumeBlob.
+    """
+    with transaction.atomic():
+        upload = ResumeUpload.objects.select_for_update().get(pk=upload_id)
+        if upload.is_complete or offset != upload.received:
+            raise OffsetMismatch(upload.received)
+        if length <= 0 or upload.received + length > upload.size:
+            raise UploadError(f"The upload has {upload.size - upload.received} bytes left.")
+
+        path = part_path(upload.id)
+        with open(path, 'r+b') as part:
+            # Truncating first discards whatever a failed earlier attempt left past the offset
+            part.truncate(offset)
+            part.seek(offset)
+            remaining = length
+            while remaining:
+                block = stream.read(min(remaining, HASH_BLOCK_SIZE))
+                if not block:
+                    raise UploadError("The request body is shorter than its Content-Length.")
+                part.write(block)
+                remaining -= len(block)
+
+        upload.received += length
+        update_fields = ['received', 'updated_at']
+        if upload.received == upload.size:
+            with open(path, 'rb') as part:
+                upload.blob = store_resume(part, upload.filename)
+            update_fields.append('blob')
+        upload.save(update_fields=update_fields)
+
+    if upload.is_complete:
+        os.remove(path)
+    return upload
+
+
+def attach_resume(profile, blob):
+    """Point `profile` at `blob` and queue text extraction if the content is new."""
+    profile.resume_blob = blob
+    profile.resume = blob.file.name
+    profile.save(update_fields=['resume_blob', 'resume'])
+    schedule_extraction(blob)
+
+
+def schedule_extraction(blob):
+    if blob.text_extracted_at is None:
+        from .tasks import extract_resume_text
+        transaction.on_commit(lambda: extract_resume_text.delay(blob.id))
+
+
+def _pdf_text(data):
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        xml = archive.read('word/document.xml').decode('utf-8', errors='replace')
+    xml = re.sub(r'</w:p>', '\n', xml)
+    return unescape(re.sub(r'<[^>]+>', '', xml))
+
+
+def extract_text(blob):
+    """Plain text of `blob` for search; legacy .doc files are not supported."""
+    with blob.file.open('rb') as handle:
+        data = handle.read()
+    if blob.content_type == 'application/pdf':
+        text = _pdf_text(data)
+    elif blob.content_type == ALLOWED_EXTENSIONS['.docx']:
+        text = _docx_text(data)
+    elif blob.content_type == 'text/plain':
+        text = data.decode('utf-8', errors='replace')
+    else:
+        text = ''
+    return re.sub(r'[ \t]+', ' ', text).strip()[:MAX_TEXT_LENGTH]
+
+
+def purge_stale_uploads():
+    """
+    Delete uploads untouched for RESUME_UPLOAD_EXPIRY_HOURS: stalled ones with
+    their partial files, and finished ones nobody claimed a signup with.
+    """
+    cutoff = timezone.now() - timedelta(hours=settings.RESUME_UPLOAD_EXPIRY_HOURS)
+    stale = list(ResumeUpload.objects.filter(updated_at__lt=cutoff).values_list('id', 'blob_id'))
+    for upload_id, blob_id in stale:
+        if blob_id is None:
+            try:
+                os.remove(part_path(upload_id))
+            except FileNotFoundError:
+                pass
+    ResumeUpload.objects.filter(id__in=[upload_id for upload_id, _blob_id in stale]).delete()
+    return len(stale)
+
+
+class _RangeFile:
+    """Exposes bytes [start, start + length) of an open file to FileResponse."""
+
+    def __init__(self, handle, start, length):
+        handle.seek(start)
+        self.handle = handle
+        self.remaining = length
+
+    def read(self, size=-1):
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.handle.close()
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single `bytes=` range, inclusive, or None when the
+    header is absent or not one we serve partially (the full file is sent
+    then, as RFC 9110 allows). Raises ValueError if the range is unsatisfiable.
+    """
+    match = RANGE_RE.match(header or '')
+    if match is None or match.group(0) == 'bytes=-':
+        return None
+    first, last = match.groups()
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError(header)
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def resume_response(request, profile):
+    """
+    Serve `profile`'s resume. With RESUME_SENDFILE_HEADER set, the front-end
+    proxy sends the file (ranges included) and Python never reads it;
+    otherwise FileResponse streams it, zero-copy through wsgi.file_wrapper
+    for whole-file requests, honouring single byte ranges and If-None-Match.
+    """
+    blob = profile.resume_blob
+    name = blob.file.name if blob is not None else profile.resume.name
+    filename = f'{profile.user.username}-resume{os.path.splitext(name)[1]}'
+    etag = f'"{blob.sha256}"' if blob is not None else None
+
+    if etag is not None and request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+        response['ETag'] = etag
+        return response
+
+    if settings.RESUME_SENDFILE_HEADER:
+        content_type = blob.content_type if blob is not None else mimetypes.guess_type(name)[0]
+        response = HttpResponse(content_type=content_type or 'application/octet-stream')
+        response[settings.RESUME_SENDFILE_HEADER] = settings.RESUME_SENDFILE_PREFIX + name
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    else:
+        handle = default_storage.open(name, 'rb')
+        size = handle.size
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            handle.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        if byte_range is None:
+            response = FileResponse(handle, as_attachment=True, filename=filename)
+        else:
+            start, end = byte_range
+            response = FileResponse(_RangeFile(handle, start, end - start + 1), as_attachment=True,
+                                    filename=filename, status=206)
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Accept-Ranges'] = 'bytes'
+
+    if etag is not None:
+        # Blobs are immutable, so the digest is a strong validator
+        response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=3600'
+    return response
@@ -0,0 +1,112 @@
+"""
+Primary/replica database routing.
+
+When a `replica` database is configured (DATABASE_REPLICA_URL, or
+SQLITE_REPLICA_PATH locally), reads made inside replica_reads() go to it.
+All other reads and every write go to the primary. Views opt in with
+ReplicaReadMixin (or AsyncAPIView.read_from_replica), which enables it for
+GET and HEAD only. Endpoints that read and then write, such as scheduling and
+advancing applications, stay on the primary.
+
+Replicas lag. After a user's successful write, PrimaryPinMiddleware pins
+that user's reads to the primary for REPLICA_PIN_SECONDS, so they see their
+own changes.
+
+Shared caches are never filled from the replica: a lagging replica would put
+a stale page under the fresh version that a write just bumped.
+CachedResponseMixin fills them inside primary_reads().
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_ALIAS = 'replica'
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def replica_reads():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def _pin_key(user_id):
+    return f'db:primary:{user_id}'
+
+
+def pin_to_primary(user):
+    cache.set(_pin_key(user.pk), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+async def apin_to_primary(user):
+    await cache.aset(_pin_key(user.pk), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def use_replica(request):
+    """Whether `request` (authenticated) may read from the replica."""
+    if not replica_configured() or request.method not in SAFE_METHODS:
+        return False
+    return not (request.user.is_authenticated and cache.get(_pin_key(request.user.pk)))
+
+
+async def ause_replica(request):
+    if not replica_configured() or request.method not in SAFE_METHODS:
+        return False
+    return not (request.user.is_authenticated and await cache.aget(_pin_key(request.user.pk)))
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # Inside a transaction, reads must see its own uncommitted writes
+        if (_replica_reads.get() and replica_configured()
+                and not connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadMixin:
+    """For DRF views: GET and HEAD read from the replica once the user is authenticated."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if use_replica(request):
+            self._replica_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _replica_reads.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
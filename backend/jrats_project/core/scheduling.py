@@ -0,0 +1,80 @@
+"""
+Interview booking on a per-job grid of 30-minute cells (see InterviewSlot).
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+
+from . import calendar_feed
+from .models import Interview, InterviewSlot
+from .reminders import schedule_reminders
+
+SLOT = timedelta(minutes=InterviewSlot.SLOT_MINUTES)
+
+
+class SlotUnavailable(Exception):
+    pass
+
+
+class InterviewAlreadyScheduled(Exception):
+    pass
+
+
+def align_to_grid(moment):
+    moment = moment.replace(second=0, microsecond=0)
+    return moment - timedelta(minutes=moment.minute % InterviewSlot.SLOT_MINUTES)
+
+
+def cells_for(start):
+    start = align_to_grid(start)
+    return [start + SLOT * cell for cell in range(InterviewSlot.CELLS_PER_INTERVIEW)]
+
+
+def book_interview(interview, scheduled_time):
+    """
+    Claim the grid cells for `interview`, mark it scheduled and queue its
+    reminders (core.reminders), atomically; the recruiter's calendar feed is
+    updated once that commits. Concurrent bookings of
+    overlapping cells lose on the unique constraint.
+    """
+    job_id = interview.application.job_id
+    try:
+        with transaction.atomic():
+            claimed = Interview.objects.filter(pk=interview.pk, is_scheduled=False).update(
+                scheduled_time=scheduled_time, is_scheduled=True
+            )
+            if not claimed:
+                raise InterviewAlreadyScheduled()
+            InterviewSlot.objects.bulk_create([
+                InterviewSlot(job_id=job_id, start=start, interview=interview)
+                for start in cells_for(scheduled_time)
+            ])
+            interview.scheduled_time = scheduled_time
+            interview.is_scheduled = True
+            schedule_reminders(interview)
+            transaction.on_commit(lambda: calendar_feed.invalidate_applications([interview.application_id]))
+    except IntegrityError:
+        interview.scheduled_time = None
+        interview.is_scheduled = False
+        raise SlotUnavailable()
+
+
+def free_slots(job, start, end, not_before=None):
+    """
+    Start times on the grid in [start, end) at which an interview for `job`
+    could still be booked. Reads only the occupied cells in that window.
+    """
+    first = align_to_grid(start)
+    if first < start:
+        first += SLOT
+    occupied = set(
+        InterviewSlot.objects.filter(job=job, start__gte=first, start__lt=end + SLOT * InterviewSlot.CELLS_PER_INTERVIEW)
+        .values_list('start', flat=True)
+    )
+    slots = []
+    current = first
+    while current < end:
+        if (not_before is None or current >= not_before) and not any(cell in occupied for cell in cells_for(current)):
+            slots.append(current)
+        current += SLOT
+    return slots
@@ -0,0 +1,169 @@
+"""
+Keyword search over jobs backed by an inverted index (SearchTerm/JobTerm).
+
+The index is maintained incrementally: saving a job only touches the postings
+whose weights changed, and document counts are adjusted with F() updates.
+Queries read postings for the query tokens and never scan Job.description.
+"""
+import math
+import re
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+
+from .models import Job, SearchTerm, JobTerm
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+MAX_TOKEN_LENGTH = 64
+STOPWORDS = frozenset("""
+    a an and are as at be but by for from has have in is it its of on or that
+    the this to was we will with you your our their they
+""".split())
+
+# Matches in the title count more than matches in the location or description
+FIELD_WEIGHTS = (('title', 3.0), ('location', 2.0), ('description', 1.0))
+
+JOB_COUNT_CACHE_KEY = 'search:job_count'
+JOB_COUNT_CACHE_TIMEOUT = 600
+
+
+def tokenize(text):
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and len(token) <= MAX_TOKEN_LENGTH and token not in STOPWORDS
+    ]
+
+
+def job_term_weights(job):
+    """Field-weighted, log-damped term frequencies for a single job."""
+    weights = {}
+    for field, field_weight in FIELD_WEIGHTS:
+        for token, count in Counter(tokenize(getattr(job, field) or '')).items():
+            weights[token] = weights.get(token, 0.0) + field_weight * (1 + math.log(count))
+    return weights
+
+
+def _ensure_terms(tokens):
+    SearchTerm.objects.bulk_create([SearchTerm(token=token) for token in tokens], ignore_conflicts=True)
+    return dict(SearchTerm.objects.filter(token__in=tokens).values_list('token', 'id'))
+
+
+@transaction.atomic
+def index_job(job):
+    """Bring the postings for `job` in line with its current text."""
+    new_weights = job_term_weights(job)
+    existing = {
+        token: (posting_id, weight)
+        for posting_id, token, weight in JobTerm.objects.filter(job=job).values_list('id', 'term__token', 'weight')
+    }
+
+    removed = [token for token in existing if token not in new_weights]
+    added = [token for token in new_weights if token not in existing]
+    changed = [
+        token for token in new_weights
+        if token in existing and not math.isclose(existing[token][1], new_weights[token])
+    ]
+
+    if removed:
+        JobTerm.objects.filter(id__in=[existing[token][0] for token in removed]).delete()
+        SearchTerm.objects.filter(token__in=removed).update(document_count=F('document_count') - 1)
+    if added:
+        term_ids = _ensure_terms(added)
+        JobTerm.objects.bulk_create([
+            JobTerm(term_id=term_ids[token], job=job, weight=new_weights[token]) for token in added
+        ])
+        SearchTerm.objects.filter(token__in=added).update(document_count=F('document_count') + 1)
+    for token in changed:
+        JobTerm.objects.filter(id=existing[token][0]).update(weight=new_weights[token])
+
+
+def unindex_job(job):
+    """Decrement document counts for a job that is about to be deleted; its postings cascade."""
+    SearchTerm.objects.filter(postings__job=job).update(document_count=F('document_count') - 1)
+
+
+@transaction.atomic
+def index_jobs(jobs, batch_size=5000):
+    """
+    Index jobs that have no postings yet (e.g. rows created with bulk_create,
+    which does not send signals). Much faster than calling index_job() per job.
+    """
+    postings = {}
+    for job in jobs:
+        postings[job.pk] = job_term_weights(job)
+
+    document_counts = Counter(token for weights in postings.values() for token in weights)
+    term_ids = {}
+    tokens = list(document_counts)
+    for start in range(0, len(tokens), batch_size):
+        term_ids.update(_ensure_terms(tokens[start:start + batch_size]))
+
+    batch = []
+    for job_id, weights in postings.items():
+        for token, weight in weights.items():
+            batch.append(JobTerm(term_id=term_ids[token], job_id=job_id, weight=weight))
+            if len(batch) >= batch_size:
+                JobTerm.objects.bulk_create(batch)
+                batch = []
+    JobTerm.objects.bulk_create(batch)
+
+    by_count = {}
+    for token, count in document_counts.items():
+        by_count.setdefault(count, []).append(term_ids[token])
+    for count, ids in by_count.items():
+        for start in range(0, len(ids), batch_size):
+            SearchTerm.objects.filter(id__in=ids[start:start + batch_size]).update(
+                document_count=F('document_count') + count
+            )
+    cache.delete(JOB_COUNT_CACHE_KEY)
+
+
+def rebuild_index(batch_size=5000):
+    """Drop and rebuild the whole index from the Job table."""
+    JobTerm.objects.all().delete()
+    SearchTerm.objects.all().delete()
+    jobs = Job.objects.only('id', 'title', 'description', 'location').order_by('id')
+    chunk = []
+    for job in jobs.iterator(chunk_size=batch_size):
+        chunk.append(job)
+        if len(chunk) >= batch_size:
+            index_jobs(chunk, batch_size)
+            chunk = []
+    index_jobs(chunk, batch_size)
+
+
+def _job_count():
+    # Counting a large table is itself a scan, so the corpus size used for IDF
+    # is cached; it only needs to be roughly right.
+    return cache.get_or_set(JOB_COUNT_CACHE_KEY, Job.objects.count, JOB_COUNT_CACHE_TIMEOUT)
+
+
+def search_jobs(query, location=None):
+    """
+    Return a queryset of {'job_id', 'score'} rows for jobs containing every
+    token in `query`, best match first. Scores are sum(weight * idf).
+    """
+    tokens = set(tokenize(query))
+    terms = dict(
+        SearchTerm.objects.filter(token__in=tokens, document_count__gt=0).values_list('id', 'document_count')
+    )
+    if not tokens or len(terms) < len(tokens):
+        return JobTerm.objects.none().values('job_id')
+
+    total = max(_job_count(), 1)
+    score = Sum(Case(
+        *[When(term_id=term_id, then=F('weight') * Value(math.log(1 + total / count)))
+          for term_id, count in terms.items()],
+        output_field=FloatField(),
+    ))
+    postings = JobTerm.objects.filter(term_id__in=terms)
+    if location:
+        postings = postings.filter(job__location__iexact=location)
+    return (
+        postings.values('job_id')
+        .annotate(score=score, matched=Count('term_id'))
+        .filter(matched=len(terms))
+        .order_by('-score', '-job_id')
+    )
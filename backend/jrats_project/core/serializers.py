@@ -1,5 +1,10 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
-from .models import User, RecruiterProfile, ApplicantProfile, Job, Application
+from .models import (User, RecruiterProfile, ApplicantProfile, Job, Application, ApplicationStatusEvent,
+                     ArchivedApplication, ArchivedJob, ResumeUpload)
+from .resumes import UploadError, extension_for, store_resume, schedule_extraction
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -25,22 +30,68 @@ class RecruiterProfileSerializer(serializers.ModelSerializer):
         return recruiter_profile
 
 class ApplicantProfileSerializer(serializers.ModelSerializer):
+    """
+    Applicant signup. The resume is either uploaded inline as `resume` or
+    referenced as `resume_upload`, the id of a finished chunked upload.
+    """
     user = UserSerializer()
+    resume_upload = serializers.PrimaryKeyRelatedField(
+        queryset=ResumeUpload.objects.filter(blob__isnull=False), write_only=True, required=False
+    )
 
     class Meta:
         model = ApplicantProfile
-        fields = ['user', 'resume', 'skills']
+        fields = ['user', 'resume', 'skills', 'resume_upload']
+        extra_kwargs = {'resume': {'required': False}}
+
+    def validate_resume(self, value):
+        if value.size > settings.RESUME_MAX_SIZE:
+            raise serializers.ValidationError(f"Resumes must be at most {settings.RESUME_MAX_SIZE} bytes.")
+        try:
+            extension_for(value.name)
+        except UploadError as error:
+            raise serializers.ValidationError(str(error))
+        return value
 
+    def validate(self, attrs):
+        if ('resume' in attrs) == ('resume_upload' in attrs):
+            raise serializers.ValidationError("Provide either a 'resume' file or a finished 'resume_upload'.")
+        return attrs
+
+    @transaction.atomic
     def create(self, validated_data):
         user_data = validated_data.pop('user')
+        upload = validated_data.pop('resume_upload', None)
+        resume = validated_data.pop('resume', None)
+        blob = upload.blob if upload is not None else store_resume(resume, resume.name)
         user = User.objects.create_user(**user_data, user_type='applicant')
-        applicant_profile = ApplicantProfile.objects.create(user=user, **validated_data)
+        applicant_profile = ApplicantProfile.objects.create(user=user, resume=blob.file.name, resume_blob=blob,
+                                                            **validated_data)
+        schedule_extraction(blob)
+        if upload is not None:
+            upload.delete()
         return applicant_profile
 
 class JobSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        fields = ['id', 'title', 'description', 'location', 'created_at']
+        fields = ['id', 'title', 'description', 'location', 'created_at', 'closed_at']
+
+class ArchivableJobSerializer(JobSerializer):
+    """For job lists that mix Job and ArchivedJob rows (?include_archived=1)."""
+    archived = serializers.SerializerMethodField()
+
+    class Meta(JobSerializer.Meta):
+        fields = JobSerializer.Meta.fields + ['archived']
+
+    def get_archived(self, obj):
+        return isinstance(obj, ArchivedJob)
+
+class JobSearchResultSerializer(JobSerializer):
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(JobSerializer.Meta):
+        fields = JobSerializer.Meta.fields + ['score']
 
 class ApplicationSerializer(serializers.ModelSerializer):
     class Meta:
@@ -48,8 +99,57 @@ class ApplicationSerializer(serializers.ModelSerializer):
         fields = ['id', 'job', 'applicant', 'status', 'applied_at']
         read_only_fields = ['applicant']
 
+    def validate_job(self, job):
+        if job.closed_at is not None and job.closed_at <= timezone.now():
+            raise serializers.ValidationError("This job is no longer accepting applications.")
+        return job
+
+class ArchivableApplicationSerializer(ApplicationSerializer):
+    """For application lists that mix Application and ArchivedApplication rows."""
+    archived = serializers.SerializerMethodField()
+
+    class Meta(ApplicationSerializer.Meta):
+        fields = ApplicationSerializer.Meta.fields + ['archived']
+
+    def get_archived(self, obj):
+        return isinstance(obj, ArchivedApplication)
+
+class ApplicationStatusEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ApplicationStatusEvent
+        fields = ['from_status', 'to_status', 'at']
+
     
 
+class BulkAdvanceSerializer(serializers.Serializer):
+    """
+    Selects applications either by explicit `ids` or by `job` (optionally
+    narrowed to a current `status`), and the action to apply to all of them.
+    """
+    action = serializers.ChoiceField(choices=['invite', 'reject'])
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False,
+                                max_length=10000)
+    job = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES, required=False)
+
+    def validate(self, attrs):
+        if 'ids' not in attrs and 'job' not in attrs:
+            raise serializers.ValidationError("Provide either 'ids' or a 'job' filter.")
+        return attrs
+
+
+class ResumeUploadSerializer(serializers.ModelSerializer):
+    """Starts a chunked upload; `offset` is how many bytes the server has so far."""
+    offset = serializers.IntegerField(source='received', read_only=True)
+    complete = serializers.BooleanField(source='is_complete', read_only=True)
+    sha256 = serializers.CharField(source='blob.sha256', read_only=True, default=None)
+
+    class Meta:
+        model = ResumeUpload
+        fields = ['id', 'filename', 'size', 'offset', 'complete', 'sha256']
+        read_only_fields = ['id']
+
+
 class InterviewScheduleSerializer(serializers.Serializer):
     scheduled_time = serializers.DateTimeField()
 
@@ -91,4 +191,15 @@ class DetailedApplicationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Application
-        fields = ['id', 'job', 'applicant', 'status', 'applied_at']
\ No newline at end of file
+        fields = ['id', 'job', 'applicant', 'status', 'applied_at']
+
+
+class CandidateMatchSerializer(serializers.ModelSerializer):
+    """An applicant ranked against a job by skill similarity."""
+    user = ApplicantUserSerializer(read_only=True)
+    score = serializers.FloatField(read_only=True)
+    matched_skills = serializers.ListField(child=serializers.CharField(), read_only=True)
+
+    class Meta:
+        model = ApplicantProfile
+        fields = ['id', 'user', 'skills', 'score', 'matched_skills']
@@ -0,0 +1,161 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import calendar_feed
+from .authentication import invalidate_user_context
+from .cache import job_cache
+from .matching import sync_profile_skills, invalidate_skill_matrix
+from .counters import create_counters, record_transitions
+from .facets import apply_facet_deltas, job_facet_deltas
+from .models import User, RecruiterProfile, ApplicantProfile, Job, Application, Interview
+from .search import index_job, unindex_job
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_cache(sender, instance, **kwargs):
+    """
+    Any write to a job (API, admin or shell) bumps the job board's cache version
+    once it commits. Bumped earlier, a read in between would cache the old rows
+    under the new version.
+    """
+    transaction.on_commit(job_cache.invalidate)
+
+
+@receiver(post_save, sender=Job)
+def update_job_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_job(instance)
+
+
+@receiver(pre_delete, sender=Job)
+def remove_job_from_search_index(sender, instance, **kwargs):
+    unindex_job(instance)
+
+
+@receiver(post_save, sender=ApplicantProfile)
+def update_applicant_skills(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'skills' not in update_fields):
+        return
+    sync_profile_skills(instance)
+
+
+@receiver(post_delete, sender=ApplicantProfile)
+def drop_applicant_from_skill_matrix(sender, instance, **kwargs):
+    invalidate_skill_matrix()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_user_context(instance.pk)
+
+
+@receiver(post_save, sender=RecruiterProfile)
+@receiver(post_delete, sender=RecruiterProfile)
+@receiver(post_save, sender=ApplicantProfile)
+@receiver(post_delete, sender=ApplicantProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    invalidate_user_context(instance.user_id)
+
+
+@receiver(post_save, sender=Job)
+def create_job_status_counts(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        create_counters([instance.id])
+
+
+@receiver(post_delete, sender=Application)
+def uncount_deleted_application(sender, instance, origin=None, **kwargs):
+    # When the whole job goes, its counters are deleted with it; skip one
+    # UPDATE per cascaded application
+    if isinstance(origin, (Job, RecruiterProfile)) or getattr(origin, 'model', None) in (Job, RecruiterProfile):
+        return
+    if isinstance(origin, User) and origin.user_type == 'recruiter':
+        return
+    record_transitions([(instance.pk, instance.job_id, instance.status, None)])
+
+
+def _deleted_with_recruiter(origin):
+    # Deleting a recruiter (or their user) cascades to their jobs; their facet
+    # counts are taken off in one go by uncount_recruiter_jobs
+    if isinstance(origin, RecruiterProfile) or getattr(origin, 'model', None) is RecruiterProfile:
+        return True
+    return isinstance(origin, User) and origin.user_type == 'recruiter'
+
+
+@receiver(pre_save, sender=Job)
+def remember_job_facets(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._previous_facets = (
+        Job.objects.filter(pk=instance.pk).values_list('location', 'recruiter__company_name').first()
+    )
+
+
+@receiver(post_save, sender=Job)
+def count_job_facets(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = job_facet_deltas([instance], instance.recruiter.company_name)
+    previous = getattr(instance, '_previous_facets', None)
+    if not created and previous is not None:
+        location, company_name = previous
+        deltas['location', location] -= 1
+        deltas['company', company_name] -= 1
+    apply_facet_deltas(deltas)
+
+
+@receiver(post_delete, sender=Job)
+def uncount_job_facets(sender, instance, origin=None, **kwargs):
+    if _deleted_with_recruiter(origin):
+        return
+    apply_facet_deltas(job_facet_deltas([instance], instance.recruiter.company_name, sign=-1))
+
+
+@receiver(pre_delete, sender=RecruiterProfile)
+def uncount_recruiter_jobs(sender, instance, **kwargs):
+    apply_facet_deltas(job_facet_deltas(instance.jobs.only('location'), instance.company_name, sign=-1))
+
+
+@receiver(pre_save, sender=RecruiterProfile)
+def remember_company_name(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._previous_company_name = (
+        RecruiterProfile.objects.filter(pk=instance.pk).values_list('company_name', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=RecruiterProfile)
+def move_company_facet(sender, instance, created=False, raw=False, **kwargs):
+    previous = getattr(instance, '_previous_company_name', None)
+    if raw or created or previous is None or previous == instance.company_name:
+        return
+    jobs = instance.jobs.count()
+    apply_facet_deltas({('company', previous): -jobs, ('company', instance.company_name): jobs})
+    transaction.on_commit(job_cache.invalidate)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_calendar_feed(sender, instance, created=False, raw=False, **kwargs):
+    # A retitled or deleted job changes its interviews' events; the feed is
+    # rebuilt on the next poll. New jobs have no interviews yet.
+    if created or raw:
+        return
+    recruiter_id = instance.recruiter_id
+    transaction.on_commit(lambda: calendar_feed.invalidate(recruiter_id))
+
+
+@receiver(pre_delete, sender=Interview)
+def drop_interview_from_calendar_feed(sender, instance, origin=None, **kwargs):
+    # Cascades from a job are handled by invalidate_calendar_feed
+    if not instance.is_scheduled or isinstance(origin, Job) or getattr(origin, 'model', None) is Job:
+        return
+    if _deleted_with_recruiter(origin):
+        return
+    recruiter_id = Job.objects.filter(applications__id=instance.application_id).values_list('recruiter_id', flat=True).first()
+    if recruiter_id is not None:
+        transaction.on_commit(lambda: calendar_feed.invalidate(recruiter_id))
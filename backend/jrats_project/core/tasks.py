@@ -1,7 +1,69 @@
+import logging
+
 from celery import shared_task
-from django.core.mail import send_mail
-from .models import Application, Interview
+from .models import Application, ApplicationStatusEvent, Interview, Job, ResumeBlob
+from django.utils import timezone
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from .search import index_jobs, rebuild_index
+from .outbox import queue_email, queue_emails, drain_outbox
+from .resumes import extract_text, purge_stale_uploads
+from .funnel import refresh_funnel_stats as refresh_funnel
+from .idempotency import claim_task, purge_expired
+from .archive import archive_jobs as archive_old_jobs
+from .reminders import send_due_reminders
+
+logger = logging.getLogger(__name__)
+
+DECISION_STATUSES = {'invite': 'interview_pending', 'reject': 'rejected'}
+
+
+def schedule_link_for(interview):
+    # In a real app, the base URL should come from settings or environment variables
+    return f"http://localhost:8000/api/interview/schedule/{interview.scheduling_token}/"
+
+
+def decision_task_keys(action, application_ids):
+    """
+    TaskLock keys for emailing invite/reject decisions, by application: the
+    application, the action and the status event it follows, so an
+    application that is invited again after a rejection gets a new email
+    while repeats of one decision don't. One query for the whole batch.
+    """
+    events = (
+        ApplicationStatusEvent.objects.filter(application_id__in=application_ids, to_status=DECISION_STATUSES[action])
+        .values('application_id').annotate(event_id=Max('id')).order_by().values_list('application_id', 'event_id')
+    )
+    latest = dict(events)
+    return {application_id: f'{action}:{application_id}:{latest.get(application_id)}'
+            for application_id in application_ids}
+
+
+def decision_task_key(action, application_id):
+    return decision_task_keys(action, [application_id])[application_id]
+
+
+def invitation_message(job_title, schedule_link):
+    subject = f'Invitation to Interview for {job_title}'
+    message = (
+        f'Dear Applicant,\n\n'
+        f'Congratulations! We would like to invite you for an interview for the position of {job_title}.\n\n'
+        f'Please use the following link to schedule your interview: {schedule_link}\n\n'
+        f'Best Regards,\nThe Hiring Team'
+    )
+    return subject, message
+
+
+def rejection_message(job_title):
+    subject = f'Update on your application for {job_title}'
+    message = (
+        f'Dear Applicant,\n\n'
+        f'Thank you for your interest in the {job_title} position. After careful consideration, we have decided not to move forward with your application at this time.\n\n'
+        f'We wish you the best of luck in your job search.\n\n'
+        f'Best Regards,\nThe Hiring Team'
+    )
+    return subject, message
 
 
 @shared_task
@@ -12,68 +74,183 @@ def send_status_update_email(applicant_email, job_title, new_status):
     subject = f'Update on your application for {job_title}'
     message = f'Dear Applicant,\n\nYour application for the position of {job_title} has been updated to: {new_status}.\n\nBest Regards,\nThe Hiring Team'
     from_email = 'no-reply@jrats.com'
-    recipient_list = [applicant_email]
-    send_mail(subject, message, from_email, recipient_list)
-    return f"Email sent to {applicant_email}"
+    queue_email(subject, message, from_email, applicant_email)
+    return f"Email queued for {applicant_email}"
 
 
-@shared_task
+# A failed run rolls its TaskLock claim back with its transaction, so the retry can claim it
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
 def send_interview_invitation_email(application_id):
     """
     Sends an email to the applicant with a link to schedule their interview.
     """
     try:
-        application = Application.objects.get(id=application_id)
+        application = Application.objects.select_related('job', 'applicant__user').get(id=application_id)
+    except Application.DoesNotExist:
+        return "Application not found."
+    with transaction.atomic():
+        # A double-submitted or redelivered task finds the claim and stops
+        if not claim_task(decision_task_key('invite', application_id)):
+            return f"Invitation for application {application_id} already queued."
+
         # Create an interview slot for this application
         interview, created = Interview.objects.get_or_create(application=application)
-        
+
         applicant_email = application.applicant.user.email
         job_title = application.job.title
-        
-        # In a real app, the base URL should come from settings or environment variables
-        schedule_link = f"http://localhost:8000/api/interview/schedule/{interview.scheduling_token}/"
-        
-        subject = f'Invitation to Interview for {job_title}'
-        message = (
-            f'Dear Applicant,\n\n'
-            f'Congratulations! We would like to invite you for an interview for the position of {job_title}.\n\n'
-            f'Please use the following link to schedule your interview: {schedule_link}\n\n'
-            f'Best Regards,\nThe Hiring Team'
-        )
-        
+
+        schedule_link = schedule_link_for(interview)
+        subject, message = invitation_message(job_title, schedule_link)
+
         # This will print the link to the terminal if the email backend is console
         print(f"--- INTERVIEW SCHEDULING LINK FOR {applicant_email} ---\n{schedule_link}\n-------------------------------------------------")
 
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [applicant_email])
-        
-        return f"Interview invitation sent to {applicant_email}"
-    except Application.DoesNotExist:
-        return "Application not found."
-    except Exception as e:
-        # Handle potential errors with sending email
-        print(f"Error sending email: {e}")
-        return "Failed to send interview invitation."
+        queue_email(subject, message, settings.DEFAULT_FROM_EMAIL, applicant_email)
 
+    return f"Interview invitation queued for {applicant_email}"
 
-@shared_task
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
 def send_rejection_email(application_id):
     """
     Sends a rejection email to the applicant.
     """
     try:
-        application = Application.objects.get(id=application_id)
+        application = Application.objects.select_related('job', 'applicant__user').get(id=application_id)
+    except Application.DoesNotExist:
+        return "Application not found."
+    with transaction.atomic():
+        if not claim_task(decision_task_key('reject', application_id)):
+            return f"Rejection for application {application_id} already queued."
         applicant_email = application.applicant.user.email
         job_title = application.job.title
-        
-        subject = f'Update on your application for {job_title}'
-        message = (
-            f'Dear Applicant,\n\n'
-            f'Thank you for your interest in the {job_title} position. After careful consideration, we have decided not to move forward with your application at this time.\n\n'
-            f'We wish you the best of luck in your job search.\n\n'
-            f'Best Regards,\nThe Hiring Team'
-        )
-        
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [applicant_email])
-        return f"Rejection email sent to {applicant_email}"
-    except Application.DoesNotExist:
-        return "Application not found."
\ No newline at end of file
+
+        subject, message = rejection_message(job_title)
+
+        queue_email(subject, message, settings.DEFAULT_FROM_EMAIL, applicant_email)
+    return f"Rejection email queued for {applicant_email}"
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def send_bulk_decision_emails(application_ids, action):
+    """
+    Queues interview invitations or rejections for a chunk of applications
+    with a single INSERT. Used by the bulk advance endpoint. Each application
+    is claimed like in the single-application tasks, so a redelivered chunk
+    skips the applications it already emailed.
+    """
+    applications = list(
+        Application.objects.filter(id__in=application_ids).select_related('job', 'applicant__user')
+    )
+    keys = decision_task_keys(action, [application.id for application in applications])
+    with transaction.atomic():
+        applications = [application for application in applications if claim_task(keys[application.id])]
+        claimed_ids = [application.id for application in applications]
+        interviews = {}
+        if action == 'invite':
+            Interview.objects.bulk_create(
+                [Interview(application=application) for application in applications], ignore_conflicts=True
+            )
+            interviews = {
+                interview.application_id: interview
+                for interview in Interview.objects.filter(application_id__in=claimed_ids)
+            }
+
+        messages = []
+        for application in applications:
+            job_title = application.job.title
+            if action == 'invite':
+                subject, message = invitation_message(job_title, schedule_link_for(interviews[application.id]))
+            else:
+                subject, message = rejection_message(job_title)
+            messages.append((subject, message, settings.DEFAULT_FROM_EMAIL, application.applicant.user.email))
+
+        queue_emails(messages)
+    return f"Queued {len(messages)} {action} emails."
+
+
+@shared_task
+def drain_email_outbox():
+    """
+    Periodic task (see CELERY_BEAT_SCHEDULE) that delivers queued emails in
+    batches over a reused connection, retrying failures with backoff.
+    """
+    summary = drain_outbox()
+    return f"Outbox drained: {summary['sent']} sent, {summary['retrying']} retrying, {summary['failed']} failed."
+
+
+@shared_task
+def send_interview_reminders():
+    """
+    Periodic task (see CELERY_BEAT_SCHEDULE) that queues the reminder emails
+    of every due bucket of InterviewReminder rows.
+    """
+    sent, skipped = send_due_reminders()
+    return f"Queued {sent} interview reminders, skipped {skipped}"
+
+
+@shared_task
+def rebuild_search_index():
+    """
+    Rebuilds the job search index from scratch, e.g. after jobs were created
+    with bulk_create (which bypasses the signals that keep it up to date).
+    """
+    rebuild_index()
+    return "Search index rebuilt."
+
+
+@shared_task
+def index_imported_jobs(job_ids):
+    """
+    Adds jobs created by a bulk import to the search index, off the request
+    path. Jobs deleted since, or already indexed, are skipped.
+    """
+    jobs = list(Job.objects.filter(id__in=job_ids, search_terms__isnull=True).distinct())
+    index_jobs(jobs)
+    return f"Indexed {len(jobs)} imported jobs."
+
+
+@shared_task
+def extract_resume_text(blob_id):
+    """
+    Extracts searchable text from a stored resume. Runs once per unique file,
+    however many applicants uploaded it.
+    """
+    blob = ResumeBlob.objects.filter(pk=blob_id, text_extracted_at__isnull=True).first()
+    if blob is None:
+        return f"Resume {blob_id} already extracted or gone"
+    try:
+        text = extract_text(blob)
+    except Exception:
+        # A malformed file should not be retried forever; record it as empty
+        text = ''
+        logger.warning('Could not extract text from resume %s', blob_id, exc_info=True)
+    ResumeBlob.objects.filter(pk=blob_id).update(text=text, text_extracted_at=timezone.now())
+    return f"Extracted {len(text)} characters from resume {blob_id}"
+
+
+@shared_task
+def purge_stale_resume_uploads():
+    return f"Purged {purge_stale_uploads()} stale resume uploads"
+
+
+@shared_task
+def refresh_funnel_stats(full=False):
+    """
+    Periodic task (see CELERY_BEAT_SCHEDULE) that folds new status events into
+    the per-job time-in-stage and conversion aggregates.
+    """
+    return f"Refreshed funnel stats for {refresh_funnel(full=full)} jobs"
+
+
+@shared_task
+def purge_idempotency_records():
+    return f"Purged {purge_expired()} expired idempotency keys and task locks"
+
+
+@shared_task
+def archive_jobs():
+    """
+    Periodic task (see CELERY_BEAT_SCHEDULE) that moves closed and expired
+    jobs and their applications into the archive tables.
+    """
+    return f"Archived {archive_old_jobs()} jobs"
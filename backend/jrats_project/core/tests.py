@@ -1,3 +1,1544 @@
-from django.test import TestCase
+import asyncio
+import base64
+import contextlib
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .async_views import (AsyncApplicationListView, AsyncJobDetailView, AsyncJobListView,
+                          AsyncScheduleInterviewView, AsyncUserProfileView, AsyncApplicationEventsView)
+from .archive import archive_jobs
+from .authentication import build_user_context, user_from_context
+from .cache import job_cache
+from .facets import rebuild_facets
+from .counters import change_status, rebuild_counts, record_transitions
+from .funnel import refresh_funnel_stats
+from .imports import import_jobs
+from .matching import skill_matrix
+from .middleware import registry as metrics_registry
+from .outbox import queue_email, drain_outbox
+from .reminders import bucket_for, send_due_reminders
+from . import calendar_feed, events, routers
+from .routers import PrimaryReplicaRouter, replica_reads
+from .throttling import IPRateThrottle
+from .views import JobApplicationExportView, RecruiterSignUpView
+from .tasks import (send_bulk_decision_emails, extract_resume_text, send_interview_invitation_email,
+                    send_rejection_email, index_imported_jobs)
+from .models import (User, RecruiterProfile, ApplicantProfile, Job, Application, Interview, SearchTerm,
+                     OutboundEmail, ResumeBlob, ResumeUpload, JobStatusCount, JobStageStat, JobFacetCount,
+                     ArchivedJob, ArchivedApplication, InterviewReminder)
+
+
+def make_recruiter(name='recruiter', company='Acme'):
+    user = User.objects.create_user(username=name, email=f'{name}@example.com',
+                                    password=None, user_type='recruiter')
+    return RecruiterProfile.objects.create(user=user, company_name=company)
+
+
+def make_applicant(name='applicant', skills='python'):
+    user = User.objects.create_user(username=name, email=f'{name}@example.com',
+                                    password=None, user_type='applicant')
+    return ApplicantProfile.objects.create(user=user, resume='resumes/test.pdf', skills=skills)
+
+
+class QueryCountTestCase(TestCase):
+    """
+    Guards against N+1 regressions: the number of queries a page needs must
+    not depend on how many rows are on it.
+    """
+
+    def count_queries(self, func):
+        with CaptureQueriesContext(connection) as context:
+            func()
+        return len(context.captured_queries)
+
+    def assertQueriesIndependentOfRows(self, add_rows, request):
+        add_rows(2)
+        baseline = self.count_queries(request)
+        add_rows(10)
+        self.assertEqual(
+            self.count_queries(request), baseline,
+            'Query count grew with the number of rows; check select_related/prefetch_related.'
+        )
+
+
+class ApplicationQueryCountTests(QueryCountTestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.client = APIClient()
+        self.applicants = 0
+
+    def add_applications(self, count):
+        for _ in range(count):
+            self.applicants += 1
+            make_recruiter(name=f'recruiter{self.applicants}')
+            job = Job.objects.create(recruiter=self.recruiter, title=f'Engineer {self.applicants}',
+                                     description='Build things', location='Lagos')
+            applicant = make_applicant(name=f'applicant{self.applicants}')
+            application = Application.objects.create(job=job, applicant=applicant)
+            Interview.objects.create(application=application)
+
+    def test_application_list(self):
+        self.client.force_authenticate(self.recruiter.user)
+        self.assertQueriesIndependentOfRows(
+            self.add_applications,
+            lambda: self.assertEqual(self.client.get('/api/applications/').status_code, 200),
+        )
+
+    def test_application_detail(self):
+        self.client.force_authenticate(self.recruiter.user)
+        self.add_applications(1)
+        application = Application.objects.get()
+        baseline = self.count_queries(lambda: self.client.get(f'/api/applications/{application.pk}/'))
+        # Loading the job and the applicant's user must be part of the same query
+        self.assertLessEqual(baseline, 2)
+
+    def test_admin_changelists(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password=None)
+        self.client.force_login(admin)
+        for url in ('/admin/core/application/', '/admin/core/interview/', '/admin/core/job/',
+                    '/admin/core/applicantprofile/', '/admin/core/recruiterprofile/'):
+            with self.subTest(url=url):
+                self.assertQueriesIndependentOfRows(
+                    self.add_applications,
+                    lambda: self.assertEqual(self.client.get(url).status_code, 200),
+                )
+
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_recruiter()
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+        now = timezone.now()
+        # Three jobs and all applications share a timestamp, so only the id orders them
+        self.jobs = []
+        for i, minutes in enumerate((50, 40, 40, 40, 30, 20, 10)):
+            job = Job.objects.create(recruiter=self.recruiter, title=f'Job {i}', description='Work',
+                                     location='Lagos')
+            job.created_at = now - timedelta(minutes=minutes)
+            Job.objects.filter(pk=job.pk).update(created_at=job.created_at)
+            self.jobs.append(job)
+        self.applications = [Application.objects.create(job=self.jobs[0], applicant=make_applicant(name=f'a{i}'))
+                             for i in range(5)]
+        Application.objects.update(applied_at=now)
+
+    def walk(self, url, link):
+        """The ids on each page from `url` following `link`, and the last URL requested."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([row['id'] for row in response.data['results']])
+            last, url = url, response.data[link]
+        return pages, last
+
+    def assert_pages(self, url, expected_ids):
+        pages, last = self.walk(url, 'next')
+        self.assertEqual([pk for page in pages for pk in page], expected_ids)
+        self.assertTrue(all(len(page) == 2 for page in pages[:-1]))
+        self.assertIsNone(self.client.get(url).data['previous'])
+        back, _ = self.walk(last, 'previous')
+        self.assertEqual(back, pages[::-1])
+
+    def test_jobs_page_forwards_and_backwards_through_timestamp_ties(self):
+        newest_first = [job.id for job in sorted(self.jobs, key=lambda job: (job.created_at, job.id), reverse=True)]
+        self.assert_pages('/api/jobs/?page_size=2', newest_first)
+        self.assert_pages('/api/jobs/?page_size=2&sort=oldest', newest_first[::-1])
+
+    def test_applications_page_forwards_and_backwards_through_timestamp_ties(self):
+        self.assert_pages('/api/applications/?page_size=2',
+                          [application.id for application in reversed(self.applications)])
+
+    def test_applications_can_be_narrowed_to_a_page_of_jobs(self):
+        other = Application.objects.create(job=self.jobs[2], applicant=self.applications[0].applicant)
+        self.client.force_authenticate(self.applications[0].applicant.user)
+        response = self.client.get('/api/applications/', {'job': f'{self.jobs[1].id},{self.jobs[2].id},x'})
+        self.assertEqual([row['id'] for row in response.data['results']], [other.id])
+        response = self.client.get('/api/applications/', {'job': f'{self.jobs[0].id},{self.jobs[2].id}'})
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_invalid_cursors_are_rejected(self):
+        cursors = ['not-a-cursor'] + [base64.urlsafe_b64encode(tokens).decode()
+                                      for tokens in (b'i=1', b'p=2026-01-01&i=x', b'p=yesterday&i=1')]
+        for path in ('/api/jobs/', '/api/applications/'):
+            for cursor in cursors:
+                response = self.client.get(path, {'cursor': cursor})
+                self.assertEqual(response.status_code, 404, (path, cursor))
+
+
+class JobCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer',
+                                      description='Build things', location='Lagos')
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+
+    def test_repeat_request_is_served_from_cache(self):
+        self.client.get('/api/jobs/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(job_cache.stats()['hits'], 1)
+        self.assertEqual(job_cache.stats()['misses'], 1)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(f'/api/jobs/{self.job.pk}/')['ETag']
+        response = self.client.get(f'/api/jobs/{self.job.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_invalidate_cached_pages(self):
+        etag = self.client.get('/api/jobs/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/jobs/', {'title': 'Designer', 'description': 'Draw', 'location': 'Abuja'})
+        response = self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/jobs/{self.job.pk}/', {'title': 'Staff Engineer'})
+        self.assertEqual(self.client.get(f'/api/jobs/{self.job.pk}/').data['title'], 'Staff Engineer')
+
+    def test_cache_version_is_bumped_when_the_write_commits(self):
+        # A read between the write and its commit must not cache the old rows under the new version
+        version = job_cache.get_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.job.title = 'Staff Engineer'
+            self.job.save()
+            self.assertEqual(job_cache.get_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(job_cache.get_version(), version + 1)
+
+
+class JobBoardFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.acme = make_recruiter()
+        self.globex = make_recruiter('globex', company='Globex')
+        now = timezone.now()
+        self.jobs = {}
+        for days, title, location, recruiter in ((3, 'Chef', 'Lagos', self.acme), (2, 'Analyst', 'Abuja', self.acme),
+                                                 (1, 'Baker', 'Lagos', self.globex)):
+            job = Job.objects.create(recruiter=recruiter, title=title, description='Work', location=location)
+            Job.objects.filter(pk=job.pk).update(created_at=now - timedelta(days=days))
+            self.jobs[title] = job
+        self.client = APIClient()
+        self.client.force_authenticate(self.acme.user)
+
+    def titles(self, query):
+        response = self.client.get(f'/api/jobs/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return [job['title'] for job in response.data['results']]
+
+    def test_filters_and_sorts(self):
+        since = (timezone.now() - timedelta(days=2, hours=1)).isoformat()
+        self.assertEqual(self.titles('location=Lagos'), ['Baker', 'Chef'])
+        self.assertEqual(self.titles('company=Acme&sort=oldest'), ['Chef', 'Analyst'])
+        self.assertEqual(self.titles(urlencode({'created_after': since})), ['Baker', 'Analyst'])
+        self.assertEqual(self.titles('sort=title'), ['Analyst', 'Baker', 'Chef'])
+        self.assertEqual(self.client.get('/api/jobs/?sort=salary').status_code, 400)
+        self.assertEqual(self.client.get('/api/jobs/?created_after=yesterday').status_code, 400)
+
+    def test_cursor_follows_the_chosen_sort(self):
+        titles = []
+        url = '/api/jobs/?sort=title&page_size=1'
+        while url:
+            response = self.client.get(url)
+            titles += [job['title'] for job in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(titles, ['Analyst', 'Baker', 'Chef'])
+        previous = self.client.get(response.data['previous']).data['results']
+        self.assertEqual([job['title'] for job in previous], ['Baker'])
+
+    def test_location_filter_uses_its_index(self):
+        plan = Job.objects.filter(location='Lagos').order_by('-created_at', '-id').explain()
+        self.assertIn('job_location_created_idx', plan)
+
+    def facets(self):
+        return {facet: {row['value']: row['count'] for row in rows}
+                for facet, rows in self.client.get('/api/jobs/facets/').data.items()}
+
+    def test_facet_counts_follow_job_changes(self):
+        self.assertEqual(self.facets(), {'location': {'Lagos': 2, 'Abuja': 1}, 'company': {'Acme': 2, 'Globex': 1}})
+
+        with mock.patch('core.imports.index_imported_jobs.delay'), self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/jobs/{self.jobs['Chef'].pk}/", {'location': 'Abuja'})
+            self.jobs['Analyst'].delete()
+            self.globex.company_name = 'Initech'
+            self.globex.save()
+            import_jobs(self.acme, io.BytesIO(b'title,description,location\nCook,Work,Kano\n'), 'csv')
+        expected = {'location': {'Lagos': 1, 'Abuja': 1, 'Kano': 1}, 'company': {'Acme': 2, 'Initech': 1}}
+        self.assertEqual(self.facets(), expected)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.globex.user.delete()
+        del expected['location']['Lagos'], expected['company']['Initech']
+        self.assertEqual(self.facets(), expected)
+        rebuild_facets()
+        self.assertEqual(self.facets(), expected)
+
+
+class JobArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_recruiter()
+        self.applicant = make_applicant()
+        now = timezone.now()
+        self.jobs = {}
+        for days, title in ((10, 'Live'), (60, 'Closed'), (400, 'Expired')):
+            job = Job.objects.create(recruiter=self.recruiter, title=title, description='Work', location='Lagos')
+            Job.objects.filter(pk=job.pk).update(created_at=now - timedelta(days=days))
+            self.jobs[title] = job
+        Job.objects.filter(pk=self.jobs['Closed'].pk).update(closed_at=now - timedelta(days=40))
+        self.applications = {
+            title: Application.objects.create(job=job, applicant=self.applicant) for title, job in self.jobs.items()
+        }
+        record_transitions([(app.id, app.job_id, None, 'submitted') for app in self.applications.values()])
+        change_status(self.applications['Closed'], 'rejected')
+        self.client = APIClient()
+
+    def test_old_jobs_move_to_the_archive_in_batches(self):
+        self.assertEqual(archive_jobs(batch_size=1), 2)
+        self.assertEqual(list(Job.objects.values_list('title', flat=True)), ['Live'])
+        self.assertEqual(set(ArchivedJob.objects.values_list('title', flat=True)), {'Closed', 'Expired'})
+        self.assertEqual(list(Application.objects.all()), [self.applications['Live']])
+
+        archived = ArchivedApplication.objects.get(pk=self.applications['Closed'].pk)
+        self.assertEqual((archived.job_id, archived.status), (self.jobs['Closed'].pk, 'rejected'))
+        self.assertEqual([event[:2] for event in archived.status_history],
+                         [[None, 'submitted'], ['submitted', 'rejected']])
+        self.assertEqual(JobFacetCount.objects.get(facet='location', value='Lagos').count, 1)
+        self.assertEqual(archive_jobs(), 0)
+
+    def test_closed_jobs_refuse_new_applications(self):
+        self.client.force_authenticate(make_applicant(name='late').user)
+        response = self.client.post('/api/applications/', {'job': self.jobs['Closed'].id})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('job', response.data)
+
+        # Closing in the future keeps the job open until then
+        Job.objects.filter(pk=self.jobs['Live'].pk).update(closed_at=timezone.now() + timedelta(days=1))
+        self.assertEqual(self.client.post('/api/applications/', {'job': self.jobs['Live'].id}).status_code, 201)
+
+    def test_list_endpoints_include_archived_rows_on_request(self):
+        archive_jobs()
+        self.client.force_authenticate(self.recruiter.user)
+        self.assertEqual([job['title'] for job in self.client.get('/api/jobs/').data['results']], ['Live'])
+
+        titles = []
+        url = '/api/jobs/?include_archived=1&page_size=1'
+        while url:
+            response = self.client.get(url)
+            titles += [(job['title'], job['archived']) for job in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(titles, [('Live', False), ('Closed', True), ('Expired', True)])
+
+        self.client.force_authenticate(self.applicant.user)
+        self.assertEqual(len(self.client.get('/api/applications/').data['results']), 1)
+        response = self.client.get('/api/applications/?include_archived=1')
+        self.assertEqual([(app['id'], app['archived']) for app in response.data['results']],
+                         [(self.applications[title].id, title != 'Live') for title in ('Expired', 'Closed', 'Live')])
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+        self.backend = Job.objects.create(recruiter=self.recruiter, title='Python Engineer',
+                                          description='Django and Postgres', location='Lagos')
+        self.frontend = Job.objects.create(recruiter=self.recruiter, title='Frontend Engineer',
+                                           description='React with some Python tooling', location='Abuja')
+
+    def search(self, **params):
+        response = self.client.get('/api/jobs/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return [job['id'] for job in response.data['results']]
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.search(q='python'), [self.backend.id, self.frontend.id])
+
+    def test_all_terms_must_match_and_location_filters(self):
+        self.assertEqual(self.search(q='python react'), [self.frontend.id])
+        self.assertEqual(self.search(q='python', location='abuja'), [self.frontend.id])
+        self.assertEqual(self.search(q='python golang'), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.backend.title = 'Golang Engineer'
+        self.backend.description = 'Distributed systems'
+        self.backend.save()
+        self.assertEqual(self.search(q='python'), [self.frontend.id])
+        self.assertEqual(self.search(q='golang'), [self.backend.id])
+
+        self.frontend.delete()
+        self.assertEqual(self.search(q='python'), [])
+        self.assertEqual(SearchTerm.objects.get(token='engineer').document_count, 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CandidateMatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        skill_matrix.reset()
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Senior Python Engineer',
+                                      description='Django, Postgres and Kubernetes on AWS', location='Lagos')
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+
+    def apply(self, name, skills):
+        applicant = make_applicant(name=name, skills=skills)
+        Application.objects.create(job=self.job, applicant=applicant)
+        return applicant
+
+    def test_skills_are_normalized(self):
+        applicant = make_applicant(skills='JS, React.js; PostgreSQL\nmachine  learning')
+        self.assertEqual(sorted(applicant.normalized_skills.values_list('name', flat=True)),
+                         ['javascript', 'machine learning', 'postgres', 'react'])
+
+    def test_ranks_applicants_and_follows_profile_updates(self):
+        strong = self.apply('strong', 'Python, Django, PostgreSQL, K8s')
+        weak = self.apply('weak', 'Python, Excel')
+        self.apply('none', 'Photoshop')
+        make_applicant(name='outsider', skills='Python, Django, Postgres, Kubernetes, AWS')
+
+        response = self.client.get(f'/api/jobs/{self.job.pk}/matches/')
+        self.assertEqual([row['id'] for row in response.data], [strong.id, weak.id])
+        self.assertEqual(sorted(response.data[0]['matched_skills']), ['django', 'kubernetes', 'postgres', 'python'])
+
+        weak.skills = 'Python, Django, Postgres, Kubernetes, AWS'
+        weak.save()
+        response = self.client.get(f'/api/jobs/{self.job.pk}/matches/')
+        self.assertEqual(response.data[0]['id'], weak.id)
+
+        response = self.client.get(f'/api/jobs/{self.job.pk}/matches/?limit=1')
+        self.assertEqual(len(response.data), 1)
+
+    def test_refresh_swaps_in_a_new_snapshot_instead_of_changing_the_old_one(self):
+        strong = self.apply('strong', 'Python, Django')
+        snapshot = skill_matrix.refresh()
+        before = snapshot.score(self.job)
+        self.apply('newcomer', 'Python, Django, Postgres, Kubernetes, AWS')
+        self.assertIsNot(skill_matrix.refresh(), snapshot)
+        # A score() still holding the old snapshot sees consistent, unchanged arrays
+        self.assertEqual(snapshot.score(self.job), before)
+        self.assertEqual([row[0] for row in before], [strong.id])
+        self.assertFalse(snapshot.indices.flags.writeable)
+
+    def test_only_applicants_to_the_job_are_ranked(self):
+        applicant = self.apply('applicant', 'Python')
+        make_applicant(name='outsider', skills='Python, Django, Postgres, Kubernetes, AWS')
+        response = self.client.get(f'/api/jobs/{self.job.pk}/matches/?scope=all')
+        self.assertEqual([row['id'] for row in response.data], [applicant.id])
+
+
+class BulkAdvanceTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer',
+                                      description='Build things', location='Lagos')
+        self.applications = [
+            Application.objects.create(job=self.job, applicant=make_applicant(name=f'applicant{i}'))
+            for i in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+
+    def bulk_advance(self, payload):
+        # Run the email tasks inline instead of going through the broker, then deliver
+        with mock.patch('core.views.send_bulk_decision_emails.delay',
+                        side_effect=send_bulk_decision_emails) as self.dispatch, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/applications/bulk-advance/', payload, format='json')
+        drain_outbox()
+        return response
+
+    @override_settings(BULK_EMAIL_CHUNK_SIZE=2)
+    def test_invite_by_ids_updates_and_emails_in_chunks(self):
+        ids = [application.id for application in self.applications[:3]]
+        response = self.bulk_advance({'action': 'invite', 'ids': ids})
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(self.dispatch.call_count, 2)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(Interview.objects.filter(application_id__in=ids).count(), 3)
+        self.assertEqual(Application.objects.filter(status='interview_pending').count(), 3)
+
+    def test_redelivered_chunk_emails_once(self):
+        ids = [application.id for application in self.applications[:3]]
+        self.bulk_advance({'action': 'invite', 'ids': ids})
+        send_bulk_decision_emails(ids, 'invite')
+        drain_outbox()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(OutboundEmail.objects.count(), 3)
+
+    def test_reject_by_filter_skips_already_rejected(self):
+        self.applications[0].status = 'rejected'
+        self.applications[0].save()
+        response = self.bulk_advance({'action': 'reject', 'job': self.job.id})
+        self.assertEqual(response.data['updated'], 4)
+        self.assertEqual(len(mail.outbox), 4)
+
+    def test_other_recruiters_applications_are_untouched(self):
+        self.client.force_authenticate(make_recruiter(name='other').user)
+        response = self.bulk_advance({'action': 'reject', 'ids': [self.applications[0].id]})
+        self.assertEqual(response.data['updated'], 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_requires_ids_or_job(self):
+        response = self.client.post('/api/applications/bulk-advance/', {'action': 'reject'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+@mock.patch('core.views.send_rejection_email.delay')
+@mock.patch('core.views.send_interview_invitation_email.delay')
+class DashboardCounterTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.jobs = [Job.objects.create(recruiter=self.recruiter, title=title, description='Build things',
+                                        location='Lagos') for title in ('Backend', 'Frontend')]
+        self.client = APIClient()
+
+    def apply(self, job, count):
+        for i in range(count):
+            applicant = make_applicant(name=f'{job.title}{i}')
+            self.client.force_authenticate(applicant.user)
+            self.assertEqual(self.client.post('/api/applications/', {'job': job.id}).status_code, 201)
+        self.client.force_authenticate(self.recruiter.user)
+
+    def counts(self, job):
+        return dict(JobStatusCount.objects.filter(job=job).values_list('status', 'count'))
+
+    def assert_matches_rebuild(self):
+        live = {job.id: self.counts(job) for job in self.jobs}
+        rebuild_counts()
+        self.assertEqual(live, {job.id: self.counts(job) for job in self.jobs})
+
+    def test_transitions_keep_counts_current(self, *mocks):
+        # As if bulk-created without signals: rows are created on first use
+        JobStatusCount.objects.filter(job=self.jobs[1]).delete()
+        self.apply(self.jobs[0], 4)
+        self.apply(self.jobs[1], 1)
+        self.assertEqual(self.counts(self.jobs[1])['submitted'], 1)
+        applications = list(Application.objects.filter(job=self.jobs[0]).order_by('id'))
+        self.assertEqual(self.counts(self.jobs[0])['submitted'], 4)
+
+        self.client.post(f'/api/applications/{applications[0].id}/advance/', {'action': 'invite'}, format='json')
+        # Repeating a transition does not count it twice
+        self.client.post(f'/api/applications/{applications[1].id}/advance/', {'action': 'reject'}, format='json')
+        self.client.post(f'/api/applications/{applications[1].id}/advance/', {'action': 'reject'}, format='json')
+        with mock.patch('core.views.send_bulk_decision_emails.delay'):
+            self.client.post('/api/applications/bulk-advance/', {'action': 'reject', 'job': self.jobs[0].id},
+                             format='json')
+        counts = self.counts(self.jobs[0])
+        self.assertEqual((counts['submitted'], counts['interview_pending'], counts['rejected']), (0, 0, 4))
+
+        interview = Interview.objects.create(application=applications[2])
+        Application.objects.filter(pk=applications[2].pk).update(status='interview_pending')
+        rebuild_counts()
+        when = (timezone.now() + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+        self.client.post(f'/api/interview/schedule/{interview.scheduling_token}/',
+                         {'scheduled_time': when.isoformat()}, format='json')
+        self.assertEqual(self.counts(self.jobs[0])['interview_scheduled'], 1)
+
+        Application.objects.get(pk=applications[3].pk).delete()
+        self.assertEqual(self.counts(self.jobs[0])['rejected'], 2)
+        self.assert_matches_rebuild()
+
+    def test_dashboard_reads_counts_in_one_query(self, *mocks):
+        self.apply(self.jobs[0], 2)
+        self.client.force_authenticate(self.recruiter.user)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/dashboard/')
+        by_title = {job['title']: job for job in response.data['jobs']}
+        self.assertEqual(by_title['Backend']['counts']['submitted'], 2)
+        self.assertEqual(by_title['Frontend']['total'], 0)
+        self.assertEqual(response.data['totals']['submitted'], 2)
+
+        self.client.force_authenticate(make_applicant().user)
+        self.assertEqual(self.client.get('/api/dashboard/').status_code, 403)
+
+    def test_deleting_a_job_drops_its_counters(self, *mocks):
+        self.apply(self.jobs[0], 2)
+        self.jobs[0].delete()
+        self.assertFalse(JobStatusCount.objects.filter(job_id=self.jobs[0].id).exists())
+
+
+class JobImportTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+
+    def post(self, body, content_type):
+        with mock.patch('core.imports.index_imported_jobs.delay') as index, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.generic('POST', '/api/jobs/import/', body, content_type=content_type)
+        return response, index
+
+    def test_csv_rows_are_created_and_errors_reported_per_row(self):
+        body = ('title,description,location\n'
+                'Backend Engineer,Build APIs,Lagos\n'
+                ',Missing a title,Accra\n'
+                'Data Scientist,"Models, pipelines",Nairobi\n')
+        response, index = self.post(body.encode(), 'text/csv')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 1))
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+        self.assertIn('title', response.data['errors'][0]['errors'])
+
+        jobs = Job.objects.filter(recruiter=self.recruiter).order_by('id')
+        self.assertEqual([job.title for job in jobs], ['Backend Engineer', 'Data Scientist'])
+        index.assert_called_once_with([job.id for job in jobs])
+        index_imported_jobs([job.id for job in jobs])
+        self.assertEqual(self.client.get('/api/jobs/search/', {'q': 'pipelines'}).data['results'][0]['title'],
+                         'Data Scientist')
+
+    def test_ndjson_upload_as_a_file(self):
+        body = (b'{"title": "Designer", "description": "Draw", "location": "Accra"}\n'
+                b'not json\n\n'
+                b'{"title": "Tester", "description": "Break things", "location": "Lagos"}\n')
+        upload = SimpleUploadedFile('jobs.ndjson', body, content_type='application/octet-stream')
+        with mock.patch('core.imports.index_imported_jobs.delay'):
+            response = self.client.post('/api/jobs/import/', {'file': upload})
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 1))
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+
+    def test_unusable_files_create_nothing(self):
+        self.assertEqual(self.post(b'name,place\nEngineer,Lagos\n', 'text/csv')[0].status_code, 400)
+        self.assertEqual(self.post(b'{}', 'application/json')[0].status_code, 415)
+        with override_settings(JOB_IMPORT_MAX_ROWS=1):
+            response, _index = self.post(b'title,description,location\nA,B,C\nD,E,F\n', 'text/csv')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+        self.client.force_authenticate(make_applicant().user)
+        self.assertEqual(self.post(b'title,description,location\n', 'text/csv')[0].status_code, 403)
+
+
+class ApplicationExportTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer',
+                                      description='Build things', location='Lagos')
+        for i in range(5):
+            Application.objects.create(job=self.job, applicant=make_applicant(name=f'applicant{i}'))
+        User.objects.filter(username='applicant0').update(first_name='=HYPERLINK("http://evil")')
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+        self.url = f'/api/jobs/{self.job.id}/applications/export/'
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        body = b''.join(response.streaming_content).decode() if response.streaming else None
+        return response, body
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_csv_streams_joined_rows_in_chunks(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        self.assertIn('job-%d-applications.csv' % self.job.id, response['Content-Disposition'])
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode())))
+        self.assertEqual([row['username'] for row in rows], [f'applicant{i}' for i in range(5)])
+        self.assertEqual(rows[1]['email'], 'applicant1@example.com')
+        self.assertTrue(rows[1]['resume'].endswith('resumes/test.pdf'))
+        # Formula-like cells are neutralized for spreadsheet apps
+        self.assertEqual(rows[0]['first_name'], '\'=HYPERLINK("http://evil")')
+
+    def test_ndjson(self):
+        response, body = self.export(output='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['status'], 'submitted')
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_streams_from_the_async_orm_under_asgi(self):
+        request = AsyncRequestFactory().get(self.url, {'output': 'ndjson'})
+        force_authenticate(request, self.recruiter.user)
+        response = JobApplicationExportView.as_view()(request, pk=self.job.id)
+        # An async iterator, so ASGI sends each chunk as it is read instead of buffering them all
+        self.assertTrue(response.is_async)
+
+        async def read():
+            return [chunk async for chunk in response.streaming_content]
+
+        chunks = async_to_sync(read)()
+        self.assertEqual(len(chunks), 3)
+        rows = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+        self.assertEqual([row['username'] for row in rows], [f'applicant{i}' for i in range(5)])
+
+    def test_rows_come_from_a_single_joined_query(self):
+        # The job ownership check, then the export itself
+        with self.assertNumQueries(2):
+            self.export()
+
+    def test_rejects_unknown_format_and_other_recruiters(self):
+        self.assertEqual(self.export(output='xml')[0].status_code, 400)
+        self.client.force_authenticate(make_recruiter(name='other').user)
+        self.assertEqual(self.export()[0].status_code, 404)
+
+
+class ResumeStorageTests(TestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings_override = override_settings(MEDIA_ROOT=root, RESUME_UPLOAD_DIR=os.path.join(root, 'partial'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # No broker in tests: record extraction requests instead of sending them
+        patcher = mock.patch('core.tasks.extract_resume_text.delay')
+        self.extract = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def signup(self, name, **resume):
+        payload = {'user.username': name, 'user.email': f'{name}@example.com', 'user.password': 'Secret-pass-1',
+                   'skills': 'Python', **resume}
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/signup/applicant/', payload, format='multipart')
+
+    def upload(self, content, filename='cv.txt'):
+        response = self.client.post('/api/resumes/uploads/', {'filename': filename, 'size': len(content)},
+                                    format='json')
+        self.assertEqual(response.status_code, 201)
+        return f"/api/resumes/uploads/{response.data['id']}/"
+
+    def put_chunk(self, url, data, offset):
+        return self.client.generic('PUT', url, data, content_type='application/offset+octet-stream',
+                                   HTTP_UPLOAD_OFFSET=str(offset))
+
+    def test_chunked_upload_resumes_from_the_acknowledged_offset(self):
+        content = b'Senior Python developer with Django experience'
+        url = self.upload(content)
+        self.assertEqual(self.put_chunk(url, content[:10], 0).data['offset'], 10)
+
+        # A retried or out-of-order chunk is refused with the offset to resume from
+        conflict = self.put_chunk(url, content[:10], 0)
+        self.assertEqual(conflict.status_code, 409)
+        self.assertEqual(conflict.data['offset'], 10)
+        self.assertEqual(self.client.get(url).data['offset'], 10)
+
+        done = self.put_chunk(url, content[10:], 10)
+        self.assertTrue(done.data['complete'])
+        self.assertEqual(done.data['sha256'], hashlib.sha256(content).hexdigest())
+        self.assertFalse(os.listdir(settings.RESUME_UPLOAD_DIR))
+
+        response = self.signup('chunked', resume_upload=url.split('/')[-2])
+        self.assertEqual(response.status_code, 201)
+        profile = ApplicantProfile.objects.get(user__username='chunked')
+        self.assertEqual(profile.resume.name, profile.resume_blob.file.name)
+        self.assertEqual(profile.resume.read(), content)
+        self.extract.assert_called_once_with(profile.resume_blob.id)
+
+    def test_identical_resumes_are_stored_once(self):
+        for name in ('first', 'second'):
+            response = self.signup(name, resume=SimpleUploadedFile('cv.txt', b'Same bytes'))
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(ResumeBlob.objects.count(), 1)
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.profiles.count(), 2)
+        self.assertEqual(os.listdir(os.path.dirname(blob.file.path)), [os.path.basename(blob.file.name)])
+        # Text is extracted once per blob; repeat requests are no-ops
+        extract_resume_text(blob.id)
+        self.assertIn('already', extract_resume_text(blob.id))
+
+    def test_extracts_text_from_plain_text_resumes(self):
+        self.signup('texty', resume=SimpleUploadedFile('cv.txt', b'Kubernetes   and\tTerraform'))
+        blob = ResumeBlob.objects.get()
+        extract_resume_text(blob.id)
+        blob.refresh_from_db()
+        self.assertEqual(blob.text, 'Kubernetes and Terraform')
+        self.assertIsNotNone(blob.text_extracted_at)
+
+    def test_unreadable_resumes_are_logged_and_stored_empty(self):
+        self.signup('broken', resume=SimpleUploadedFile('cv.txt', b'Anything'))
+        blob = ResumeBlob.objects.get()
+        with mock.patch('core.tasks.extract_text', side_effect=ValueError('corrupt')), \
+                self.assertLogs('core.tasks', level='WARNING') as logs:
+            extract_resume_text(blob.id)
+        self.assertIn(f'resume {blob.id}', logs.output[0])
+        blob.refresh_from_db()
+        self.assertEqual(blob.text, '')
+        self.assertIsNotNone(blob.text_extracted_at)
+
+    def test_rejects_unsupported_files(self):
+        response = self.signup('exe', resume=SimpleUploadedFile('cv.exe', b'MZ'))
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/resumes/uploads/', {'filename': 'cv.pdf', 'size': 10 ** 10},
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(RESUME_UPLOAD_MAX_PENDING=2, RESUME_UPLOAD_MAX_PENDING_BYTES=100)
+    def test_caps_unfinished_uploads_per_client(self):
+        def start(size, address='10.0.0.1'):
+            return self.client.post('/api/resumes/uploads/', {'filename': 'cv.txt', 'size': size},
+                                    format='json', REMOTE_ADDR=address).status_code
+
+        self.assertEqual(start(60), 201)
+        self.assertEqual(start(60), 429)
+        self.assertEqual(start(40), 201)
+        self.assertEqual(start(1), 429)
+        self.assertEqual(start(60, address='10.0.0.2'), 201)
+
+        # Finishing an upload frees its slot and its bytes
+        upload = ResumeUpload.objects.filter(client='10.0.0.1').first()
+        self.put_chunk(f'/api/resumes/uploads/{upload.id}/', b'x' * upload.size, 0)
+        self.assertEqual(start(60), 201)
+
+    def test_download_supports_ranges_and_etags(self):
+        content = b'0123456789'
+        self.signup('owner', resume=SimpleUploadedFile('cv.txt', content))
+        profile = ApplicantProfile.objects.select_related('user', 'resume_blob').get()
+        url = f'/api/applicants/{profile.id}/resume/'
+        self.client.force_authenticate(profile.user)
+
+        response = self.client.get(url)
+        self.assertEqual(b''.join(response.streaming_content), content)
+        self.assertEqual(response['ETag'], f'"{profile.resume_blob.sha256}"')
+
+        partial = self.client.get(url, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(b''.join(partial.streaming_content), b'2345')
+        self.assertEqual(b''.join(self.client.get(url, HTTP_RANGE='bytes=-3').streaming_content), b'789')
+        self.assertEqual(self.client.get(url, HTTP_RANGE='bytes=20-').status_code, 416)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        recruiter = make_recruiter()
+        self.client.force_authenticate(recruiter.user)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        job = Job.objects.create(recruiter=recruiter, title='Engineer', description='Build things', location='Lagos')
+        Application.objects.create(job=job, applicant=profile)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class EmailOutboxTests(TestCase):
+    def queue(self, count):
+        for i in range(count):
+            queue_email(f'Subject {i}', 'Body', 'no-reply@jrats.com', f'user{i}@example.com')
+
+    def test_drain_sends_batches_over_one_connection_each(self):
+        self.queue(5)
+        with mock.patch('core.outbox.get_connection', wraps=get_connection) as connections:
+            summary = drain_outbox(batch_size=2)
+        self.assertEqual(summary, {'sent': 5, 'retrying': 0, 'failed': 0})
+        self.assertEqual(connections.call_count, 3)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(OutboundEmail.objects.exclude(status='sent').exists())
+        self.assertEqual(drain_outbox(), {'sent': 0, 'retrying': 0, 'failed': 0})
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        self.queue(1)
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages',
+                        side_effect=ConnectionError('smtp down')):
+            self.assertEqual(drain_outbox()['retrying'], 1)
+            email = OutboundEmail.objects.get()
+            self.assertEqual(email.status, 'pending')
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            # Not due yet, so a second drain leaves it alone
+            self.assertEqual(drain_outbox()['retrying'], 0)
+
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(drain_outbox()['failed'], 1)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts, email.last_error), ('failed', 2, 'smtp down'))
+
+
+@mock.patch('core.views.send_rejection_email.delay')
+@mock.patch('core.views.send_interview_invitation_email.delay')
+class StatusHistoryTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer', description='Build things',
+                                      location='Lagos')
+        self.start = timezone.now()
+        self.client = APIClient()
+
+    def at(self, hours):
+        return mock.patch('core.counters.timezone.now', return_value=self.start + timedelta(hours=hours))
+
+    def apply(self, name, hours=0):
+        applicant = make_applicant(name=name)
+        self.client.force_authenticate(applicant.user)
+        with self.at(hours):
+            self.client.post('/api/applications/', {'job': self.job.id})
+        return Application.objects.get(applicant=applicant)
+
+    def advance(self, application, action, hours):
+        self.client.force_authenticate(self.recruiter.user)
+        with self.at(hours):
+            self.client.post(f'/api/applications/{application.id}/advance/', {'action': action}, format='json')
+
+    def test_timeline_lists_every_transition(self, *mocks):
+        application = self.apply('a')
+        self.advance(application, 'invite', 2)
+        self.advance(application, 'reject', 5)
+        response = self.client.get(f'/api/applications/{application.id}/timeline/')
+        self.assertEqual([(event['from_status'], event['to_status']) for event in response.data['events']],
+                         [(None, 'submitted'), ('submitted', 'interview_pending'), ('interview_pending', 'rejected')])
+
+        self.client.force_authenticate(application.applicant.user)
+        self.assertEqual(self.client.get(f'/api/applications/{application.id}/timeline/').status_code, 200)
+        self.client.force_authenticate(make_applicant(name='other').user)
+        self.assertEqual(self.client.get(f'/api/applications/{application.id}/timeline/').status_code, 404)
+
+    def test_funnel_reports_time_in_stage_and_conversion(self, *mocks):
+        applications = [self.apply(name) for name in ('a', 'b', 'c', 'd')]
+        self.advance(applications[0], 'invite', 2)
+        self.advance(applications[1], 'invite', 4)
+        self.advance(applications[2], 'reject', 6)
+        self.assertEqual(refresh_funnel_stats(), 1)
+        # Nothing new since the last refresh
+        self.assertEqual(refresh_funnel_stats(), 0)
+
+        self.client.force_authenticate(self.recruiter.user)
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/jobs/{self.job.id}/funnel/')
+        stages = {stage['status']: stage for stage in response.data['stages']}
+        self.assertEqual((stages['submitted']['entered'], stages['submitted']['current']), (4, 1))
+        self.assertEqual(stages['submitted']['avg_seconds_in_stage'], 4 * 3600)
+        conversions = {(row['from_status'], row['to_status']): row['rate'] for row in response.data['conversions']}
+        self.assertEqual(conversions, {('submitted', 'interview_pending'): 0.5, ('submitted', 'rejected'): 0.25})
+
+        self.advance(applications[3], 'reject', 8)
+        self.assertEqual(refresh_funnel_stats(), 1)
+        stat = JobStageStat.objects.get(job=self.job, status='submitted')
+        self.assertEqual((stat.exited, stat.seconds_in_stage), (4, 20 * 3600))
+
+        self.client.force_authenticate(make_recruiter(name='other').user)
+        self.assertEqual(self.client.get(f'/api/jobs/{self.job.id}/funnel/').status_code, 404)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer', description='Build things',
+                                      location='Lagos')
+        self.application = Application.objects.create(job=self.job, applicant=make_applicant())
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+
+    def advance(self, action, key=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f'/api/applications/{self.application.id}/advance/', {'action': action},
+                                    format='json', **headers)
+
+    @mock.patch('core.views.send_interview_invitation_email.delay')
+    def test_repeated_key_replays_the_first_response(self, invite):
+        first = self.advance('invite', key='k1')
+        second = self.advance('invite', key='k1')
+        self.assertEqual((second.status_code, second.data), (first.status_code, first.data))
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        invite.assert_called_once_with(self.application.id)
+        self.assertEqual(self.advance('reject', key='k1').status_code, 422)
+
+    @mock.patch('core.views.send_rejection_email.delay')
+    @mock.patch('core.views.send_interview_invitation_email.delay')
+    def test_repeating_a_decision_dispatches_once(self, invite, reject):
+        self.advance('invite')
+        self.advance('invite')
+        self.advance('reject')
+        invite.assert_called_once_with(self.application.id)
+        reject.assert_called_once_with(self.application.id)
+
+    def test_duplicate_tasks_queue_one_email(self):
+        tasks = {'invite': send_interview_invitation_email, 'reject': send_rejection_email}
+        for action in ('invite', 'reject', 'invite'):
+            with mock.patch(f'core.views.{tasks[action].__name__}.delay'):
+                self.advance(action)
+            # The invitation task prints the scheduling link
+            with contextlib.redirect_stdout(io.StringIO()):
+                tasks[action](self.application.id)
+                tasks[action](self.application.id)
+        # Invited twice (with a rejection between) and rejected once
+        self.assertEqual(OutboundEmail.objects.count(), 3)
+        self.assertEqual(Interview.objects.filter(application=self.application).count(), 1)
+
+    @mock.patch('core.views.send_interview_invitation_email.delay')
+    def test_failed_task_releases_its_claim_for_the_retry(self, invite):
+        self.advance('invite')
+        with contextlib.redirect_stdout(io.StringIO()):
+            with mock.patch('core.tasks.queue_email', side_effect=ConnectionError):
+                with self.assertRaises(ConnectionError):
+                    send_interview_invitation_email(self.application.id)
+            send_interview_invitation_email(self.application.id)
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer', description='Build things',
+                                      location='Lagos')
+        self.application = Application.objects.create(job=self.job, applicant=make_applicant())
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+        patcher = mock.patch('core.routers.replica_configured', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_router(self):
+        router = PrimaryReplicaRouter()
+        # TestCase wraps each test in a transaction, which keeps reads on the primary
+        self.assertEqual(router.db_for_read(Job), 'default')
+        with mock.patch.object(connection, 'in_atomic_block', False):
+            self.assertEqual(router.db_for_read(Job), 'default')
+            with replica_reads():
+                self.assertEqual(router.db_for_read(Job), 'replica')
+                self.assertEqual(router.db_for_write(Job), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'core'))
+
+    def reads_from_replica(self, request):
+        seen = []
+        db_for_read = PrimaryReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            seen.append(routers._replica_reads.get())
+            return db_for_read(router, model, **hints)
+
+        with mock.patch.object(PrimaryReplicaRouter, 'db_for_read', spy), self.captureOnCommitCallbacks(execute=True):
+            response = request()
+        self.assertLess(response.status_code, 400)
+        return any(seen)
+
+    @mock.patch('core.views.send_interview_invitation_email.delay')
+    def test_list_views_read_from_replica_until_the_user_writes(self, invite):
+        self.assertTrue(self.reads_from_replica(lambda: self.client.get('/api/applications/')))
+        self.assertTrue(self.reads_from_replica(lambda: self.client.get(f'/api/applications/{self.application.id}/')))
+        self.assertFalse(self.reads_from_replica(lambda: self.client.post(
+            f'/api/applications/{self.application.id}/advance/', {'action': 'invite'}, format='json')))
+        # Pinned to the primary after the write
+        self.assertFalse(self.reads_from_replica(lambda: self.client.get('/api/applications/')))
+        cache.clear()
+        self.assertTrue(self.reads_from_replica(lambda: self.client.get('/api/applications/')))
+
+    def test_shared_cache_is_filled_from_the_primary(self):
+        # A lagging replica would otherwise serve its stale page to everyone until the TTL
+        self.assertFalse(self.reads_from_replica(lambda: self.client.get('/api/jobs/')))
+        self.assertFalse(self.reads_from_replica(lambda: self.client.get(f'/api/jobs/{self.job.id}/')))
+        self.assertTrue(self.reads_from_replica(lambda: self.client.get('/api/applications/')))
+
+
+@override_settings(INTERVIEW_REMINDER_OFFSETS_MINUTES=[1440, 60], INTERVIEW_REMINDER_BUCKET_MINUTES=5)
+class InterviewReminderTests(TestCase):
+    def setUp(self):
+        self.job = Job.objects.create(recruiter=make_recruiter(), title='Engineer', description='Build things',
+                                      location='Lagos')
+        self.client = APIClient()
+
+    def book(self, name, when):
+        application = Application.objects.create(job=self.job, applicant=make_applicant(name=name))
+        interview = Interview.objects.create(application=application)
+        response = self.client.post(f'/api/interview/schedule/{interview.scheduling_token}/',
+                                    {'scheduled_time': when.isoformat()}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return interview
+
+    def next_hour(self, **delta):
+        return timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1) + timedelta(**delta)
+
+    def test_booking_queues_reminders_in_buckets(self):
+        when = self.next_hour(days=2)
+        interview = self.book('a', when)
+        reminders = {reminder.offset_minutes: reminder for reminder in interview.reminders.all()}
+        self.assertEqual(set(reminders), {1440, 60})
+        self.assertEqual(reminders[1440].due_at, when - timedelta(days=1))
+        self.assertEqual(reminders[60].bucket, bucket_for(when - timedelta(hours=1)))
+        self.assertEqual(bucket_for(when.replace(minute=33, second=27)), when.replace(minute=30))
+
+        # Booked less than a day ahead: only the one-hour reminder is still to come
+        soon = self.book('b', self.next_hour(hours=2))
+        self.assertEqual(list(soon.reminders.values_list('offset_minutes', flat=True)), [60])
+
+    def test_due_buckets_are_sent_once_and_cancelled_interviews_skipped(self):
+        when = self.next_hour(days=2)
+        kept, cancelled = self.book('a', when), self.book('b', when + timedelta(hours=1))
+        Application.objects.filter(pk=cancelled.application_id).update(status='rejected')
+
+        self.assertEqual(send_due_reminders(now=timezone.now()), (0, 0))
+        day_before = when + timedelta(hours=1) - timedelta(days=1)
+        self.assertEqual(send_due_reminders(now=day_before), (1, 1))
+        self.assertEqual(send_due_reminders(now=day_before), (0, 0))
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.to_email, kept.application.applicant.user.email)
+        self.assertIn('Reminder', email.subject)
+        self.assertEqual(send_due_reminders(now=when - timedelta(minutes=30)), (1, 0))
+
+    def test_reminders_for_past_interviews_are_skipped_after_an_outage(self):
+        when = self.next_hour(days=2)
+        interview = self.book('a', when)
+        # Nothing ran until after the interview: both buckets are overdue
+        self.assertEqual(send_due_reminders(now=when + timedelta(minutes=30)), (0, 2))
+        self.assertFalse(interview.reminders.filter(sent_at__isnull=True).exists())
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_due_query_uses_the_partial_index(self):
+        plan = InterviewReminder.objects.filter(sent_at__isnull=True, bucket__lte=timezone.now()).explain()
+        self.assertIn('reminder_due_idx', plan)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer', description='Build things',
+                                      location='Lagos')
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+        self.feed_url = self.client.get('/api/recruiters/me/calendar/').data['url']
+        self.when = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=2)
+
+    def book(self, name, when):
+        interview = Interview.objects.create(
+            application=Application.objects.create(job=self.job, applicant=make_applicant(name=name))
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = APIClient().post(f'/api/interview/schedule/{interview.scheduling_token}/',
+                                        {'scheduled_time': when.isoformat()}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return interview
+
+    def feed(self, **headers):
+        return APIClient().get(self.feed_url, headers=headers)
+
+    def test_feed_is_served_from_the_prebuilt_blob(self):
+        interview = self.book('alice', self.when)
+        response = self.feed()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content.decode()
+        self.assertIn(f'UID:interview-{interview.id}@jrats', body)
+        self.assertIn('SUMMARY:Interview: alice for Engineer', body)
+        self.assertIn(f"DTSTART:{self.when.strftime('%Y%m%dT%H%M%SZ')}", body)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.feed().content, response.content)
+            self.assertEqual(self.feed(if_none_match=response['ETag']).status_code, 304)
+            self.assertEqual(self.feed(if_modified_since=response['Last-Modified']).status_code, 304)
+
+        self.assertEqual(APIClient().get(self.feed_url + 'x').status_code, 404)
+        other = make_recruiter(name='other', company='Globex')
+        self.assertEqual(APIClient().get(self.feed_url.replace(f'/{self.recruiter.id}/', f'/{other.id}/')).status_code,
+                         404)
+
+    def test_feed_follows_bookings_rejections_and_job_changes(self):
+        first = self.book('alice', self.when)
+        etag = self.feed()['ETag']
+
+        # Booking invalidates the cached feed; the next poll rebuilds it once
+        second = self.book('bob', self.when + timedelta(hours=1))
+        with self.assertNumQueries(2):
+            response = self.feed(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'UID:interview-{second.id}@jrats', response.content.decode())
+
+        with mock.patch('core.views.send_rejection_email.delay'), self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/applications/{first.application_id}/advance/', {'action': 'reject'}, format='json')
+        events = self.feed().content.decode().split('BEGIN:VEVENT')[1:]
+        self.assertIn('STATUS:CANCELLED', events[0])
+        self.assertIn('STATUS:CONFIRMED', events[1])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Staff Engineer'
+            self.job.save()
+        self.assertIn('for Staff Engineer', self.feed().content.decode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertNotIn(f'UID:interview-{second.id}@jrats', self.feed().content.decode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.delete()
+        self.assertNotIn('BEGIN:VEVENT', self.feed().content.decode())
+
+    def test_a_build_that_raced_a_change_is_not_served(self):
+        self.book('alice', self.when)
+        key = f'calendar:{self.recruiter.id}:v{calendar_feed._versions(self.recruiter.id).get_version()}'
+        # A poll read the interviews, then a booking committed before it stored the feed
+        stale = calendar_feed.build_feed(self.recruiter.id, key)
+        second = self.book('bob', self.when + timedelta(hours=1))
+        cache.set(key, stale)
+        self.assertIn(f'UID:interview-{second.id}@jrats', self.feed().content.decode())
+
+    def test_rotating_the_link_revokes_old_urls(self):
+        self.assertEqual(self.feed().status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            new_url = self.client.post('/api/recruiters/me/calendar/').data['url']
+        self.assertNotEqual(new_url, self.feed_url)
+        self.assertEqual(self.feed().status_code, 404)
+        self.assertEqual(APIClient().get(new_url).status_code, 200)
+        self.assertEqual(self.client.get('/api/recruiters/me/calendar/').data['url'], new_url)
+
+
+class InterviewSchedulingTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer',
+                                      description='Build things', location='Lagos')
+        self.client = APIClient()
+        self.tomorrow = (timezone.now() + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+
+    def invite(self, name):
+        application = Application.objects.create(job=self.job, applicant=make_applicant(name=name))
+        return Interview.objects.create(application=application)
+
+    def schedule(self, interview, when):
+        return self.client.post(f'/api/interview/schedule/{interview.scheduling_token}/',
+                                {'scheduled_time': when.isoformat()}, format='json')
+
+    def test_bookings_within_30_minutes_conflict(self):
+        self.assertEqual(self.schedule(self.invite('a'), self.tomorrow).status_code, 200)
+        for offset in (-30, 0, 30):
+            with self.subTest(offset=offset):
+                response = self.schedule(self.invite(f'b{offset}'), self.tomorrow + timedelta(minutes=offset))
+                self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.schedule(self.invite('c'), self.tomorrow + timedelta(hours=1)).status_code, 200)
+        self.assertEqual(Application.objects.filter(status='interview_scheduled').count(), 2)
+
+    def test_token_cannot_be_reused(self):
+        interview = self.invite('a')
+        self.schedule(interview, self.tomorrow)
+        self.assertEqual(self.schedule(interview, self.tomorrow + timedelta(hours=2)).status_code, 404)
+
+    def test_free_slots_exclude_booked_cells(self):
+        self.schedule(self.invite('a'), self.tomorrow)
+        self.client.force_authenticate(self.recruiter.user)
+        response = self.client.get(f'/api/jobs/{self.job.pk}/slots/', {
+            'start': (self.tomorrow - timedelta(hours=1)).isoformat(),
+            'end': (self.tomorrow + timedelta(hours=2)).isoformat(),
+        })
+        offsets = [(slot - self.tomorrow) / timedelta(minutes=1) for slot in response.data['free_slots']]
+        self.assertEqual(offsets, [-60, 60, 90])
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        metrics_registry.reset()
+        self.recruiter = make_recruiter()
+        Job.objects.create(recruiter=self.recruiter, title='Engineer', description='Build things', location='Lagos')
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+
+    def test_server_timing_and_prometheus_aggregates(self):
+        response = self.client.get('/api/applications/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", ser;dur=[\d.]+, total;dur=[\d.]+$')
+
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password=None)
+        self.client.force_authenticate(admin)
+        body = self.client.get('/api/metrics/').content.decode()
+        self.assertIn('jrats_request_duration_seconds_count{route="application-list",method="GET"} 1', body)
+        self.assertIn('jrats_db_queries_total{route="application-list",method="GET"}', body)
+
+    def test_metrics_are_admin_only(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_requests_are_logged_with_sql(self):
+        with self.assertLogs('core.slow_requests', level='WARNING') as logs:
+            self.client.get('/api/applications/')
+        self.assertIn('SELECT', logs.output[0])
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics_registry.reset()
+        make_recruiter()
+        self.client = APIClient()
+
+    def login(self, address='10.0.0.1'):
+        return self.client.post('/api/token/', {'email': 'recruiter@example.com', 'password': 'wrong'},
+                                REMOTE_ADDR=address)
+
+    @throttle_rates(token_ip='2/min', token_user='100/min')
+    def test_token_endpoint_is_limited_per_address(self):
+        self.assertEqual([self.login().status_code for _ in range(2)], [401, 401])
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.login(address='10.0.0.2').status_code, 401)
+        self.assertIn('jrats_throttled_requests_total{scope="token_ip"} 1', metrics_registry.render())
+
+    @throttle_rates(token_ip='100/min', token_user='2/min')
+    def test_token_endpoint_is_limited_per_account(self):
+        self.assertEqual([self.login(address=f'10.0.0.{n}').status_code for n in range(3)], [401, 401, 429])
+
+    @throttle_rates(resume_upload_ip='2/min')
+    def test_resume_uploads_are_limited_per_address(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings_override = override_settings(RESUME_UPLOAD_DIR=root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        def start(address='10.0.0.1'):
+            return self.client.post('/api/resumes/uploads/', {'filename': 'cv.txt', 'size': 10},
+                                    format='json', REMOTE_ADDR=address).status_code
+
+        self.assertEqual([start() for _ in range(3)], [201, 201, 429])
+        self.assertEqual(start(address='10.0.0.2'), 201)
+
+    @throttle_rates(signup_ip='10/min')
+    def test_window_slides_instead_of_resetting(self):
+        view = RecruiterSignUpView()
+        request = RequestFactory().post('/api/signup/recruiter/')
+
+        def allowed(at):
+            with mock.patch.object(IPRateThrottle, 'timer', return_value=at):
+                return IPRateThrottle().allow_request(request, view)
+
+        self.assertTrue(all(allowed(6000 + 50) for _ in range(10)))
+        self.assertFalse(allowed(6000 + 55))
+        # A fixed window would allow 10 more from 6060. Here the previous
+        # window still weighs 59/60 of its 10 requests, leaving room for one.
+        self.assertTrue(allowed(6000 + 61))
+        self.assertFalse(allowed(6000 + 62))
+        self.assertTrue(allowed(6000 + 60 + 31))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_recruiter()
+        self.recruiter.user.set_password('secret-pass-1')
+        self.recruiter.user.save()
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post('/api/token/', {'email': 'recruiter@example.com', 'password': 'secret-pass-1'})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return response.data['access']
+
+    def test_token_carries_user_type_and_profile_claims(self):
+        token = AccessToken(self.login())
+        self.assertEqual(token['user_type'], 'recruiter')
+        self.assertEqual(token['profile_id'], self.recruiter.id)
+
+    def test_warm_requests_skip_user_and_profile_queries(self):
+        self.login()
+        self.client.get('/api/applications/')
+        # Only the application list itself is queried
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/applications/').status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/profile/me/')
+        self.assertEqual(response.data['recruiter_profile']['company_name'], 'Acme')
+        self.assertIsNone(response.data['applicant_profile'])
+
+    def test_profile_changes_invalidate_the_cache(self):
+        self.login()
+        self.client.get('/api/profile/me/')
+        self.recruiter.company_name = 'Globex'
+        self.recruiter.save()
+        self.assertEqual(self.client.get('/api/profile/me/').data['recruiter_profile']['company_name'], 'Globex')
+
+        User.objects.filter(pk=self.recruiter.user.pk).update(is_active=False)
+        self.recruiter.user.refresh_from_db()
+        self.recruiter.user.save()
+        self.assertEqual(self.client.get('/api/profile/me/').status_code, 401)
+
+    def test_saving_a_cached_user_keeps_fields_outside_the_snapshot(self):
+        user = user_from_context(build_user_context(self.recruiter.user))
+        user.first_name = 'Ada'
+        user.save()
+        user.recruiter_profile.save()
+        stored = User.objects.get(pk=user.pk)
+        self.assertTrue(stored.check_password('secret-pass-1'))
+        self.assertEqual(stored.first_name, 'Ada')
+
+        blob = ResumeBlob.objects.create(sha256='0' * 64, file='resumes/x.pdf', size=1, content_type='application/pdf')
+        applicant = make_applicant()
+        ApplicantProfile.objects.filter(pk=applicant.pk).update(resume_blob=blob)
+        applicant.user.refresh_from_db()
+        user_from_context(build_user_context(applicant.user)).applicant_profile.save()
+        self.assertEqual(ApplicantProfile.objects.get(pk=applicant.pk).resume_blob_id, blob.id)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_recruiter()
+        self.applicant = make_applicant()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer', description='Build things',
+                                      location='Lagos')
+        self.application = Application.objects.create(job=self.job, applicant=self.applicant)
+        rebuild_counts()
+        self.factory = AsyncRequestFactory()
+        self.client = APIClient()
+
+    def auth(self, user=None, **headers):
+        if user is not None:
+            headers['Authorization'] = f'Bearer {AccessToken.for_user(user)}'
+        return headers
+
+    def get(self, view, path, user=None, **kwargs):
+        return view.as_view()(self.factory.get(path, headers=self.auth(user)), **kwargs)
+
+    async def test_responses_match_the_sync_views(self):
+        recruiter, applicant = self.recruiter.user, self.applicant.user
+        for view, path, user, kwargs in (
+            (AsyncJobListView, '/api/jobs/', applicant, {}),
+            (AsyncJobListView, '/api/jobs/?location=Lagos&sort=title', applicant, {}),
+            (AsyncJobListView, '/api/jobs/?include_archived=1', applicant, {}),
+            (AsyncJobDetailView, f'/api/jobs/{self.job.pk}/', recruiter, {'pk': self.job.pk}),
+            (AsyncApplicationListView, '/api/applications/', recruiter, {}),
+            (AsyncApplicationListView, '/api/applications/', applicant, {}),
+            (AsyncApplicationListView, '/api/applications/?include_archived=1', applicant, {}),
+            (AsyncUserProfileView, '/api/profile/me/', applicant, {}),
+        ):
+            with self.subTest(path=path, user=user.username):
+                response = await self.get(view, path, user, **kwargs)
+                self.assertEqual(response.status_code, 200)
+                await sync_to_async(self.client.force_authenticate)(user)
+                expected = await sync_to_async(self.client.get)(path)
+                self.assertEqual(json.loads(response.content), json.loads(expected.content))
+
+    async def test_authentication_and_permissions(self):
+        response = await self.get(AsyncJobListView, '/api/jobs/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+        response = await self.get(AsyncJobDetailView, f'/api/jobs/{self.job.pk}/', self.applicant.user,
+                                  pk=self.job.pk)
+        self.assertEqual(response.status_code, 403)
+        response = await self.get(AsyncJobDetailView, '/api/jobs/0/', self.recruiter.user, pk=0)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_job_list_revalidates_with_etag(self):
+        first = await self.get(AsyncJobListView, '/api/jobs/', self.applicant.user)
+        request = self.factory.get('/api/jobs/', headers=self.auth(self.applicant.user,
+                                                                    **{'If-None-Match': first['ETag']}))
+        response = await AsyncJobListView.as_view()(request)
+        self.assertEqual(response.status_code, 304)
+
+    async def test_writes_are_delegated_to_the_sync_view(self):
+        request = self.factory.post('/api/jobs/', {'title': 'Designer', 'description': 'Draw things',
+                                                   'location': 'Accra'}, content_type='application/json',
+                                    headers=self.auth(self.recruiter.user))
+        response = await AsyncJobListView.as_view()(request)
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(await Job.objects.filter(title='Designer').aexists())
+
+    async def test_scheduling_books_the_slot_and_updates_counters(self):
+        interview = await Interview.objects.acreate(application=self.application)
+        when = (timezone.now() + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+        view = AsyncScheduleInterviewView.as_view()
+
+        def schedule():
+            request = self.factory.post('/', {'scheduled_time': when.isoformat()}, content_type='application/json')
+            return view(request, token=interview.scheduling_token)
+
+        self.assertEqual((await schedule()).status_code, 200)
+        self.assertEqual((await schedule()).status_code, 404)
+        counts = await sync_to_async(lambda: dict(
+            JobStatusCount.objects.filter(job=self.job).values_list('status', 'count')))()
+        self.assertEqual((counts['submitted'], counts['interview_scheduled']), (0, 1))
+
+
+@override_settings(EVENTS_REDIS_URL='', EVENTS_KEEPALIVE_SECONDS=0.05)
+class ApplicationEventsTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.job = Job.objects.create(recruiter=self.recruiter, title='Engineer', description='Build things',
+                                      location='Lagos')
+        self.application = Application.objects.create(job=self.job, applicant=make_applicant(name='alice'))
+        self.other = Application.objects.create(job=self.job, applicant=make_applicant(name='bob'))
+        self.factory = AsyncRequestFactory()
+
+    def advance(self, application, new_status):
+        with self.captureOnCommitCallbacks(execute=True):
+            change_status(application, new_status)
+
+    def open_stream(self, user):
+        request = self.factory.get('/api/events/', {'ticket': events.issue_ticket(user.pk)})
+        return AsyncApplicationEventsView.as_view()(request)
+
+    async def next_event(self, body):
+        async def skip_keepalives():
+            async for chunk in body:
+                if not chunk.startswith(b':'):
+                    return chunk
+        return await asyncio.wait_for(skip_keepalives(), 1)
+
+    async def test_status_changes_reach_the_applicant_and_the_recruiter(self):
+        applicant_stream = await self.open_stream(self.application.applicant.user)
+        self.assertEqual(applicant_stream['Content-Type'], 'text/event-stream')
+        applicant_body = aiter(applicant_stream.streaming_content)
+        recruiter_body = aiter((await self.open_stream(self.recruiter.user)).streaming_content)
+        self.assertIn(b'event: ready', await self.next_event(applicant_body))
+        self.assertIn(b'event: ready', await self.next_event(recruiter_body))
+
+        await sync_to_async(self.advance)(self.other, 'rejected')
+        await sync_to_async(self.advance)(self.application, 'interview_pending')
+
+        # Each applicant sees only their own application; the recruiter sees both
+        chunk = await self.next_event(applicant_body)
+        self.assertTrue(chunk.startswith(b'event: status\ndata: '))
+        self.assertEqual(json.loads(chunk.split(b'data: ', 1)[1]),
+                         {'application': self.application.pk, 'job': self.job.pk, 'status': 'interview_pending'})
+        received = [json.loads((await self.next_event(recruiter_body)).split(b'data: ', 1)[1])['application']
+                    for _ in range(2)]
+        self.assertEqual(received, [self.other.pk, self.application.pk])
+        await applicant_body.aclose()
+        await recruiter_body.aclose()
+
+    async def test_idle_streams_send_keepalives_and_unsubscribe_on_close(self):
+        body = events.stream(self.recruiter.user_id)
+        self.assertIn('event: ready', await anext(body))
+        self.assertEqual(await anext(body), ': keepalive\n\n')
+        self.assertFalse(events.hub().idle)
+        await body.aclose()
+        self.assertTrue(events.hub().idle)
+
+    async def test_stream_requires_a_valid_ticket(self):
+        view = AsyncApplicationEventsView.as_view()
+        self.assertEqual((await view(self.factory.get('/api/events/', {'ticket': 'forged'}))).status_code, 403)
+        ticket = events.issue_ticket(self.recruiter.user_id)
+        self.assertEqual(events.user_for_ticket(ticket), self.recruiter.user_id)
+        with override_settings(EVENTS_TICKET_MAX_AGE=-1):
+            self.assertIsNone(events.user_for_ticket(ticket))
+
+    def test_nothing_is_queried_without_listeners(self):
+        with self.assertNumQueries(0):
+            events.publish_status_changes([self.application.pk])
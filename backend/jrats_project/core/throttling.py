@@ -0,0 +1,108 @@
+"""
+Sliding-window rate limits, applied to the endpoints that are open to
+anonymous clients: signups, token issue, interview scheduling and chunked
+resume uploads.
+
+Each throttle keeps two counters per client in the default cache: one for
+the current fixed window and one for the previous window. A request is
+allowed while
+
+    previous * (share of the previous window still inside the last `duration`) + current
+
+stays under the limit. This approximates a true sliding window without
+fixed-window bursts at the boundaries. Each check costs one get_many and one
+incr, whatever the limit. With REDIS_URL set, the counters are shared by all
+workers. Otherwise they live in each process's LocMemCache.
+
+Limits are set per view through `throttle_scope` and the
+DEFAULT_THROTTLE_RATES setting: `<scope>_ip` for IPRateThrottle and
+`<scope>_user` for LoginRateThrottle, which counts per account.
+Rejections are counted in the metrics registry by throttle scope.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from .middleware import registry as metrics_registry
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Base class; subclasses name the rate suffix and the client identity."""
+    suffix = None
+
+    def __init__(self):
+        # The rate depends on the view's scope, so it is resolved in allow_request
+        pass
+
+    def get_ident_for(self, request, view):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_for(request, view)
+        if ident is None:
+            return None
+        return f'throttle:{self.scope}:{ident}'
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            return True
+        self.scope = f'{scope}_{self.suffix}'
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window, self.elapsed = divmod(now, self.duration)
+        current_key, previous_key = f'{self.key}:{int(window)}', f'{self.key}:{int(window) - 1}'
+        counts = self.cache.get_many([current_key, previous_key])
+        self.current, self.previous = counts.get(current_key, 0), counts.get(previous_key, 0)
+        if self.previous * (1 - self.elapsed / self.duration) + self.current >= self.num_requests:
+            metrics_registry.throttled(self.scope)
+            return False
+
+        # The counter must outlive the next window, which reads it as `previous`
+        self.cache.add(current_key, 0, timeout=2 * self.duration)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            # Evicted between add and incr
+            self.cache.set(current_key, 1, timeout=2 * self.duration)
+        return True
+
+    def wait(self):
+        if self.current >= self.num_requests:
+            # Until this window, weighed as the next one's `previous`, has decayed below the limit
+            return self.duration - self.elapsed + self.duration * (1 - self.num_requests / self.current)
+        # Until the previous window's weight has decayed enough
+        return max(self.duration * (1 - (self.num_requests - self.current) / self.previous) - self.elapsed, 0)
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Limits each client address (see NUM_PROXIES for clients behind a proxy)."""
+    suffix = 'ip'
+
+    def get_ident_for(self, request, view):
+        return self.get_ident(request)
+
+
+def client_address(request):
+    """The client address IPRateThrottle counts `request` under."""
+    return IPRateThrottle().get_ident(request)
+
+
+class LoginRateThrottle(SlidingWindowThrottle):
+    """Limits attempts per account, so guessing one password from many addresses is still throttled."""
+    suffix = 'user'
+
+    def get_ident_for(self, request, view):
+        username = request.data.get(get_user_model().USERNAME_FIELD)
+        if not isinstance(username, str) or not username.strip():
+            return None
+        return hashlib.sha256(username.strip().lower().encode()).hexdigest()
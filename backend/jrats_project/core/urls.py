@@ -1,25 +1,80 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     RecruiterSignUpView, 
     ApplicantSignUpView,
     JobListView,
     JobDetailView,
+    JobSearchView,
+    JobFacetView,
+    JobImportView,
+    JobCandidateMatchView,
+    JobSlotsView,
     ApplicationListView,
     ApplicationDetailView,
+    JobApplicationExportView,
+    JobFunnelView,
+    ApplicationTimelineView,
     AdvanceApplicationView,
+    BulkAdvanceApplicationsView,
     ScheduleInterviewView,
-    UserProfileView
+    ResumeUploadStartView,
+    ResumeUploadView,
+    ApplicantResumeView,
+    RecruiterDashboardView,
+    RecruiterCalendarFeedView,
+    RecruiterCalendarLinkView,
+    UserProfileView,
+    CacheStatsView,
+    MetricsView,
+    ApplicationEventsTicketView,
 )
 
+if settings.ASYNC_VIEWS:
+    # Served over ASGI (see DEPLOYMENT.md): use the async-native views
+    from .async_views import (
+        AsyncJobListView as JobListView,
+        AsyncJobDetailView as JobDetailView,
+        AsyncApplicationListView as ApplicationListView,
+        AsyncScheduleInterviewView as ScheduleInterviewView,
+        AsyncUserProfileView as UserProfileView,
+    )
+
 urlpatterns = [
     path('signup/recruiter/', RecruiterSignUpView.as_view(), name='recruiter-signup'),
     path('signup/applicant/', ApplicantSignUpView.as_view(), name='applicant-signup'),
     path('jobs/', JobListView.as_view(), name='job-list'),
+    path('jobs/search/', JobSearchView.as_view(), name='job-search'),
+    path('jobs/facets/', JobFacetView.as_view(), name='job-facets'),
+    path('jobs/import/', JobImportView.as_view(), name='job-import'),
     path('jobs/<int:pk>/', JobDetailView.as_view(), name='job-detail'),
+    path('jobs/<int:pk>/matches/', JobCandidateMatchView.as_view(), name='job-candidate-matches'),
+    path('jobs/<int:pk>/slots/', JobSlotsView.as_view(), name='job-slots'),
+    path('jobs/<int:pk>/applications/export/', JobApplicationExportView.as_view(), name='job-application-export'),
+    path('jobs/<int:pk>/funnel/', JobFunnelView.as_view(), name='job-funnel'),
     path('applications/', ApplicationListView.as_view(), name='application-list'),
     path('applications/<int:pk>/', ApplicationDetailView.as_view(), name='application-detail'),
+    path('applications/<int:pk>/timeline/', ApplicationTimelineView.as_view(), name='application-timeline'),
 
     path('applications/<int:pk>/advance/', AdvanceApplicationView.as_view(), name='advance-application'),
+    path('applications/bulk-advance/', BulkAdvanceApplicationsView.as_view(), name='bulk-advance-applications'),
     path('interview/schedule/<uuid:token>/', ScheduleInterviewView.as_view(), name='schedule-interview'),
+    path('resumes/uploads/', ResumeUploadStartView.as_view(), name='resume-upload-start'),
+    path('resumes/uploads/<uuid:pk>/', ResumeUploadView.as_view(), name='resume-upload'),
+    path('applicants/<int:pk>/resume/', ApplicantResumeView.as_view(), name='applicant-resume'),
+    path('dashboard/', RecruiterDashboardView.as_view(), name='recruiter-dashboard'),
+    path('recruiters/me/calendar/', RecruiterCalendarLinkView.as_view(), name='recruiter-calendar-link'),
+    path('recruiters/<int:pk>/calendar.ics', RecruiterCalendarFeedView.as_view(), name='recruiter-calendar-feed'),
     path('profile/me/', UserProfileView.as_view(), name='user-profile'),
-]
\ No newline at end of file
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+]
+
+if settings.ASYNC_VIEWS:
+    # Long-lived streams need the event loop; under WSGI clients keep polling
+    from .async_views import AsyncApplicationEventsView
+
+    urlpatterns += [
+        path('events/', AsyncApplicationEventsView.as_view(), name='application-events'),
+        path('events/ticket/', ApplicationEventsTicketView.as_view(), name='application-events-ticket'),
+    ]
@@ -1,34 +1,93 @@
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, permissions
-from .models import RecruiterProfile, ApplicantProfile, Job, Application, Interview
+from .models import (RecruiterProfile, ApplicantProfile, Job, Application, ApplicationStatusEvent, Interview, Skill,
+                     InterviewSlot, ResumeUpload, ArchivedApplication, ArchivedJob)
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
 from .serializers import (RecruiterProfileSerializer, ApplicantProfileSerializer,
                         JobSerializer, ApplicationSerializer,
-                        InterviewScheduleSerializer, UserProfileSerializer,
-                        DetailedApplicationSerializer
+                        InterviewScheduleSerializer, ResumeUploadSerializer, UserProfileSerializer,
+                        DetailedApplicationSerializer, JobSearchResultSerializer,
+                        CandidateMatchSerializer, BulkAdvanceSerializer, ApplicationStatusEventSerializer,
+                        ArchivableApplicationSerializer, ArchivableJobSerializer
                         )
 from .permissions import IsRecruiter, IsApplicantOrReadOnly
+from .pagination import JobCursorPagination, ApplicationCursorPagination, SearchPagination
+from .archive import include_archived
+from .cache import CachedResponseMixin, job_cache
+from . import calendar_feed
+from .events import issue_ticket
+from .facets import JobFilter, facet_counts
+from .search import search_jobs
+from .matching import skill_matrix
+from .resumes import (UploadError, UploadQuotaExceeded, OffsetMismatch, start_upload, append_chunk,
+                      attach_resume, resume_response)
+from .counters import change_status, record_transitions
+from .export import astream_export, stream_export, FORMATS as EXPORT_FORMATS
+from .funnel import job_funnel
+from .idempotency import idempotent
+from .routers import ReplicaReadMixin
+from .imports import JobImportError, format_for, import_jobs
+from .scheduling import book_interview, free_slots, SlotUnavailable, InterviewAlreadyScheduled
+from .throttling import IPRateThrottle, LoginRateThrottle, client_address
 from .tasks import send_status_update_email
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework import status
-from .tasks import send_interview_invitation_email, send_rejection_email
+from .tasks import send_interview_invitation_email, send_rejection_email, send_bulk_decision_emails
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.http import parse_etags, parse_http_date_safe
+from .middleware import registry as metrics_registry
 
 
 class RecruiterSignUpView(generics.CreateAPIView):
     queryset = RecruiterProfile.objects.all()
     serializer_class = RecruiterProfileSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = 'signup'
 
 class ApplicantSignUpView(generics.CreateAPIView):
     queryset = ApplicantProfile.objects.all()
     serializer_class = ApplicantProfileSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = 'signup'
 
-class JobListView(generics.ListCreateAPIView):
+class TokenObtainView(TokenObtainPairView):
+    """
+    simplejwt's token view, limited per address and per account: every
+    attempt costs a password hash.
+    """
+    throttle_classes = [IPRateThrottle, LoginRateThrottle]
+    throttle_scope = 'token'
+
+class JobListView(ReplicaReadMixin, CachedResponseMixin, generics.ListCreateAPIView):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
-    # permission_classes = [permissions.IsAuthenticated, IsRecruiter] # <-- REMOVE THIS LINE
+    pagination_class = JobCursorPagination  # also handles ?sort=
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = JobFilter
+    response_cache = job_cache  # invalidated by the Job save/delete signals
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and include_archived(self.request):
+            return ArchivableJobSerializer
+        return JobSerializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if include_archived(self.request):
+            # Paged together with the live jobs by JobCursorPagination
+            return [queryset, JobFilter(self.request.query_params, queryset=ArchivedJob.objects.all()).qs]
+        return queryset
 
     def get_permissions(self):
         """
@@ -44,28 +103,158 @@ class JobListView(generics.ListCreateAPIView):
         recruiter_profile = self.request.user.recruiter_profile
         serializer.save(recruiter=recruiter_profile)
 
-class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
+class JobDetailView(ReplicaReadMixin, CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated, IsRecruiter]
+    response_cache = job_cache
+
+class JobFacetView(ReplicaReadMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    """
+    Job counts per location and per company for the job board's filters,
+    read from the maintained JobFacetCount rows.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    response_cache = job_cache
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(facet_counts())
+
+class JobImportView(APIView):
+    """
+    Creates many jobs from one CSV or NDJSON file, sent either as the raw
+    request body (Content-Type text/csv or application/x-ndjson) or as the
+    `file` field of a multipart form. Rows that fail validation are listed in
+    the response by row number; the rest are created.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsRecruiter]
+
+    def post(self, request, *args, **kwargs):
+        if request.content_type.startswith('multipart/form-data'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                return Response({"error": "Attach the jobs as `file`."}, status=status.HTTP_400_BAD_REQUEST)
+            stream, import_format = upload, format_for(upload.content_type, upload.name)
+        else:
+            stream, import_format = request.stream, format_for(request.content_type)
+        if import_format is None:
+            return Response({"error": "Send text/csv or application/x-ndjson."},
+                            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        if stream is None:
+            return Response({"error": "The request has no body."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = import_jobs(request.user.recruiter_profile, stream, import_format)
+        except JobImportError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
+
+
+class JobSearchView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    Ranked keyword search over job titles, descriptions and locations.
+    Query parameters: `q` (required), `location` (exact, case-insensitive), `page`.
+    """
+    serializer_class = JobSearchResultSerializer
+    pagination_class = SearchPagination
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return search_jobs(self.request.query_params.get('q', ''),
+                           location=self.request.query_params.get('location'))
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        jobs = Job.objects.in_bulk([row['job_id'] for row in page])
+        results = []
+        for row in page:
+            job = jobs.get(row['job_id'])
+            if job is not None:
+                job.score = row['score']
+                results.append(job)
+        return self.get_paginated_response(self.get_serializer(results, many=True).data)
+
+class JobCandidateMatchView(APIView):
+    """
+    Ranks applicants for one of the recruiter's jobs by skill similarity.
+    Only applicants to the job are ranked. `?limit=` caps the shortlist
+    (default 20, max 100).
+    """
+    permission_classes = [permissions.IsAuthenticated, IsRecruiter]
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            job = Job.objects.get(pk=pk, recruiter=request.user.recruiter_profile)
+        except Job.DoesNotExist:
+            return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        candidate_ids = job.applications.values_list('applicant_id', flat=True)
+        ranked = skill_matrix.score(job, candidate_ids=candidate_ids, limit=limit)
+        profiles = ApplicantProfile.objects.select_related('user').in_bulk([row[0] for row in ranked])
+        skill_names = Skill.objects.in_bulk({skill for row in ranked for skill in row[2]})
+
+        shortlist = []
+        for applicant_id, score, skill_ids in ranked:
+            profile = profiles.get(applicant_id)
+            if profile is None:
+                continue
+            profile.score = round(score, 4)
+            profile.matched_skills = [skill_names[skill].name for skill in skill_ids if skill in skill_names]
+            shortlist.append(profile)
+        return Response(CandidateMatchSerializer(shortlist, many=True).data)
+
+def visible_applications(queryset, request):
+    """
+    Narrow Application or ArchivedApplication rows to those `request.user`
+    may list: a recruiter's jobs' applications or an applicant's own, and to
+    some jobs with ?job=<id>[,<id>...] (e.g. to mark a page of the job board
+    as applied to).
+    """
+    user = request.user
+    if user.user_type == 'recruiter':
+        queryset = queryset.filter(job__recruiter=user.recruiter_profile)
+    else:
+        queryset = queryset.filter(applicant=user.applicant_profile)
+    job_ids = [job_id for job_id in request.query_params.get('job', '').split(',') if job_id.isdigit()]
+    if job_ids:
+        queryset = queryset.filter(job_id__in=job_ids[:ApplicationCursorPagination.max_page_size])
+    return queryset
 
-class ApplicationListView(generics.ListCreateAPIView):
+class ApplicationListView(ReplicaReadMixin, generics.ListCreateAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ApplicationCursorPagination
 
     def get_queryset(self):
-        user = self.request.user
-        if user.user_type == 'recruiter':
-            return Application.objects.filter(job__recruiter=user.recruiter_profile)
-        return Application.objects.filter(applicant=user.applicant_profile)
+        # ApplicationSerializer only renders foreign keys as ids, so no joins are
+        # needed here; keep it that way when adding nested fields.
+        return visible_applications(Application.objects.all(), self.request)
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and include_archived(self.request):
+            return ArchivableApplicationSerializer
+        return ApplicationSerializer
+
+    def filter_queryset(self, queryset):
+        if include_archived(self.request):
+            # Paged together with the live applications by ApplicationCursorPagination
+            return [queryset, visible_applications(ArchivedApplication.objects.all(), self.request)]
+        return queryset
     
+    @transaction.atomic
     def perform_create(self, serializer):
         applicant_profile = self.request.user.applicant_profile
         if not applicant_profile:
             raise ValueError("Applicant profile does not exist for the user.")
-        serializer.save(applicant=applicant_profile)
+        application = serializer.save(applicant=applicant_profile)
+        record_transitions([(application.id, application.job_id, None, application.status)])
 
-class ApplicationDetailView(generics.RetrieveAPIView):
+class ApplicationDetailView(ReplicaReadMixin, generics.RetrieveAPIView):
     """
     Provides a detailed view of a single application, including nested job
     and applicant profile information. Only accessible by the recruiter who posted the job
@@ -81,18 +270,87 @@ class ApplicationDetailView(generics.RetrieveAPIView):
         """
         user = self.request.user
         if user.user_type == 'recruiter':
-            return Application.objects.filter(job__recruiter=user.recruiter_profile)
+            queryset = Application.objects.filter(job__recruiter=user.recruiter_profile)
         elif user.user_type == 'applicant':
-            return Application.objects.filter(applicant=user.applicant_profile)
-        return Application.objects.none()
+            queryset = Application.objects.filter(applicant=user.applicant_profile)
+        else:
+            return Application.objects.none()
+        # DetailedApplicationSerializer nests the job and the applicant's user
+        return queryset.select_related('job', 'applicant__user')
+
+
+class ApplicationTimelineView(APIView):
+    """
+    Every status an application has been through, oldest first, for the
+    recruiter who posted the job or the applicant who applied.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk, *args, **kwargs):
+        user = request.user
+        if user.user_type == 'recruiter':
+            applications = Application.objects.filter(job__recruiter=user.recruiter_profile)
+        else:
+            applications = Application.objects.filter(applicant=user.applicant_profile)
+        if not applications.filter(pk=pk).exists():
+            return Response({"error": "Application not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        events = ApplicationStatusEvent.objects.filter(application_id=pk).order_by('at', 'id')
+        return Response({'application': pk, 'events': ApplicationStatusEventSerializer(events, many=True).data})
+
+
+class JobFunnelView(APIView):
+    """
+    Time in stage and stage-to-stage conversion rates for one of the
+    recruiter's jobs, read from the aggregates core.funnel refreshes
+    periodically; figures lag live statuses by up to FUNNEL_REFRESH_INTERVAL.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsRecruiter]
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            job = Job.objects.get(pk=pk, recruiter=request.user.recruiter_profile)
+        except Job.DoesNotExist:
+            return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job_funnel(job))
+
+
+class JobApplicationExportView(APIView):
+    """
+    Streams every application to one of the recruiter's jobs, with the
+    applicant's details joined in, as CSV (default) or `?output=ndjson`.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsRecruiter]
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            job = Job.objects.get(pk=pk, recruiter=request.user.recruiter_profile)
+        except Job.DoesNotExist:
+            return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        export_format = request.query_params.get('output', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({"error": "output must be one of: csv, ndjson."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Under ASGI, Django would read a sync iterator to the end before sending anything
+        stream = astream_export if isinstance(request._request, ASGIRequest) else stream_export
+        response = StreamingHttpResponse(
+            stream(Application.objects.filter(job=job), export_format),
+            content_type=EXPORT_FORMATS[export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="job-{job.id}-applications.{export_format}"'
+        return response
 
 
 class AdvanceApplicationView(APIView):
     """
     View for a recruiter to advance an application to interview or reject it.
+    Send an Idempotency-Key header to make retries safe; repeating a decision
+    the application already has sends no second email either way.
     """
     permission_classes = [permissions.IsAuthenticated, IsRecruiter]
 
+    @idempotent
     def post(self, request, pk, *args, **kwargs):
         try:
             application = Application.objects.get(pk=pk, job__recruiter=request.user.recruiter_profile)
@@ -102,28 +360,70 @@ class AdvanceApplicationView(APIView):
         action = request.data.get('action') # 'invite' or 'reject'
 
         if action == 'invite':
-            application.status = 'interview_pending'
-            application.save()
-            send_interview_invitation_email.delay(application.id)
+            if change_status(application, 'interview_pending') != 'interview_pending':
+                # Queue the email only once the new status is visible to workers
+                transaction.on_commit(lambda: send_interview_invitation_email.delay(application.id))
             return Response({"message": "Interview invitation process started."}, status=status.HTTP_200_OK)
         elif action == 'reject':
-            application.status = 'rejected'
-            application.save()
-            send_rejection_email.delay(application.id)
+            if change_status(application, 'rejected') != 'rejected':
+                transaction.on_commit(lambda: send_rejection_email.delay(application.id))
             return Response({"message": "Application has been rejected."}, status=status.HTTP_200_OK)
         else:
             return Response({"error": "Invalid action. Must be 'invite' or 'reject'."}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class BulkAdvanceApplicationsView(APIView):
+    """
+    Invite or reject many of a recruiter's applications at once. Statuses move
+    in a single UPDATE and emails go out in chunked tasks, each reusing one
+    mail connection. Applications already in the target status are skipped so
+    nobody is emailed twice.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsRecruiter]
+    target_status = {'invite': 'interview_pending', 'reject': 'rejected'}
+
+    @idempotent
+    def post(self, request, *args, **kwargs):
+        serializer = BulkAdvanceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        action = data['action']
+        new_status = self.target_status[action]
+
+        applications = Application.objects.filter(job__recruiter=request.user.recruiter_profile)
+        if 'ids' in data:
+            applications = applications.filter(id__in=data['ids'])
+        if 'job' in data:
+            applications = applications.filter(job_id=data['job'])
+        if 'status' in data:
+            applications = applications.filter(status=data['status'])
+        applications = applications.exclude(status=new_status)
+
+        with transaction.atomic():
+            rows = list(applications.select_for_update().values_list('id', 'job_id', 'status'))
+            ids = [application_id for application_id, _job_id, _status in rows]
+            updated = Application.objects.filter(id__in=ids).update(status=new_status)
+            record_transitions([(application_id, job_id, old_status, new_status)
+                                for application_id, job_id, old_status in rows])
+            chunk_size = settings.BULK_EMAIL_CHUNK_SIZE
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                transaction.on_commit(lambda chunk=chunk: send_bulk_decision_emails.delay(chunk, action))
+
+        return Response({"updated": updated, "status": new_status}, status=status.HTTP_200_OK)
+
+
 class ScheduleInterviewView(APIView):
     """
     View for an applicant to schedule their interview using a token.
     """
     permission_classes = [permissions.AllowAny] # Access is controlled by the unique token
+    throttle_classes = [IPRateThrottle] # ...which must not be guessable by brute force
+    throttle_scope = 'schedule'
 
     def post(self, request, token, *args, **kwargs):
         try:
-            interview = Interview.objects.get(scheduling_token=token, is_scheduled=False)
+            interview = Interview.objects.select_related('application').get(scheduling_token=token, is_scheduled=False)
         except Interview.DoesNotExist:
             return Response({"error": "Invalid or expired scheduling link."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -136,33 +436,255 @@ class ScheduleInterviewView(APIView):
             if scheduled_time < timezone.now():
                 return Response({"error": "Interview time must be in the future."}, status=status.HTTP_400_BAD_REQUEST)
 
-            # 2. Check for conflicts within 30 minutes before and after
-            time_buffer = timedelta(minutes=30)
-            conflict_exists = Interview.objects.filter(
-                application__job=interview.application.job,
-                is_scheduled=True,
-                scheduled_time__gte=scheduled_time - time_buffer,
-                scheduled_time__lte=scheduled_time + time_buffer
-            ).exists()
-
-            if conflict_exists:
+            # 2. Claim the slot. Cells on the 30-minute grid are unique per job, so
+            #    two applicants racing for overlapping times cannot both win.
+            try:
+                book_interview(interview, scheduled_time)
+            except SlotUnavailable:
                 return Response({"error": "This time slot is unavailable. Please choose another time."}, status=status.HTTP_409_CONFLICT)
-            
-            # --- Schedule the interview ---
-            interview.scheduled_time = scheduled_time
-            interview.is_scheduled = True
-            interview.save()
+            except InterviewAlreadyScheduled:
+                return Response({"error": "Invalid or expired scheduling link."}, status=status.HTTP_404_NOT_FOUND)
 
             # Update application status
-            application = interview.application
-            application.status = 'interview_scheduled'
-            application.save()
+            change_status(interview.application, 'interview_scheduled')
 
             return Response({"message": "Interview scheduled successfully!"}, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class JobSlotsView(APIView):
+    """
+    Free interview start times for a job between `start` and `end`
+    (ISO dates or datetimes, at most MAX_RANGE apart). Defaults to the next 7 days.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    MAX_RANGE = timedelta(days=31)
+
+    def parse_bound(self, value, default):
+        if not value:
+            return default
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(value)
+            moment = datetime.combine(day, time.min)
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            job = Job.objects.get(pk=pk)
+        except Job.DoesNotExist:
+            return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        now = timezone.now()
+        try:
+            start = self.parse_bound(request.query_params.get('start'), now)
+            end = self.parse_bound(request.query_params.get('end'), start + timedelta(days=7))
+        except ValueError:
+            return Response({"error": "start and end must be ISO dates or datetimes."}, status=status.HTTP_400_BAD_REQUEST)
+        if end <= start or end - start > self.MAX_RANGE:
+            return Response({"error": "end must be after start and within 31 days of it."}, status=status.HTTP_400_BAD_REQUEST)
+
+        slots = free_slots(job, start, end, not_before=now)
+        return Response({"job": job.id, "slot_minutes": InterviewSlot.SLOT_MINUTES, "free_slots": slots})
+
+
+class ResumeUploadStartView(APIView):
+    """
+    Starts a resumable chunked resume upload from `filename` and `size`. The
+    returned id is the upload token: PUT chunks to ResumeUploadView, then
+    pass it as `resume_upload` when signing up. Uploads made while logged in
+    as an applicant replace that applicant's resume once complete.
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = 'resume_upload'
+
+    def post(self, request, *args, **kwargs):
+        serializer = ResumeUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = start_upload(serializer.validated_data['filename'], serializer.validated_data['size'],
+                                  user=request.user, client=client_address(request))
+        except UploadQuotaExceeded as error:
+            return Response({"error": str(error)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        except UploadError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        data = dict(ResumeUploadSerializer(upload).data, chunk_size=settings.RESUME_UPLOAD_CHUNK_SIZE)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class ResumeUploadView(APIView):
+    """
+    GET reports how many bytes have arrived, so an interrupted client knows
+    where to resume. PUT appends the raw request body at the `Upload-Offset`
+    header, which must equal the current offset (409 with the expected offset
+    otherwise).
+    """
+    permission_classes = [permissions.AllowAny] # Access is controlled by the upload id
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = 'resume_chunk'
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            upload = ResumeUpload.objects.select_related('blob').get(pk=pk)
+        except ResumeUpload.DoesNotExist:
+            return Response({"error": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ResumeUploadSerializer(upload).data)
+
+    def put(self, request, pk, *args, **kwargs):
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length', ''))
+        except ValueError:
+            return Response({"error": "Upload-Offset and Content-Length headers are required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.RESUME_UPLOAD_CHUNK_SIZE:
+            return Response({"error": f"Chunks must be at most {settings.RESUME_UPLOAD_CHUNK_SIZE} bytes."},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        try:
+            upload = append_chunk(pk, offset, request.stream, length)
+        except ResumeUpload.DoesNotExist:
+            return Response({"error": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+        except OffsetMismatch as error:
+            return Response({"error": str(error), "offset": error.expected}, status=status.HTTP_409_CONFLICT)
+        except UploadError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if upload.is_complete and upload.user_id is not None:
+            profile = ApplicantProfile.objects.filter(user_id=upload.user_id).first()
+            if profile is not None:
+                attach_resume(profile, upload.blob)
+        return Response(ResumeUploadSerializer(upload).data)
+
+
+class ApplicantResumeView(APIView):
+    """
+    Downloads an applicant's resume. Available to the applicant and to
+    recruiters they have applied to. Supports Range and If-None-Match.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk, *args, **kwargs):
+        user = request.user
+        profiles = ApplicantProfile.objects.select_related('user', 'resume_blob')
+        if user.user_type == 'recruiter':
+            profiles = profiles.filter(applications__job__recruiter=user.recruiter_profile).distinct()
+        else:
+            profiles = profiles.filter(user=user)
+        try:
+            profile = profiles.get(pk=pk)
+        except ApplicantProfile.DoesNotExist:
+            return Response({"error": "Resume not found."}, status=status.HTTP_404_NOT_FOUND)
+        return resume_response(request, profile)
+
+
+class RecruiterCalendarFeedView(APIView):
+    """
+    A recruiter's scheduled interviews as an iCalendar feed, for calendar
+    clients to subscribe to. Clients can't send a bearer token, so the feed
+    URL carries a signed ?token= instead (see RecruiterCalendarLinkView).
+    The body is prebuilt by core.calendar_feed, so a poll makes no queries.
+    Supports If-None-Match and If-Modified-Since.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]  # Access is controlled by the signed token
+    renderer_classes = [calendar_feed.ICalendarRenderer]
+
+    def get(self, request, pk, *args, **kwargs):
+        # Forged tokens are turned away before the cache is read
+        version = calendar_feed.token_version(pk, request.query_params.get('token', ''))
+        if version is None:
+            return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+        feed = calendar_feed.get_feed(pk)
+        if feed['token_version'] != version:
+            return HttpResponse(status=status.HTTP_404_NOT_FOUND)  # Revoked by a rotation
+
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            not_modified = feed['etag'] in parse_etags(if_none_match)
+        else:
+            since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+            not_modified = since is not None and since >= parse_http_date_safe(feed['last_modified'])
+        response = HttpResponse(status=304) if not_modified else HttpResponse(
+            feed['body'], content_type='text/calendar; charset=utf-8'
+        )
+        response['ETag'] = feed['etag']
+        response['Last-Modified'] = feed['last_modified']
+        response['Cache-Control'] = 'private, max-age=60'
+        return response
+
+
+class RecruiterCalendarLinkView(APIView):
+    """
+    The signed URL of the recruiter's interview calendar feed. POST issues a
+    new URL and revokes the old ones, e.g. after one was shared by mistake.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsRecruiter]
+
+    def link(self, request, recruiter_id):
+        version = RecruiterProfile.objects.values_list('calendar_token_version', flat=True).get(pk=recruiter_id)
+        path = reverse('recruiter-calendar-feed', kwargs={'pk': recruiter_id})
+        url = request.build_absolute_uri(f'{path}?token={calendar_feed.feed_token(recruiter_id, version)}')
+        return Response({"url": url}, status=status.HTTP_200_OK)
+
+    def get(self, request, *args, **kwargs):
+        return self.link(request, request.user.recruiter_profile.id)
+
+    def post(self, request, *args, **kwargs):
+        recruiter_id = request.user.recruiter_profile.id
+        with transaction.atomic():
+            RecruiterProfile.objects.filter(pk=recruiter_id).update(calendar_token_version=F('calendar_token_version') + 1)
+            transaction.on_commit(lambda: calendar_feed.invalidate(recruiter_id))
+        return self.link(request, recruiter_id)
+
+
+class RecruiterDashboardView(APIView):
+    """
+    Application counts by status for each of the recruiter's jobs, read from
+    the JobStatusCount counters in one query rather than grouping applications.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsRecruiter]
+
+    def get(self, request, *args, **kwargs):
+        rows = (
+            Job.objects.filter(recruiter=request.user.recruiter_profile)
+            .order_by('-created_at', '-id')
+            .values_list('id', 'title', 'status_counts__status', 'status_counts__count')
+        )
+        jobs = {}
+        totals = {status_code: 0 for status_code, _label in Application.STATUS_CHOICES}
+        for job_id, title, status_code, count in rows:
+            job = jobs.get(job_id)
+            if job is None:
+                job = jobs[job_id] = {'id': job_id, 'title': title, 'total': 0,
+                                      'counts': {code: 0 for code in totals}}
+            if status_code is not None:
+                job['counts'][status_code] = count
+                job['total'] += count
+                totals[status_code] += count
+        return Response({'jobs': list(jobs.values()), 'totals': totals})
+
+
+class ApplicationEventsTicketView(APIView):
+    """
+    A short-lived URL for the user's live application status stream
+    (AsyncApplicationEventsView). EventSource can't send the bearer token,
+    so the URL carries a signed ticket instead.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        ticket = issue_ticket(request.user.pk)
+        url = request.build_absolute_uri(f"{reverse('application-events')}?ticket={ticket}")
+        return Response({"url": url, "expires_in": settings.EVENTS_TICKET_MAX_AGE}, status=status.HTTP_200_OK)
+
+
 class UserProfileView(generics.RetrieveAPIView):
     """
     View to retrieve the profile of the currently authenticated user.
@@ -171,4 +693,24 @@ class UserProfileView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
\ No newline at end of file
+        return self.request.user
+
+
+class CacheStatsView(APIView):
+    """
+    Hit/miss counters and the current version of the job board cache.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response({'jobs': job_cache.stats()})
+
+
+class MetricsView(APIView):
+    """
+    Per-route request, query and serializer timings in Prometheus text format.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jrats_project.settings")
+# Serve the async-native views (core.async_views); see DEPLOYMENT.md
+os.environ.setdefault("ASYNC_VIEWS", "1")
 
 application = get_asgi_application()
+
+if settings.DEBUG:
+    # Django's static handler is for development only (it 404s with DEBUG off);
+    # in production the proxy or a CDN serves STATIC_ROOT, see DEPLOYMENT.md
+    application = ASGIStaticFilesHandler(application)
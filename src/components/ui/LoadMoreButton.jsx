@@ -0,0 +1,15 @@
+const LoadMoreButton = ({ onClick, loading }) => {
+  return (
+    <div className="flex justify-center mt-8">
+      <button
+        onClick={onClick}
+        disabled={loading}
+        className="bg-gray-200 dark:bg-gray-700 px-6 py-3 rounded font-bold hover:bg-gray-300 dark:hover:bg-gray-600 disabled:cursor-not-allowed transition-colors"
+      >
+        {loading ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  );
+};
+
+export default LoadMoreButton;
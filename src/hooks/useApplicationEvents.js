@@ -0,0 +1,47 @@
+import { useEffect, useRef } from 'react';
+import api from '../api/axiosConfig';
+
+// Calls onStatusChange({ application, job, status }) whenever one of the
+// user's applications changes status, pushed by the server over SSE.
+// EventSource can't send the bearer token, so the stream URL comes with a
+// short-lived ticket. If the server doesn't offer the stream, nothing happens.
+const useApplicationEvents = (onStatusChange) => {
+  const callback = useRef(onStatusChange);
+  callback.current = onStatusChange;
+
+  useEffect(() => {
+    let source = null;
+    let retry = null;
+    let closed = false;
+
+    const connect = async () => {
+      let url;
+      try {
+        const response = await api.post('/events/ticket/');
+        url = response.data.url;
+      } catch {
+        return;
+      }
+      if (closed) return;
+
+      source = new EventSource(url);
+      source.addEventListener('status', (event) => callback.current(JSON.parse(event.data)));
+      source.onerror = () => {
+        // EventSource retries dropped connections itself; once it gives up
+        // (e.g. the ticket expired), start over with a fresh ticket
+        if (source.readyState === EventSource.CLOSED && !closed) {
+          retry = setTimeout(connect, 5000);
+        }
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      if (source) source.close();
+    };
+  }, []);
+};
+
+export default useApplicationEvents;
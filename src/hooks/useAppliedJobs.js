@@ -0,0 +1,28 @@
+import { useState, useCallback } from 'react';
+import api from '../api/axiosConfig';
+
+// Which jobs the applicant has applied to, looked up for each page of jobs
+// as it is shown rather than from a (paginated) list of every application.
+const useAppliedJobs = () => {
+  const [appliedJobIds, setAppliedJobIds] = useState(() => new Set());
+
+  const markApplied = useCallback((jobId) => {
+    setAppliedJobIds(prev => new Set(prev).add(jobId));
+  }, []);
+
+  const checkApplied = useCallback(async (jobs) => {
+    if (jobs.length === 0) return;
+    const response = await api.get('/applications/', {
+      params: { job: jobs.map(job => job.id).join(','), page_size: jobs.length },
+    });
+    setAppliedJobIds(prev => {
+      const ids = new Set(prev);
+      response.data.results.forEach(app => ids.add(app.job));
+      return ids;
+    });
+  }, []);
+
+  return { appliedJobIds, checkApplied, markApplied };
+};
+
+export default useAppliedJobs;
@@ -0,0 +1,38 @@
+import { useState, useCallback } from 'react';
+import api from '../api/axiosConfig';
+
+// Holds the pages of a cursor-paginated API list loaded so far. The first
+// page is passed to setFirstPage(); loadMore() follows the `next` link and
+// returns the rows it added.
+const usePaginatedList = () => {
+  const [items, setItems] = useState([]);
+  const [next, setNext] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const setFirstPage = useCallback((data) => {
+    setItems(data.results);
+    setNext(data.next);
+  }, []);
+
+  const loadMore = useCallback(async () => {
+    if (!next) return [];
+    setLoadingMore(true);
+    try {
+      const response = await api.get(next);
+      const rows = response.data.results;
+      // Rows added at the top since the first page (e.g. from live events) may repeat
+      setItems(prev => {
+        const seen = new Set(prev.map(item => item.id));
+        return [...prev, ...rows.filter(row => !seen.has(row.id))];
+      });
+      setNext(response.data.next);
+      return rows;
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [next]);
+
+  return { items, setItems, setFirstPage, loadMore, hasMore: next !== null, loadingMore };
+};
+
+export default usePaginatedList;
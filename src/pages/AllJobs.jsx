@@ -1,25 +1,27 @@
 import React, { useEffect, useState, useCallback } from 'react';
 import useApiWithDelay from '../hooks/useApiWithDelay';
+import usePaginatedList from '../hooks/usePaginatedList';
+import useAppliedJobs from '../hooks/useAppliedJobs';
 import api from '../api/axiosConfig';
 import LoadingSpinner from '../components/LoadingSpinner';
 import HoverCard from '../components/ui/HoverCard';
+import LoadMoreButton from '../components/ui/LoadMoreButton';
 import { useAuth } from '../contexts/AuthContext';
 
 const AllJobs = () => {
     const { user } = useAuth();
-    const [jobs, setJobs] = useState([]);
-    const [myApplications, setMyApplications] = useState([]);
+    const isApplicant = user?.user_type === 'applicant';
+    const { items: jobs, setFirstPage, loadMore, hasMore, loadingMore } = usePaginatedList();
+    const { appliedJobIds, checkApplied, markApplied } = useAppliedJobs();
     const { loading, error, execute } = useApiWithDelay();
     const [actionLoading, setActionLoading] = useState(null);
 
     const fetchData = useCallback(async () => {
-        const [jobsResponse, appsResponse] = await execute(() => Promise.all([
-            api.get('/jobs/'),
-            user?.user_type === 'applicant' ? api.get('/applications/') : Promise.resolve({ data: [] })
-        ]));
-        setJobs(jobsResponse.data);
-        setMyApplications(appsResponse.data);
-    }, [execute, user]);
+        const jobsResponse = await execute(() => api.get('/jobs/'));
+        setFirstPage(jobsResponse.data);
+        // Applied state is looked up per page of jobs; the applications list is paginated too
+        if (isApplicant) await checkApplied(jobsResponse.data.results);
+    }, [execute, isApplicant, checkApplied, setFirstPage]);
 
     useEffect(() => {
         fetchData();
@@ -28,8 +30,8 @@ const AllJobs = () => {
     const handleApply = async (jobId) => {
         setActionLoading(jobId);
         try {
-            const response = await api.post('/applications/', { job: jobId });
-            setMyApplications(prev => [...prev, response.data]);
+            await api.post('/applications/', { job: jobId });
+            markApplied(jobId);
         } catch (err) {
             console.error('Failed to apply', err);
             alert(err.response?.data?.detail || 'You have already applied for this job.');
@@ -38,7 +40,15 @@ const AllJobs = () => {
         }
     };
 
-    const appliedJobIds = new Set(myApplications.map(app => app.job));
+    const handleLoadMore = async () => {
+        try {
+            const rows = await loadMore();
+            if (isApplicant) await checkApplied(rows);
+        } catch (err) {
+            console.error('Failed to load more jobs', err);
+            alert('Could not load more jobs.');
+        }
+    };
 
     if (loading) return <div className="flex justify-center mt-10"><LoadingSpinner /></div>;
 
@@ -60,7 +70,7 @@ const AllJobs = () => {
                             </div>
                             
                             {/* Apply Button Section */}
-                            {user?.user_type === 'applicant' && (
+                            {isApplicant && (
                                  <div className="flex-shrink-0">
                                     <button
                                         onClick={() => handleApply(job.id)}
@@ -75,6 +85,7 @@ const AllJobs = () => {
                     </HoverCard>
                 )) : <p>No open positions at the moment.</p>}
             </div>
+            {hasMore && <LoadMoreButton onClick={handleLoadMore} loading={loadingMore} />}
         </div>
     );
 };
@@ -1,37 +1,55 @@
 import React, { useEffect, useState, useCallback } from 'react';
 import useApiWithDelay from '../hooks/useApiWithDelay';
+import useApplicationEvents from '../hooks/useApplicationEvents';
+import usePaginatedList from '../hooks/usePaginatedList';
+import useAppliedJobs from '../hooks/useAppliedJobs';
 import api from '../api/axiosConfig';
 import LoadingSpinner from '../components/LoadingSpinner';
 import HoverCard from '../components/ui/HoverCard';
+import LoadMoreButton from '../components/ui/LoadMoreButton';
 
 const ApplicantDashboard = () => {
-    const [jobs, setJobs] = useState([]);
-    const [myApplications, setMyApplications] = useState([]);
+    const jobList = usePaginatedList();
+    const applicationList = usePaginatedList();
+    const jobs = jobList.items;
+    const myApplications = applicationList.items;
+    const { setItems: setMyApplications } = applicationList;
+    const { appliedJobIds, checkApplied, markApplied } = useAppliedJobs();
     const { loading, error, execute } = useApiWithDelay();
     const [actionLoading, setActionLoading] = useState(null);
+    const { setFirstPage: setFirstJobPage } = jobList;
+    const { setFirstPage: setFirstApplicationPage } = applicationList;
 
     const fetchData = useCallback(async () => {
-        // execute() now correctly returns the array of response objects
+        // execute() returns the array of response objects
         const [jobsResponse, appsResponse] = await execute(() => Promise.all([
             api.get('/jobs/'),
             api.get('/applications/')
         ]));
-        
-        // We can now safely access the .data property
-        setJobs(jobsResponse.data);
-        setMyApplications(appsResponse.data);
-
-    }, [execute]);
+        setFirstJobPage(jobsResponse.data);
+        setFirstApplicationPage(appsResponse.data);
+        // Applied state is looked up per page of jobs; the applications list is paginated too
+        await checkApplied(jobsResponse.data.results);
+    }, [execute, checkApplied, setFirstJobPage, setFirstApplicationPage]);
 
     useEffect(() => {
         fetchData();
     }, [fetchData]);
 
+    // Status changes are pushed by the server instead of refetching the list
+    useApplicationEvents(({ application, status }) => {
+        setMyApplications(prevApplications => prevApplications.map(app => (
+            app.id === application ? { ...app, status } : app
+        )));
+    });
+
     const handleApply = async (jobId) => {
         setActionLoading(jobId);
         try {
             const response = await api.post('/applications/', { job: jobId });
-            setMyApplications(prevApplications => [...prevApplications, response.data]);
+            // Newest first, as the list is ordered
+            setMyApplications(prevApplications => [response.data, ...prevApplications]);
+            markApplied(jobId);
         } catch (err) {
             if (err.response && err.response.status === 400) {
                 alert('You have already applied for this job.');
@@ -42,8 +60,24 @@ const ApplicantDashboard = () => {
             setActionLoading(null);
         }
     };
-    
-    const appliedJobIds = new Set(myApplications.map(app => app.job));
+
+    const loadMoreJobs = async () => {
+        try {
+            await checkApplied(await jobList.loadMore());
+        } catch (err) {
+            console.error('Failed to load more jobs', err);
+            alert('Could not load more jobs.');
+        }
+    };
+
+    const loadMoreApplications = async () => {
+        try {
+            await applicationList.loadMore();
+        } catch (err) {
+            console.error('Failed to load more applications', err);
+            alert('Could not load more applications.');
+        }
+    };
 
     if (loading) return <div className="flex justify-center mt-10"><LoadingSpinner /></div>;
 
@@ -71,6 +105,11 @@ const ApplicantDashboard = () => {
                          </HoverCard>
                     )) : <p>You haven't applied to any jobs yet.</p>}
                 </div>
+                {applicationList.hasMore && (
+                    <div className="-mt-4 mb-12">
+                        <LoadMoreButton onClick={loadMoreApplications} loading={applicationList.loadingMore} />
+                    </div>
+                )}
             </section>
 
             <section>
@@ -95,6 +134,7 @@ const ApplicantDashboard = () => {
                         </HoverCard>
                     )) : <p>No open positions at the moment.</p>}
                 </div>
+                {jobList.hasMore && <LoadMoreButton onClick={loadMoreJobs} loading={jobList.loadingMore} />}
             </section>
         </div>
     );
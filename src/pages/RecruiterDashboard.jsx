@@ -1,13 +1,16 @@
 import React, { useEffect, useState, useCallback } from 'react';
 import useApiWithDelay from '../hooks/useApiWithDelay';
+import useApplicationEvents from '../hooks/useApplicationEvents';
+import usePaginatedList from '../hooks/usePaginatedList';
 import api from '../api/axiosConfig';
 import LoadingSpinner from '../components/LoadingSpinner';
 import HoverCard from '../components/ui/HoverCard';
+import LoadMoreButton from '../components/ui/LoadMoreButton';
 import Modal from '../components/ui/Modal';
 import CreateJobForm from '../components/CreateJobForm';
 
 const RecruiterDashboard = () => {
-    const [applications, setApplications] = useState([]);
+    const { items: applications, setItems: setApplications, setFirstPage, loadMore, hasMore, loadingMore } = usePaginatedList();
     const { loading, error, execute } = useApiWithDelay();
     const [actionLoading, setActionLoading] = useState(null);
     const [isJobModalOpen, setIsJobModalOpen] = useState(false);
@@ -17,21 +20,48 @@ const RecruiterDashboard = () => {
 
     const fetchApplications = useCallback(async () => {
         const response = await execute(() => api.get('/applications/'));
-        setApplications(response.data);
-    }, [execute]);
+        setFirstPage(response.data);
+    }, [execute, setFirstPage]);
     
     useEffect(() => {
         fetchApplications();
     }, [fetchApplications]);
 
-    // ... (the rest of the functions: handleAction, handleJobCreated, handleCardClick, etc. are correct and can remain the same)
+    const setStatus = (appId, status) => {
+        setApplications(prevApplications => prevApplications.map(app => (
+            app.id === appId ? { ...app, status } : app
+        )));
+    };
+
+    // Status changes (including new applications) are pushed by the server
+    useApplicationEvents(({ application, status }) => {
+        if (applications.some(app => app.id === application)) {
+            setStatus(application, status);
+        } else if (status === 'submitted') {
+            // A new application: it is at the top of the first page
+            api.get('/applications/').then(response => setApplications(prevApplications => {
+                const seen = new Set(prevApplications.map(app => app.id));
+                return [...response.data.results.filter(app => !seen.has(app.id)), ...prevApplications];
+            }));
+        }
+        // Otherwise it is on a page not loaded yet, and arrives up to date with it
+    });
+
+    const handleLoadMore = async () => {
+        try {
+            await loadMore();
+        } catch (err) {
+            console.error('Failed to load more applications', err);
+            alert('Could not load more applications.');
+        }
+    };
 
     const handleAction = async (appId, action) => {
         setActionLoading(appId);
         try {
             await api.post(`/applications/${appId}/advance/`, { action });
-            const data = await api.get('/applications/');
-            setApplications(data.data);
+            const response = await api.get(`/applications/${appId}/`);
+            setStatus(appId, response.data.status);
             if (selectedApplication && selectedApplication.id === appId) {
                 closeDetailsModal();
             }
@@ -159,6 +189,7 @@ const RecruiterDashboard = () => {
                     </HoverCard>
                 )) : !loading && <p>No applications found.</p>}
             </div>
+            {hasMore && <LoadMoreButton onClick={handleLoadMore} loading={loadingMore} />}
         </div>
     );
 };